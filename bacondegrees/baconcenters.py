@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+
+from baconsearch import BaconSearch
+from baconpyramid import BaconPyramid
+from baconhelpers import Benchmark, LruCache
+import threading
+
+## Measures degrees from actors other than Kevin. Each center gets a whole
+#  tree walked from them, and the trees for the centers used most recently
+#  are kept in memory so another look up from the same center just follows
+#  the path back. Trees can also be saved next to the database so they
+#  outlive the process.
+#
+#  @author Chris Lock
+class BaconCenters():
+	# @constant How many trees we keep in memory, as many as are kept on disk
+	SIZE = BaconSearch.CENTERS_SIZE
+
+	# @type {object} An instance of the search object
+	__baconSearch = BaconSearch()
+	# @type {object} An instance of the pyramid builder object
+	__baconPyramid = BaconPyramid()
+	# @type {object} An instance of the benchmark object for the profile
+	__benchmark = Benchmark()
+	# @type {object} The trees for the centers used most recently
+	__trees = LruCache(SIZE)
+	# @type {object} Keeps threads from reordering the trees in memory at once
+	__lock = threading.Lock()
+	# @type {object} Keeps threads from walking trees at once, since the walk
+	#	and the database connection are shared
+	__walkLock = threading.Lock()
+
+	## An empty constructor.
+	#
+	#  @param {object} self The object
+	#  @return void
+	def __init__(self):
+		pass
+
+	## Gets the actor dictionary for the path from an actor to a center.
+	#
+	#  @param {object} self The object
+	#  @param {int} actorId The actor id we're looking for
+	#  @param {int} centerActorId The actor id we're measuring from
+	#  @param {bool} useCaching Should we save the tree if we walk it
+	#  @return {mixed} None if there's no path or the actor dictionary
+	def get(self, actorId, centerActorId, useCaching = False):
+		return self.__baconPyramid.getResult(actorId,
+				self.__getTree(centerActorId, useCaching))
+
+	## Gets the tree for a center from memory, then the saved trees, then by
+	#  walking it. Trees we didn't have to walk are counted as cache hits for
+	#  the profile. The trees in memory are only locked while we read or add
+	#  to them, so a look up from a center we have never waits on a walk for
+	#  another. Walks go one at a time, and memory is checked again once it's
+	#  our turn in case the thread before us walked the same center.
+	#
+	#  @param {object} self The object
+	#  @param {int} centerActorId The actor id we're measuring from
+	#  @param {bool} useCaching Should we save the tree if we walk it
+	#  @return {dictionary} The tree
+	def __getTree(self, centerActorId, useCaching):
+		tree = self.__getTreeInMemory(centerActorId)
+
+		if tree:
+			return tree
+
+		with self.__walkLock:
+			tree = self.__getTreeInMemory(centerActorId)
+
+			if tree:
+				return tree
+
+			tree = self.__baconSearch.getCenterPyramid(centerActorId)
+
+			if tree:
+				self.__benchmark.count('cacheHits')
+
+			else:
+				tree = self.__baconPyramid.walk(centerActorId)
+
+				if useCaching:
+					self.__benchmark.startPhase('persist')
+					self.__baconSearch.updateCenterPyramid(centerActorId, tree)
+					self.__benchmark.endPhase('persist')
+
+			with self.__lock:
+				self.__trees.set(centerActorId, tree)
+
+			return tree
+
+	## Gets the tree for a center if it's in memory.
+	#
+	#  @param {object} self The object
+	#  @param {int} centerActorId The actor id we're measuring from
+	#  @return {mixed} None or the tree
+	def __getTreeInMemory(self, centerActorId):
+		with self.__lock:
+			tree = self.__trees.get(centerActorId)
+
+		if tree:
+			self.__benchmark.count('cacheHits')
+
+		return tree
+
+	## Drops every tree in memory.
+	#
+	#  @param {object} self The object
+	#  @return void
+	def clear(self):
+		with self.__lock:
+			self.__trees.clear()
@@ -12,7 +12,8 @@ baconDegreesCore = BaconDegreesCore()
 ## This routes the CLI options and arguments. Since arguments passed into
 #  options are pulled out during parsing, we need to check them against
 #  sys.argv so we don't run baconDegreesCore.get when a user is running an 
-#  option.
+#  option. Options that only change how other commands run, like --center,
+#  can still be passed with a name.
 #
 #  @return void
 def main():
@@ -22,8 +23,7 @@ def main():
 	argumentsCountUnparsed = len(arguments)
 	argumentsCount = len(sys.argv[1:])
 
-	if (argumentsCountUnparsed == 1
-			and argumentsCount == argumentsCountUnparsed):
+	if argumentsCountUnparsed == 1 and isOnlyModified(parser):
 	 	baconDegreesCore.get(arguments[0])
 
 	elif argumentsCountUnparsed > 1:
@@ -34,6 +34,21 @@ def main():
 		printHeader()
 		parser.print_help()
 
+## Checks that every option passed only changes how other commands run.
+#
+#  @param {object} parser The optparse.OptionParser() object
+#  @return {bool} No option passed runs a command
+def isOnlyModified(parser):
+	for argument in sys.argv[1:]:
+		option = (parser.get_option(argument.split('=')[0])
+				if argument.startswith('-') else None)
+
+		if option and option.callback not in (setWorkers, setPort, setCenter,
+				setProfile):
+			return False
+
+	return True
+
 ## Adds options to optparse.
 #
 #  @param {object} parser The optparse.OptionParser() object
@@ -74,6 +89,17 @@ def addParserOptions(parser):
 		type = 'string',
 		metavar = 'tar.gz',
 		)
+	optionsDatabase.add_option(
+		'-w',
+		'--workers',
+		help = 'Too many cooks? Set how many processes read the tar, one per '
+				'core by default, and solve --swanson, one by default. Put it '
+				'before --cook, --burn, --flip, or --swanson.',
+		action = 'callback',
+		callback = setWorkers,
+		type = 'int',
+		metavar = 'count',
+		)
 	parser.add_option_group(optionsDatabase)
 
 	optionsDegrees = optparse.OptionGroup(
@@ -91,6 +117,63 @@ def addParserOptions(parser):
 		type = 'string',
 		metavar = 'name',
 		)
+	optionsDegrees.add_option(
+		'-k',
+		'--center',
+		help = 'Not a Kevin fan? Measure from someone else instead. Put it '
+				'before the name, --grassfed, --batch, or --order.',
+		action = 'callback',
+		callback = setCenter,
+		type = 'string',
+		metavar = 'name',
+		)
+	optionsDegrees.add_option(
+		'-m',
+		'--complete',
+		help = 'Can\'t remember the whole name? Pass the start of it and get '
+				'the actors on the menu that match.',
+		action = 'callback',
+		callback = getCompletions,
+		type = 'string',
+		metavar = 'prefix',
+		)
+	optionsDegrees.add_option(
+		'-a',
+		'--batch',
+		help = 'Feeding a crowd? Pass a file with a name on each line, or - '
+				'for stdin, and get a json line back for each one.',
+		action = 'callback',
+		callback = getBatch,
+		type = 'string',
+		metavar = 'file',
+		)
+	optionsDegrees.add_option(
+		'-z',
+		'--sizzle',
+		help = 'Keep the bacon warm. Loads everything once and answers '
+				'--order lookups over http on localhost until you stop it.',
+		action = 'callback',
+		callback = sizzle,
+		)
+	optionsDegrees.add_option(
+		'-o',
+		'--order',
+		help = 'Order up from the bacon that\'s sizzling.',
+		action = 'callback',
+		callback = order,
+		type = 'string',
+		metavar = 'name',
+		)
+	optionsDegrees.add_option(
+		'-p',
+		'--port',
+		help = 'Set the port the bacon sizzles on. Put it before --sizzle or '
+				'--order.',
+		action = 'callback',
+		callback = setPort,
+		type = 'int',
+		metavar = 'port',
+		)
 	optionsDegrees.add_option(
 		'-s',
 		'--swanson',
@@ -99,6 +182,14 @@ def addParserOptions(parser):
 		action = 'callback',
 		callback = complete,
 		)
+	optionsDegrees.add_option(
+		'-t',
+		'--stats',
+		help = 'Nutrition facts. How many actors are at each degree, the '
+				'mean, the max, and how many have no connection.',
+		action = 'callback',
+		callback = showStats,
+		)
 	optionsDegrees.add_option(
 		'-v',
 		'--vegan',
@@ -106,6 +197,15 @@ def addParserOptions(parser):
 		action = 'callback',
 		callback = getExceptions,
 		)
+	optionsDegrees.add_option(
+		'-i',
+		'--profile',
+		help = 'Read the ingredients. Prints json to stderr after the command '
+				'with how long each step took and how much work it did. Put '
+				'it before the command.',
+		action = 'callback',
+		callback = setProfile,
+		)
 	parser.add_option_group(optionsDegrees)
 
 	return parser
@@ -171,6 +271,16 @@ def update(option, opt_str, value, parser):
 	runAsRoot()
 	baconDegreesCore.update(value)
 
+## Sets how many processes read tar files.
+#
+#  @param {object} parser The instance causing the callback
+#  @param {string} opt_str The option string from the command line
+#  @param {string} value The argument value associated with the option
+#  @param {object} parser The instance doing the parsing work
+#  @return void
+def setWorkers(option, opt_str, value, parser):
+	baconDegreesCore.setWorkers(value)
+
 ## Gets the current actor name and caches all actors found on the way.
 #
 #  @param {object} parser The instance causing the callback
@@ -182,6 +292,66 @@ def getWithCaching(option, opt_str, value, parser):
 	runAsRoot()
 	baconDegreesCore.get(value, True)
 
+## Sets the actor to measure from instead of Kevin.
+#
+#  @param {object} parser The instance causing the callback
+#  @param {string} opt_str The option string from the command line
+#  @param {string} value The argument value associated with the option
+#  @param {object} parser The instance doing the parsing work
+#  @return void
+def setCenter(option, opt_str, value, parser):
+	baconDegreesCore.setCenter(value)
+
+## Gets every name in a file, or stdin, in a single process.
+#
+#  @param {object} parser The instance causing the callback
+#  @param {string} opt_str The option string from the command line
+#  @param {string} value The argument value associated with the option
+#  @param {object} parser The instance doing the parsing work
+#  @return void
+def getBatch(option, opt_str, value, parser):
+	baconDegreesCore.getBatch(value)
+
+## Prints the actor names that start with a prefix.
+#
+#  @param {object} parser The instance causing the callback
+#  @param {string} opt_str The option string from the command line
+#  @param {string} value The argument value associated with the option
+#  @param {object} parser The instance doing the parsing work
+#  @return void
+def getCompletions(option, opt_str, value, parser):
+	baconDegreesCore.getCompletions(value)
+
+## Loads everything into memory and answers lookups until interrupted.
+#
+#  @param {object} parser The instance causing the callback
+#  @param {string} opt_str The option string from the command line
+#  @param {string} value The argument value associated with the option
+#  @param {object} parser The instance doing the parsing work
+#  @return void
+def sizzle(option, opt_str, value, parser):
+	baconDegreesCore.sizzle()
+
+## Asks the running server for an actor name.
+#
+#  @param {object} parser The instance causing the callback
+#  @param {string} opt_str The option string from the command line
+#  @param {string} value The argument value associated with the option
+#  @param {object} parser The instance doing the parsing work
+#  @return void
+def order(option, opt_str, value, parser):
+	baconDegreesCore.order(value)
+
+## Sets the port the server listens on.
+#
+#  @param {object} parser The instance causing the callback
+#  @param {string} opt_str The option string from the command line
+#  @param {string} value The argument value associated with the option
+#  @param {object} parser The instance doing the parsing work
+#  @return void
+def setPort(option, opt_str, value, parser):
+	baconDegreesCore.setPort(value)
+
 ## Completes the entire tree from Kevin Bacon and caches all the results.
 #
 #  @param {object} parser The instance causing the callback
@@ -193,6 +363,16 @@ def complete(option, opt_str, value, parser):
 	runAsRoot()
 	baconDegreesCore.complete()
 
+## Prints how many actors are at each degree.
+#
+#  @param {object} parser The instance causing the callback
+#  @param {string} opt_str The option string from the command line
+#  @param {string} value The argument value associated with the option
+#  @param {object} parser The instance doing the parsing work
+#  @return void
+def showStats(option, opt_str, value, parser):
+	baconDegreesCore.showStats()
+
 ## Completes the entire tree from Kevin Bacon and caches all the results. Then
 #  finds all the exceptions.
 #
@@ -203,4 +383,15 @@ def complete(option, opt_str, value, parser):
 #  @return void
 def getExceptions(option, opt_str, value, parser):
 	runAsRoot()
-	baconDegreesCore.getExceptions()
\ No newline at end of file
+	baconDegreesCore.getExceptions()
+
+## Prints how long each step took and how much work was done once the command
+#  is done.
+#
+#  @param {object} parser The instance causing the callback
+#  @param {string} opt_str The option string from the command line
+#  @param {string} value The argument value associated with the option
+#  @param {object} parser The instance doing the parsing work
+#  @return void
+def setProfile(option, opt_str, value, parser):
+	baconDegreesCore.setProfile()
\ No newline at end of file
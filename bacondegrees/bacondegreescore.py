@@ -1,22 +1,35 @@
 #!/usr/bin/env python
 
 from baconsearch import BaconSearch
-from baconupdate import BaconUpdate
-from baconpyramid import BaconPyramid
-from baconhelpers import Benchmark, bold, loadingComplete
-
-## The controller for the module.
+from baconhelpers import (Benchmark, bold, loadingComplete, printAndExit,
+		getActorNameKey)
+import os
+import sys
+
+## The controller for the module. It's created every time the command runs,
+#  so only the search object is created up front. The update, pyramid,
+#  centers, and server objects are created the first time a command needs
+#  them, and their modules are only imported then, so a look up doesn't wait
+#  on importing everything else.
 #
 #  @author Chris Lock
 class BaconDegreesCore():
 	# @type {object} An instance of the search object
 	__baconSearch = BaconSearch()
-	# @type {object} An instance of the update object
-	__baconUpdate = BaconUpdate()
-	# @type {object} An instance of the pyramid builder object
-	__baconPyramid = BaconPyramid()
+	# @type {object} An instance of the update object once we need one
+	__baconUpdate = None
+	# @type {object} An instance of the pyramid builder object once we need one
+	__baconPyramid = None
+	# @type {object} An instance of the centers object once we need one
+	__baconCenters = None
 	# @type {object} An instance of the benchmark object
 	__benchmark = Benchmark()
+	# @type {int} How many processes to use, None for the defaults
+	__workers = None
+	# @type {int} The port the server listens on, None for the default
+	__port = None
+	# @type {string} The actor name to measure from instead of Kevin
+	__centerName = None
 
 	## An empty constructor
 	#
@@ -25,28 +38,137 @@ class BaconDegreesCore():
 	def __init__(self):
 		pass
 
-	## The controller for the module.
+	## The controller for the module. Cooks the default tar file if it's
+	#  still around. Checking for it here keeps a look up from importing the
+	#  update object when there's nothing to cook.
 	#
 	#  @param {object} self The object
-	#  @param {args} *args All the arguments passed to prep
+	#  @param {bool} verbose Should we say if there's nothing to cook
 	#  @return void
-	def prep(self, *args):
-		self.__baconUpdate.prep(*args)
+	def prep(self, verbose = False):
+		if os.path.isfile(self.__baconSearch.getDefaultTarFile()):
+			self.__getBaconUpdate().prep(verbose)
+
+		elif verbose:
+			print('Your bacon is already cooked.')
 
-	## Updates the data with a tar file.
+	## Gets the update object, creating it the first time.
+	#
+	#  @param {object} self The object
+	#  @return {object} The update object
+	def __getBaconUpdate(self):
+		if not self.__baconUpdate:
+			from baconupdate import BaconUpdate
+
+			self.__baconUpdate = BaconUpdate()
+
+			if self.__workers is not None:
+				self.__baconUpdate.setWorkers(self.__workers)
+
+		return self.__baconUpdate
+
+	## Gets the pyramid builder object, creating it the first time.
+	#
+	#  @param {object} self The object
+	#  @return {object} The pyramid builder object
+	def __getBaconPyramid(self):
+		if not self.__baconPyramid:
+			from baconpyramid import BaconPyramid
+
+			self.__baconPyramid = BaconPyramid()
+
+			if self.__workers is not None:
+				self.__baconPyramid.setWorkers(self.__workers)
+
+		return self.__baconPyramid
+
+	## Gets the centers object, creating it the first time.
+	#
+	#  @param {object} self The object
+	#  @return {object} The centers object
+	def __getBaconCenters(self):
+		if not self.__baconCenters:
+			from baconcenters import BaconCenters
+
+			self.__baconCenters = BaconCenters()
+
+		return self.__baconCenters
+
+	## Updates the data with a tar file, repairing anything already cached
+	#  instead of clearing it.
 	#
 	#  @param {object} self The object
 	#  @param {string} tarFileForUpdate the aboslute path to the tar file
 	#  @return void
 	def update(self, tarFileForUpdate):
-		self.__baconUpdate.update(tarFileForUpdate)
+		self.__getBaconUpdate().update(tarFileForUpdate, False, True)
 
-	## Preps the data if that hasn't been done yet and starts the benchmark
-	#  Show an easter egg if you look me up. If you search for Kevin Bacon, we
-	#  don't need to look anything up, othewise, we need to check that the
-	#  search is an actor in the data, then check if we've already solved
-	#  them, if not we run it through the pyramid to get the path. If we don't
-	#  find a result, we call that method, otherwise we print the result.
+	## Sets how many processes to use when reading tar files and solving the
+	#  entire pyramid. The update and pyramid objects get it when they're
+	#  created if we don't have them yet.
+	#
+	#  @param {object} self The object
+	#  @param {int} workers The number of processes
+	#  @return void
+	def setWorkers(self, workers):
+		self.__workers = workers
+
+		if self.__baconUpdate:
+			self.__baconUpdate.setWorkers(workers)
+
+		if self.__baconPyramid:
+			self.__baconPyramid.setWorkers(workers)
+
+	## Sets the port the server listens on and the client asks.
+	#
+	#  @param {object} self The object
+	#  @param {int} port The port
+	#  @return void
+	def setPort(self, port):
+		self.__port = port
+
+	## Starts recording how long each phase takes and how much work is done,
+	#  and prints it once the command is done however it ends.
+	#
+	#  @param {object} self The object
+	#  @return void
+	def setProfile(self):
+		import atexit
+
+		self.__benchmark.startProfile()
+		atexit.register(self.__showProfile)
+
+	## Prints the profile along with how the look up caches did as json to
+	#  stderr, so it's kept apart from anything the command printed.
+	#
+	#  @param {object} self The object
+	#  @return void
+	def __showProfile(self):
+		import json
+
+		profile = self.__benchmark.getProfile()
+		profile['caches'] = self.__baconSearch.getCacheStats()
+
+		sys.stdout.flush()
+		sys.stderr.write(json.dumps(profile, indent = 2, sort_keys = True) +
+				'\n')
+
+	## Sets the actor to measure degrees from instead of Kevin.
+	#
+	#  @param {object} self The object
+	#  @param {string} centerName The actor name
+	#  @return void
+	def setCenter(self, centerName):
+		self.__centerName = centerName
+
+	## Preps the data if that hasn't been done yet, opens it read only unless
+	#  we're caching before checking it's set up so it's only opened once, and
+	#  starts the benchmark. Show an easter egg if you look me up. If you
+	#  search for Kevin Bacon, we don't need to look anything up, othewise, we
+	#  need to check that the search is an actor in the data, then check if
+	#  we've already solved them, if not we run it through the pyramid to get
+	#  the path. If we don't find a result, we call that method, otherwise we
+	#  print the result.
 	#
 	#  @param {object} self The object
 	#  @param {string} actorName The actor name to look up
@@ -55,12 +177,18 @@ class BaconDegreesCore():
 	#  @return void
 	def get(self, actorName, useCaching = False):
 		self.prep()
+		self.__baconSearch.setWorkload(BaconSearch.QUERY if useCaching
+				else BaconSearch.READ).setup()
 		self.__benchmark.start()
 
 		# Easter egg
 		if (actorName == 'Chris Lock'):
 			return self.__showBestResults(actorName)
 
+		# Someone other than Kevin
+		if self.__hasCenter():
+			return self.__getFromCenter(actorName, useCaching)
+
 		# Kevin Bacon
 		if (actorName == 'Kevin Bacon'):
 			return self.__showResults(actorName, 0, ['He is himself.'])
@@ -71,7 +199,8 @@ class BaconDegreesCore():
 
 		# Actor no in the data
 		if not actorRow:
-			return self.__showNoResults(actorName)
+			return self.__showNoResults(actorName,
+					self.__getActorNamesLike(actorName))
 
 		actorNameProper = actorRow['ActorName']
 		actorResult = actorRow['Result']
@@ -80,7 +209,8 @@ class BaconDegreesCore():
 		if actorResult:
 			return self.__parsePath(actorNameProper, actorResult)
 
-		actorResult = self.__baconPyramid.find(actorRow['ActorId'], useCaching)
+		actorResult = self.__getBaconPyramid().find(actorRow['ActorId'],
+				useCaching)
 
 		# Actor found
 		if actorResult:
@@ -89,6 +219,162 @@ class BaconDegreesCore():
 		# Actor not solveable
 		return self.__showUnsolvableResult(actorNameProper)
 
+	## Checks if we're measuring from someone other than Kevin.
+	#
+	#  @param {object} self The object
+	#  @return {bool} There's a center that isn't Kevin
+	def __hasCenter(self):
+		return (self.__centerName is not None
+				and getActorNameKey(self.__centerName) != 'kevin bacon')
+
+	## Gets the row for the center. Exits if they're not in the data.
+	#
+	#  @param {object} self The object
+	#  @return {dictionary} The row for the center
+	def __getCenterRow(self):
+		centerRow = self.__baconSearch.getActorByName(self.__centerName)
+
+		if not centerRow:
+			printAndExit('I couldn\'t find ' + bold(self.__centerName) +
+					' to measure from.')
+
+		return centerRow
+
+	## Looks up an actor and finds their path to the center. When we're
+	#  caching we walk the center's whole tree and save it so the next look up
+	#  from them just follows the path back. Otherwise we search from both
+	#  ends.
+	#
+	#  @param {object} self The object
+	#  @param {string} actorName The actor name to look up
+	#  @param {bool} useCaching Whether to save the center's tree
+	#  @return void
+	def __getFromCenter(self, actorName, useCaching):
+		self.__baconSearch.setup().start()
+		centerRow = self.__getCenterRow()
+		actorRow = self.__baconSearch.getActorByName(actorName)
+		self.__baconSearch.end()
+
+		if not actorRow:
+			return self.__showNoResults(actorName,
+					self.__getActorNamesLike(actorName))
+
+		actorNameProper = actorRow['ActorName']
+		centerName = centerRow['ActorName']
+
+		if actorRow['ActorId'] == centerRow['ActorId']:
+			return self.__showResults(actorNameProper, 0,
+					['They are themselves.'])
+
+		if useCaching:
+			actorResult = self.__getBaconCenters().get(actorRow['ActorId'],
+					centerRow['ActorId'], True)
+
+		else:
+			actorResult = self.__getBaconPyramid().findBetween(
+					actorRow['ActorId'], centerRow['ActorId'])
+
+		if actorResult:
+			return self.__parsePath(actorNameProper, actorResult, centerName)
+
+		return self.__showUnsolvableResult(actorNameProper, centerName)
+
+	## Answers every name in a file, or stdin if the file is -, with a json
+	#  record per line. Cached names are answered from their results and every
+	#  other name is found from a single shared walk of the pyramid, or of the
+	#  center's tree if we're not measuring from Kevin.
+	#
+	#  @param {object} self The object
+	#  @param {string} namesFile The path to a file with a name on each line
+	#  @return void
+	def getBatch(self, namesFile):
+		import json
+
+		self.prep()
+		self.__baconSearch.setWorkload(BaconSearch.READ).setup().start()
+		centerRow = self.__getCenterRow() if self.__hasCenter() else None
+		centerName = centerRow['ActorName'] if centerRow else 'Kevin Bacon'
+		actorRows = [(actorName, self.__baconSearch.getActorByName(actorName))
+				for actorName in self.__getBatchNames(namesFile)]
+		actorResults = self.__getBatchResults(
+				[actorRow for (actorName, actorRow) in actorRows if actorRow],
+				centerRow)
+
+		for (actorName, actorRow) in actorRows:
+			print(json.dumps(self.__getBatchRecord(actorName, actorRow,
+					actorResults, centerName)))
+
+		self.__baconSearch.end()
+
+	## Gets the results for the actors in a batch.
+	#
+	#  @param {object} self The object
+	#  @param {list} actorRows The rows for the actors
+	#  @param {mixed} centerRow None for Kevin or the row for the center
+	#  @return {dictionary} Actor ids to results
+	def __getBatchResults(self, actorRows, centerRow):
+		if centerRow:
+			return dict((actorRow['ActorId'], self.__getBaconCenters().get(
+					actorRow['ActorId'], centerRow['ActorId']))
+					for actorRow in actorRows)
+
+		actorResults = dict((actorRow['ActorId'], actorRow['Result'])
+				for actorRow in actorRows if actorRow['Result'])
+		actorResults.update(self.__getBaconPyramid().findMany(
+				[actorRow['ActorId'] for actorRow in actorRows
+				if not actorRow['Result']], False, False))
+
+		return actorResults
+
+	## Reads the names to look up skipping any blank lines.
+	#
+	#  @param {object} self The object
+	#  @param {string} namesFile The path to the names file or - for stdin
+	#  @return {list} The names
+	def __getBatchNames(self, namesFile):
+		if namesFile == '-':
+			lines = sys.stdin.readlines()
+
+		else:
+			with open(namesFile) as names:
+				lines = names.readlines()
+
+		return [line.decode('utf-8').strip() for line in lines if line.strip()]
+
+	## Gets the record for a name in a batch. The degrees and path are None if
+	#  the name isn't an actor or they have no connection to the center.
+	#
+	#  @param {object} self The object
+	#  @param {string} actorName The name that was looked up
+	#  @param {mixed} actorRow None or the row for the actor
+	#  @param {dictionary} actorResults Actor ids to results
+	#  @param {string} centerName The actor name we're measuring from
+	#  @return {dictionary} The record
+	def __getBatchRecord(self, actorName, actorRow, actorResults, centerName):
+		record = {
+			'name': actorName,
+			'actorName': actorRow['ActorName'] if actorRow else None,
+			'center': centerName,
+			'baconDegrees': None,
+			'path': None,
+			}
+		actorResult = (actorResults.get(actorRow['ActorId']) if actorRow
+				else None)
+
+		if actorResult:
+			record['baconDegrees'] = actorResult['baconDegrees']
+			record['path'] = self.__getPathAsActorsAndFilms(
+					actorResult['path'],
+					self.__getEntityDictionary('Actor', actorResult['actors']),
+					self.__getEntityDictionary('Film', actorResult['films']),
+					)
+			record['path'].insert(0, record['actorName'])
+
+			if actorResult['baconDegrees']:
+				record['path'].append(centerName)
+
+		return record
+
 	## Prints the easter egg response.
 	#
 	#  @param {object} self The object
@@ -126,33 +412,91 @@ class BaconDegreesCore():
 	def __showBenchmark(self):
 		print('Took ' + self.__benchmark.end() + '.')
 
-	## Prints the no results message.
+	## Gets the names in the data closest to one that isn't.
+	#
+	#  @param {object} self The object
+	#  @param {string} actorName The actor name that was not found
+	#  @return {list} The closest actor names
+	def __getActorNamesLike(self, actorName):
+		self.__baconSearch.setup().start()
+		actorNamesLike = self.__baconSearch.getActorNamesLike(actorName)
+		self.__baconSearch.end()
+
+		return actorNamesLike
+
+	## Prints the no results message, suggesting the closest names if we have
+	#  any.
 	#
 	#  @param {object} self The object
 	#  @param {string} actorName The actor name that was not solved
+	#  @param {list} actorNamesLike The closest actor names
 	#  @return void
-	def __showNoResults(self, actorName):
-		print('I couldn\'t find ' + bold(actorName) + '.'
-			'\nAre you sure that\'s someone in Hollywood? I\'ve never heard of '
-			'them.')
+	def __showNoResults(self, actorName, actorNamesLike):
+		print('I couldn\'t find ' + bold(actorName) + '.')
+
+		if actorNamesLike:
+			print('Did you mean ' + self.__getOrList([bold(actorNameLike)
+					for actorNameLike in actorNamesLike]) + '?')
+
+		else:
+			print('Are you sure that\'s someone in Hollywood? I\'ve never '
+					'heard of them.')
+
+	## Joins names into a list like a sentence would.
+	#
+	#  @param {object} self The object
+	#  @param {list} names The names
+	#  @return {string} The names separated by commas with or before the last
+	def __getOrList(self, names):
+		if len(names) < 3:
+			return ' or '.join(names)
+
+		return ', '.join(names[:-1]) + ', or ' + names[-1]
 
 	## Parses the dictionary returned by the pyramid. Gets the names that
-	#  correspond with the id's and returns a list with each path.
+	#  correspond with the id's and returns a list with each path. If we're
+	#  measuring from Kevin we add how they stack up against everyone else.
 	#
 	#  @param {object} self The object
 	#  @param {string} actorName The actor name that was solved
 	#  @param {dictionary} actorResult The dictionary returned by the pyramid
+	#  @param {string} centerName The actor name the path ends at
 	#  @return void
-	def __parsePath(self, actorName, actorResult):
+	def __parsePath(self, actorName, actorResult, centerName = 'Kevin Bacon'):
 		pathList = self.__getPathList(
 				actorName,
 				actorResult['path'],
 				self.__getEntityDictionary('Actor', actorResult['actors']),
 				self.__getEntityDictionary('Film', actorResult['films']),
+				centerName,
 				)
 
+		if centerName == 'Kevin Bacon':
+			pathList += self.__getPercentileList(actorResult['baconDegrees'])
+
 		self.__showResults(actorName, actorResult['baconDegrees'], pathList)
 
+	## Gets the percent of actors further from Kevin than some degrees, using
+	#  the degree counts so it doesn't matter how many actors there are. We
+	#  only know where everyone is once the pyramid is solved.
+	#
+	#  @param {object} self The object
+	#  @param {int} degrees The degrees
+	#  @return {list} The line to print or nothing if it isn't solved
+	def __getPercentileList(self, degrees):
+		stats = self.__baconSearch.getStats()
+
+		if not stats or not self.__baconSearch.isSolved():
+			return []
+
+		actorTotal = sum(actorCount for (statDegrees, actorCount) in stats)
+		actorFurther = sum(actorCount for (statDegrees, actorCount) in stats
+				if statDegrees > degrees
+				or statDegrees == self.__baconSearch.NO_DEGREES)
+
+		return ['Closer to Kevin than ' +
+				str(100 * actorFurther // actorTotal) + '% of actors.']
+
 	## Gets a dictionary of ids to names for actors or films.
 	#
 	#  @param {object} self The object
@@ -172,20 +516,30 @@ class BaconDegreesCore():
 
 		return dictionary
 
-	## Takes the path to Kevin and a dictionary of actors and films to map each
-	#  id to the node in the path and build a list of each connection.
+	## Takes the path to the center and a dictionary of actors and films to map
+	#  each id to the node in the path and build a list of each connection.
 	#
 	#  @param {object} self The object
 	#  @param {string} actorName The actor name that was solved
-	#  @param {tuple} path The tuple of ids to get to Kevin
+	#  @param {tuple} path The tuple of ids to get to the center
 	#  @param {dictionary} actors The dictionary of actor ids to names
 	#  @param {dictionary} films The dictionary of film ids to names
+	#  @param {string} centerName The actor name the path ends at
 	#  @return {list} A list of connections, actor was in movie with actor
-	def __getPathList(self, actorName, path, actors, films):
+	def __getPathList(self, actorName, path, actors, films, centerName):
 		pathAsActorsAndFilms = self.__getPathAsActorsAndFilms(path, actors,
 				films)
 		pathAsActorsAndFilms.insert(0, actorName)
-		pathAsActorsAndFilms.append('Kevin Bacon')
+		pathAsActorsAndFilms.append(centerName)
+
+		return self.__getConnections(pathAsActorsAndFilms)
+
+	## Builds a list of each connection in a path of names.
+	#
+	#  @param {object} self The object
+	#  @param {list} pathAsActorsAndFilms The names from the actor to Kevin
+	#  @return {list} A list of connections, actor was in movie with actor
+	def __getConnections(self, pathAsActorsAndFilms):
 		pathList = []
 		i = 0
 
@@ -221,34 +575,151 @@ class BaconDegreesCore():
 	#
 	#  @param {object} self The object
 	#  @param {string} actorName The actor name that was unsolveable
+	#  @param {string} centerName The actor name they have no path to
 	#  @return void
-	def __showUnsolvableResult(self, actorName):
+	def __showUnsolvableResult(self, actorName, centerName = 'Kevin Bacon'):
 		noConnection = ('Inconceivable! ' + actorName + ' has no connection to '
-			'Kevin Bacon.')
+			+ centerName + '.')
 
 		self.__showResults(actorName, 'Infinity', [noConnection])
 
-	## Preps the data if it hasn't been done, starts the becnhmark, completes
-	#  the entire tree from Kevin, and prints the benchmark.
+	## Preps the data if it hasn't been done, makes sure the database is up to
+	#  date, starts the becnhmark, completes the entire tree from Kevin, and
+	#  prints the benchmark.
 	#
 	#  @param {object} self The object
 	#  @return void
 	def complete(self):
 		self.prep()
+		self.__baconSearch.setup()
 		print('"Wait, wait. I worry what you just heard was, \'Give me a lot '
 			'of bacon\'..."')
 		self.__benchmark.start()
-		self.__baconPyramid.findAll()
+		self.__getBaconPyramid().findAll()
 		print('\nOrder\'s up.')
 		self.__showBenchmark()
 
+	## Preps the data if it hasn't been done, loads everything into memory,
+	#  and answers lookups over http until interrupted.
+	#
+	#  @param {object} self The object
+	#  @return void
+	def sizzle(self):
+		from baconserver import BaconServer
+
+		self.prep()
+		self.__benchmark.start()
+		baconServer = BaconServer(self.__getPort()).load()
+		print('Sizzling on http://' + BaconServer.HOST + ':' +
+				str(self.__getPort()) + BaconServer.PATH + '?name= after ' +
+				self.__benchmark.end() + '.')
+		baconServer.serve()
+
+	## Gets the port the server listens on and the client asks.
+	#
+	#  @param {object} self The object
+	#  @return {int} The port we were given or the server's default
+	def __getPort(self):
+		from baconserver import BaconServer
+
+		return self.__port or BaconServer.PORT
+
+	## Asks a running server for a name and prints the result.
+	#
+	#  @param {object} self The object
+	#  @param {string} actorName The actor name to look up
+	#  @return void
+	def order(self, actorName):
+		from baconserver import BaconClient
+
+		self.__benchmark.start()
+		record = BaconClient(self.__getPort()).get(actorName,
+				self.__centerName)
+
+		if not record:
+			return printAndExit('Nothing\'s sizzling on port ' +
+					str(self.__getPort()) + '. Start it with --sizzle.')
+
+		if 'error' in record:
+			return printAndExit(record['error'])
+
+		if not record['actorName']:
+			return self.__showNoResults(actorName, record['suggestions'])
+
+		if record['baconDegrees'] is None:
+			return self.__showUnsolvableResult(record['actorName'],
+					record['center'])
+
+		if not record['baconDegrees']:
+			return self.__showResults(record['actorName'], 0,
+					['He is himself.' if record['center'] == 'Kevin Bacon'
+					else 'They are themselves.'])
+
+		self.__showResults(record['actorName'], record['baconDegrees'],
+				self.__getConnections(record['path']))
+
+	## Preps the data if it hasn't been done and prints the actor names that
+	#  start with a prefix.
+	#
+	#  @param {object} self The object
+	#  @param {string} prefix The start of the name
+	#  @return void
+	def getCompletions(self, prefix):
+		self.prep()
+		self.__baconSearch.setWorkload(BaconSearch.READ).setup().start()
+		actorNames = self.__baconSearch.getActorNamesByPrefix(prefix)
+		self.__baconSearch.end()
+
+		if not actorNames:
+			return printAndExit('No one on the menu starts with ' + bold(prefix)
+					+ '.')
+
+		for actorName in actorNames:
+			print(actorName)
+
+	## Preps the data if it hasn't been done and prints how many actors are
+	#  at each degree from the counts kept as results are saved. Until the
+	#  pyramid is solved, actors without degrees might just not be found yet.
+	#
+	#  @param {object} self The object
+	#  @return void
+	def showStats(self):
+		self.prep()
+		self.__baconSearch.setWorkload(BaconSearch.READ).setup().start()
+		stats = self.__baconSearch.getStats()
+		isSolved = self.__baconSearch.isSolved()
+		self.__baconSearch.end()
+		solvedStats = [(degrees, actorCount) for (degrees, actorCount) in stats
+				if degrees != self.__baconSearch.NO_DEGREES]
+		actorsWithout = sum(actorCount for (degrees, actorCount) in stats
+				if degrees == self.__baconSearch.NO_DEGREES)
+
+		if not solvedStats:
+			return printAndExit('Nothing\'s been solved yet. Try --swanson.')
+
+		actorTotal = sum(actorCount for (degrees, actorCount) in solvedStats)
+		degreesTotal = sum(degrees * actorCount
+				for (degrees, actorCount) in solvedStats)
+
+		for (degrees, actorCount) in solvedStats:
+			print(bold(str(degrees) + u'\xb0') + '\t' + str(actorCount))
+
+		print('Mean ' + bold('%.2f' % (float(degreesTotal) / actorTotal) +
+				u'\xb0') + ', max ' + bold(str(solvedStats[-1][0]) + u'\xb0'))
+
+		if isSolved:
+			print(str(actorsWithout) + ' with no connection to Kevin.')
+
+		else:
+			print(str(actorsWithout) + ' not solved yet. Try --swanson.')
+
 	## Updates the data with a new tar file
 	#
 	#  @param {object} self The object
 	#  @param {string} tarFileForOverwite the aboslute path to the tar file
 	#  @return void
 	def overwrite(self, tarFileForOverwite):
-		self.__baconUpdate.overwrite(tarFileForOverwite)
+		self.__getBaconUpdate().overwrite(tarFileForOverwite)
 
 	## Preps the data if it hasn't been done, starts the becnhmark, completes
 	#  the entire tree from Kevin, finds any actros with no connection to
@@ -259,7 +730,7 @@ class BaconDegreesCore():
 	def getExceptions(self):
 		self.prep()
 		self.__benchmark.start()
-		self.__baconPyramid.findAll()
+		self.__getBaconPyramid().findAll()
 
 		for film, actors in self.__baconSearch.getUnsolved().items():
 			print(bold(film))
@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+
+from array import array
+from baconhelpers import Benchmark, loading
+
+# @type {module} NumPy once isAvailable has imported it, None until then or if
+#	it isn't installed
+numpy = None
+
+## Walks the rest of a pyramid a whole tier at a time with NumPy instead of an
+#  actor at a time. For each tier we gather the films of every actor on it,
+#  drop the ones that already have a parent, and keep the first time we saw
+#  each film. Then we do the same for the casts of those films. Keeping the
+#  first time we saw each id is the same order the one at a time walk would
+#  find them in, so the pyramid comes out the same either way. NumPy is
+#  optional and takes longer to import than most look ups take, so it's only
+#  imported by isAvailable, which needs to be checked before using it.
+#
+#  @author Chris Lock
+class BaconFrontier():
+	# @constant The degrees for an actor we haven't found
+	NOT_FOUND = -1
+	# @constant The NumPy type matching the pyramid's array columns
+	DTYPE = 'i' + str(array('i').itemsize)
+
+	# @type {object} An instance of the benchmark object for the profile
+	__benchmark = Benchmark()
+	# @type {bool} Have we tried importing NumPy yet
+	__hasImported = False
+
+	## An empty constructor.
+	#
+	#  @param {object} self The object
+	#  @return void
+	def __init__(self):
+		pass
+
+	## Checks if NumPy is installed, importing it the first time.
+	#
+	#  @param {object} self The object
+	#  @return {bool} We can walk with NumPy
+	def isAvailable(self):
+		global numpy
+
+		if not BaconFrontier.__hasImported:
+			BaconFrontier.__hasImported = True
+
+			try:
+				import numpy
+
+			except ImportError:
+				numpy = None
+
+		return numpy is not None
+
+	## Walks every tier left in the pyramid and puts the columns, queue, and
+	#  pointer back in it as arrays. They're also put back between tiers
+	#  whenever the checkpointer says it's time to save. The actors expanded
+	#  and edges scanned are counted once we're done for the profile.
+	#
+	#  @param {object} self The object
+	#  @param {dictionary} pyramid The pyramid with array columns that cover
+	#		every id in the graph
+	#  @param {object} baconGraph The loaded graph
+	#  @param {mixed} checkpointer None or the object with isCheckpointDue and
+	#		checkpoint methods that saves the pyramid
+	#  @return void
+	def expand(self, pyramid, baconGraph, checkpointer = None):
+		(actorOffsets, actorFilms, filmOffsets, filmActors) = [
+				self.__toNumpy(values)
+				for values in baconGraph.getCompressedRows()]
+		actorDegrees = self.__toNumpy(pyramid['actorDegrees'])
+		actorParents = self.__toNumpy(pyramid['actorParents'])
+		filmParents = self.__toNumpy(pyramid['filmParents'])
+		queue = self.__toNumpy(pyramid['queue'])
+		pointer = pyramid['pointer']
+		startPointer = pointer
+		edgeCount = 0
+
+		while pointer < len(queue):
+			castDegrees = actorDegrees[queue[pointer]] + 1
+			tierEnd = pointer + numpy.searchsorted(
+					actorDegrees[queue[pointer:]], castDegrees - 1, 'right')
+
+			(filmIds, parentActorIds, filmEdgeCount) = self.__getNewNeighbors(
+					actorOffsets, actorFilms, queue[pointer:tierEnd],
+					filmParents != 0)
+			filmParents[filmIds] = parentActorIds
+
+			(actorIds, parentFilmIds, castEdgeCount) = self.__getNewNeighbors(
+					filmOffsets, filmActors, filmIds,
+					actorDegrees != self.NOT_FOUND)
+			actorDegrees[actorIds] = castDegrees
+			actorParents[actorIds] = parentFilmIds
+			edgeCount += filmEdgeCount + castEdgeCount
+
+			queue = numpy.concatenate((queue, actorIds))
+			pointer = tierEnd
+			loading(castDegrees, 1)
+
+			if checkpointer and checkpointer.isCheckpointDue(pointer):
+				self.__setPyramid(pyramid, actorDegrees, actorParents,
+						filmParents, queue, pointer)
+				checkpointer.checkpoint(pyramid)
+
+		self.__setPyramid(pyramid, actorDegrees, actorParents, filmParents,
+				queue, pointer)
+		self.__benchmark.count('nodesExpanded', int(pointer - startPointer))
+		self.__benchmark.count('edgesScanned', edgeCount)
+
+	## Gathers the neighbors for a set of ids from one side of the graph and
+	#  keeps the first time we saw each one we haven't found yet, along with
+	#  the id we saw it from.
+	#
+	#  @param {object} self The object
+	#  @param {object} offsets Where each id's neighbors start
+	#  @param {object} neighbors The neighbors for every id one after another
+	#  @param {object} ids The ids to gather neighbors for
+	#  @param {object} isFound Whether each neighbor id has been found
+	#  @return {object} The new neighbor ids, {object} The id each was seen
+	#		from, {int} How many neighbors we gathered
+	def __getNewNeighbors(self, offsets, neighbors, ids, isFound):
+		starts = offsets[ids]
+		lengths = offsets[ids + 1] - starts
+		ends = numpy.cumsum(lengths)
+		positions = (numpy.arange(ends[-1] if len(ends) else 0) +
+				numpy.repeat(starts - ends + lengths, lengths))
+		neighborIds = neighbors[positions]
+		parentIds = numpy.repeat(ids, lengths)
+		isNew = ~isFound[neighborIds]
+		neighborIds = neighborIds[isNew]
+		parentIds = parentIds[isNew]
+
+		(uniqueIds, firsts) = numpy.unique(neighborIds, return_index = True)
+		firsts.sort()
+
+		return neighborIds[firsts], parentIds[firsts], len(positions)
+
+	## Puts the columns, queue, and pointer back in the pyramid as arrays.
+	#
+	#  @param {object} self The object
+	#  @param {dictionary} pyramid The pyramid
+	#  @param {object} actorDegrees The degrees for each actor id
+	#  @param {object} actorParents The film id each actor id was found from
+	#  @param {object} filmParents The actor id each film id was found from
+	#  @param {object} queue The actor ids in the order they were found
+	#  @param {int} pointer The index in the queue of the next actor to expand
+	#  @return void
+	def __setPyramid(self, pyramid, actorDegrees, actorParents, filmParents,
+			queue, pointer):
+		pyramid['actorDegrees'] = self.__toArray(actorDegrees)
+		pyramid['actorParents'] = self.__toArray(actorParents)
+		pyramid['filmParents'] = self.__toArray(filmParents)
+		pyramid['queue'] = self.__toArray(queue)
+		pyramid['pointer'] = pointer
+
+	## Copies an array into a NumPy array we can change.
+	#
+	#  @param {object} self The object
+	#  @param {array} values The array
+	#  @return {object} The NumPy array
+	def __toNumpy(self, values):
+		return numpy.frombuffer(values.tostring(), self.DTYPE).copy()
+
+	## Copies a NumPy array back into an array.
+	#
+	#  @param {object} self The object
+	#  @param {object} values The NumPy array
+	#  @return {array} The array
+	def __toArray(self, values):
+		column = array('i')
+		column.fromstring(values.astype(self.DTYPE).tostring())
+
+		return column
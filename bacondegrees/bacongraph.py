@@ -0,0 +1,271 @@
+#!/usr/bin/env python
+
+from array import array
+from baconsearch import BaconSearch
+from baconhelpers import Benchmark
+
+## An in-memory copy of the Casts table stored as compressed sparse rows. We
+#  load every cast once and keep two sets of arrays, actor to films and film
+#  to actors. For each one the offsets array holds where an id's neighbors
+#  start in the neighbors array, so the neighbors for an id are just the slice
+#  between its offset and the next one. That lets the pyramid walk the graph
+#  without going back to the database for every node.
+#
+#  @author Chris Lock
+class BaconGraph():
+	# @type {object} An instance of the search object
+	__baconSearch = BaconSearch()
+	# @type {object} An instance of the benchmark object for the profile
+	__benchmark = Benchmark()
+	# @type {array} Where each actor's films start in __actorFilms
+	__actorOffsets = array('i', [0])
+	# @type {array} The film ids for every actor one after another
+	__actorFilms = array('i')
+	# @type {array} Where each film's actors start in __filmActors
+	__filmOffsets = array('i', [0])
+	# @type {array} The actor ids for every film one after another
+	__filmActors = array('i')
+	# @type {int} The last cast row we loaded so we know when we're stale
+	__castsVersion = None
+
+	## An empty constructor.
+	#
+	#  @param {object} self The object
+	#  @return void
+	def __init__(self):
+		pass
+
+	## Loads the casts into the arrays if we haven't already or if casts have
+	#  been added since we did.
+	#
+	#  @param {object} self The object
+	#  @return {object} The object for chaining
+	def load(self):
+		castsVersion = self.__baconSearch.getCastsVersion()
+
+		if castsVersion == self.__castsVersion:
+			return self
+
+		self.__benchmark.startPhase('graphLoad')
+		casts = self.__baconSearch.getCasts()
+		(actorIdMax, filmIdMax) = self.__getIdMaxes(casts)
+
+		(self.__actorOffsets, self.__actorFilms) = self.__getCompressedRows(
+				casts, 1, 0, actorIdMax)
+		(self.__filmOffsets, self.__filmActors) = self.__getCompressedRows(
+				casts, 0, 1, filmIdMax)
+		self.__castsVersion = castsVersion
+		self.__benchmark.endPhase('graphLoad')
+
+		return self
+
+	## Gets the largest actor and film ids in the casts.
+	#
+	#  @param {object} self The object
+	#  @param {list} casts The cast rows, film id then actor id
+	#  @return {int} The largest actor id, {int} The largest film id
+	def __getIdMaxes(self, casts):
+		actorIdMax = 0
+		filmIdMax = 0
+
+		for cast in casts:
+			if cast[0] > filmIdMax:
+				filmIdMax = cast[0]
+
+			if cast[1] > actorIdMax:
+				actorIdMax = cast[1]
+
+		return actorIdMax, filmIdMax
+
+	## Builds the offsets and neighbors arrays for one side of the casts. We
+	#  count the neighbors for each id, turn the counts into offsets, then drop
+	#  each neighbor into the next open spot for its id. Casts keep the order
+	#  they were added in so the walk matches the database.
+	#
+	#  @param {object} self The object
+	#  @param {list} casts The cast rows, film id then actor id
+	#  @param {int} idIndex The column of the id we're indexing by
+	#  @param {int} neighborIndex The column of the neighbor id
+	#  @param {int} idMax The largest id we're indexing by
+	#  @return {array} The offsets, {array} The neighbors
+	def __getCompressedRows(self, casts, idIndex, neighborIndex, idMax):
+		offsets = array('i', [0]) * (idMax + 2)
+		neighbors = array('i', [0]) * len(casts)
+
+		for cast in casts:
+			offsets[cast[idIndex] + 1] += 1
+
+		for id in range(1, idMax + 2):
+			offsets[id] += offsets[id - 1]
+
+		positions = offsets[:]
+
+		for cast in casts:
+			id = cast[idIndex]
+			neighbors[positions[id]] = cast[neighborIndex]
+			positions[id] += 1
+
+		return offsets, neighbors
+
+	## Gets the film ids for an actor id.
+	#
+	#  @param {object} self The object
+	#  @param {int} actorId The actor id
+	#  @return {array} The film ids
+	def getFilmIdsByActorId(self, actorId):
+		return self.__getNeighbors(self.__actorOffsets, self.__actorFilms,
+				actorId)
+
+	## Gets the slice of neighbors for an id or an empty array if the id isn't
+	#  in any casts.
+	#
+	#  @param {object} self The object
+	#  @param {array} offsets The offsets for the side we're looking at
+	#  @param {array} neighbors The neighbors for the side we're looking at
+	#  @param {int} id The id to get neighbors for
+	#  @return {array} The neighbor ids
+	def __getNeighbors(self, offsets, neighbors, id):
+		if id + 1 >= len(offsets):
+			return neighbors[0:0]
+
+		return neighbors[offsets[id]:offsets[id + 1]]
+
+	## Gets the actor ids for a film id.
+	#
+	#  @param {object} self The object
+	#  @param {int} filmId The film id
+	#  @return {array} The actor ids
+	def getActorIdsByFilmId(self, filmId):
+		return self.__getNeighbors(self.__filmOffsets, self.__filmActors,
+				filmId)
+
+	## Gets the offsets and neighbors arrays for both sides.
+	#
+	#  @param {object} self The object
+	#  @return {array} The actor offsets, {array} The actor films, {array} The
+	#		film offsets, {array} The film actors
+	def getCompressedRows(self):
+		return (self.__actorOffsets, self.__actorFilms, self.__filmOffsets,
+				self.__filmActors)
+
+	## Finds a shortest path between two actors by searching out from both of
+	#  them. We always grow whichever side has the smaller frontier by a whole
+	#  tier and stop at the first tier that reaches something the other side
+	#  has already found. Of the actors found on that tier, the one closest to
+	#  the other side is on a shortest path. The actors expanded and edges
+	#  scanned are counted once we're done for the profile.
+	#
+	#  @param {object} self The object
+	#  @param {int} actorId The actor id we're starting at
+	#  @param {int} targetActorId The actor id we're looking for
+	#  @return {mixed} None if there's no path or the tuple of film and actor
+	#		ids between the two actors, not including them
+	def getPath(self, actorId, targetActorId):
+		if actorId == targetActorId:
+			return ()
+
+		parents = ({actorId: None}, {targetActorId: None})
+		films = (set(), set())
+		frontiers = [[actorId], [targetActorId]]
+		path = None
+		nodeCount = 0
+		edgeCount = 0
+
+		self.__benchmark.startPhase('expansion')
+
+		while frontiers[0] and frontiers[1] and path is None:
+			side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+			nodeCount += len(frontiers[side])
+			(frontiers[side], meetings, frontierEdgeCount) = (
+					self.__expandFrontier(frontiers[side], parents[side],
+					films[side], parents[1 - side]))
+			edgeCount += frontierEdgeCount
+
+			if meetings:
+				meeting = self.__getClosestMeeting(meetings, parents[1 - side])
+				path = self.__getMeetingPath(meeting, parents)
+
+		self.__benchmark.endPhase('expansion')
+		self.__benchmark.count('nodesExpanded', nodeCount)
+		self.__benchmark.count('edgesScanned', edgeCount)
+
+		return path
+
+	## Expands a frontier of actors by a tier. Every actor we haven't found on
+	#  this side is given the film and actor it was found from.
+	#
+	#  @param {object} self The object
+	#  @param {list} frontier The actor ids on the current tier
+	#  @param {dictionary} parents Actor ids to (film id, actor id) on this side
+	#  @param {set} films The film ids already expanded on this side
+	#  @param {dictionary} otherParents Actor ids found on the other side
+	#  @return {list} The next frontier, {list} The new actor ids that the
+	#		other side has already found, {int} How many film and cast ids we
+	#		read
+	def __expandFrontier(self, frontier, parents, films, otherParents):
+		nextFrontier = []
+		meetings = []
+		edgeCount = 0
+
+		for actorId in frontier:
+			filmIds = self.getFilmIdsByActorId(actorId)
+			edgeCount += len(filmIds)
+
+			for filmId in filmIds:
+				if filmId in films:
+					continue
+
+				films.add(filmId)
+				castActorIds = self.getActorIdsByFilmId(filmId)
+				edgeCount += len(castActorIds)
+
+				for castActorId in castActorIds:
+					if castActorId in parents:
+						continue
+
+					parents[castActorId] = (filmId, actorId)
+					nextFrontier.append(castActorId)
+
+					if castActorId in otherParents:
+						meetings.append(castActorId)
+
+		return nextFrontier, meetings, edgeCount
+
+	## Gets the meeting actor that's the fewest steps from the other side.
+	#
+	#  @param {object} self The object
+	#  @param {list} meetings The actor ids both sides have found
+	#  @param {dictionary} otherParents Actor ids found on the other side
+	#  @return {int} The closest meeting actor id
+	def __getClosestMeeting(self, meetings, otherParents):
+		return min(meetings, key = lambda actorId:
+				len(self.__getChain(otherParents, actorId)))
+
+	## Gets the film and actor ids from an actor back to where its side
+	#  started.
+	#
+	#  @param {object} self The object
+	#  @param {dictionary} parents Actor ids to (film id, actor id) on one side
+	#  @param {int} actorId The actor id to start from
+	#  @return {list} The film and actor ids ending at the side's start
+	def __getChain(self, parents, actorId):
+		chain = []
+
+		while parents[actorId]:
+			(filmId, actorId) = parents[actorId]
+			chain += [filmId, actorId]
+
+		return chain
+
+	## Joins both sides at the meeting actor and drops the two end actors.
+	#
+	#  @param {object} self The object
+	#  @param {int} meeting The actor id both sides found
+	#  @param {tuple} parents The parents dictionaries for both sides
+	#  @return {tuple} The film and actor ids between the two actors
+	def __getMeetingPath(self, meeting, parents):
+		startChain = self.__getChain(parents[0], meeting)
+		startChain.reverse()
+		path = startChain + [meeting] + self.__getChain(parents[1], meeting)
+
+		return tuple(path[1:-1])
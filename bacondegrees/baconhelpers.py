@@ -1,6 +1,9 @@
 #!/usr/bin/env python
 
+from collections import OrderedDict
 from sys import exit, stdout
+import signal
+import string
 from time import time
 
 ## Helper functions for outputting to command line.
@@ -29,9 +32,24 @@ def printAndExit(message):
 def bold(string):
 	return u'\033[1m' + string + '\033[0m'
 
-## A class for printing a performace benchmark.
+## A class for printing a performace benchmark. Every benchmark also shares a
+#  profile of how long each phase of a command took and how much work it did.
+#  Nothing is recorded until profiling is started, so until then a timer or
+#  counter is just a check. Phases add up each time they run and can run
+#  inside each other. Work done in pool workers isn't seen by this process,
+#  so it's counted from what they send back.
 class Benchmark():
 	startTime = None
+	# @type {bool} Are we recording the profile
+	isProfiling = False
+	# @type {float} When we started profiling
+	profileStartTime = None
+	# @type {dictionary} Phase names to the seconds spent in them
+	timers = {}
+	# @type {dictionary} Phase names to when they were started
+	phaseStartTimes = {}
+	# @type {dictionary} Counter names to counts
+	counters = {}
 
 	## Empty constructor.
 	#
@@ -91,27 +109,158 @@ class Benchmark():
 
 		return str(value) + ' ' + measurement + pluralize + endCharacter
 
+	## Starts recording the profile for every benchmark.
+	#
+	#  @param {object} self The object
+	#  @return void
+	def startProfile(self):
+		Benchmark.isProfiling = True
+		Benchmark.profileStartTime = time()
+		self.timers.clear()
+		self.phaseStartTimes.clear()
+		self.counters.clear()
+
+	## Starts timing a phase if we're profiling.
+	#
+	#  @param {object} self The object
+	#  @param {string} phase The phase name
+	#  @return void
+	def startPhase(self, phase):
+		if self.isProfiling:
+			self.phaseStartTimes[phase] = time()
+
+	## Adds the time since a phase was started to its timer if we're
+	#  profiling.
+	#
+	#  @param {object} self The object
+	#  @param {string} phase The phase name
+	#  @return void
+	def endPhase(self, phase):
+		if self.isProfiling and phase in self.phaseStartTimes:
+			self.timers[phase] = (self.timers.get(phase, 0) + time() -
+					self.phaseStartTimes.pop(phase))
+
+	## Adds to a counter if we're profiling. Counting once for a batch of
+	#  work keeps hot loops from paying for this call on every node.
+	#
+	#  @param {object} self The object
+	#  @param {string} counter The counter name
+	#  @param {int} amount How much to add
+	#  @return void
+	def count(self, counter, amount = 1):
+		if self.isProfiling:
+			self.counters[counter] = self.counters.get(counter, 0) + amount
+
+	## Gets the profile so far.
+	#
+	#  @param {object} self The object
+	#  @return {dictionary} The seconds since profiling started, the timers,
+	#		and the counters
+	def getProfile(self):
+		return {
+			'seconds': time() - self.profileStartTime,
+			'timers': dict(self.timers),
+			'counters': dict(self.counters),
+			}
+
+## A dictionary that only keeps the values used most recently. Getting or
+#  setting a key moves it to the end, so once we're full the first key is the
+#  one to drop. Gets are counted as hits or misses.
+class LruCache():
+	# @type {int} How many gets found their key
+	hits = 0
+	# @type {int} How many gets didn't find their key
+	misses = 0
+	# @type {int} How many values we've dropped to make room
+	evictions = 0
+	# @type {int} How many values we keep
+	__size = 0
+	# @type {object} The keys and values from least to most recently used
+	__values = None
+
+	## Sets the size.
+	#
+	#  @param {object} self The object
+	#  @param {int} size How many values to keep
+	#  @return void
+	def __init__(self, size):
+		self.__size = size
+		self.__values = OrderedDict()
+
+	## Gets a value and marks it as the most recently used.
+	#
+	#  @param {object} self The object
+	#  @param {mixed} key The key
+	#  @param {mixed} default What to return if we don't have the key
+	#  @return {mixed} The value or the default
+	def get(self, key, default = None):
+		if key not in self.__values:
+			self.misses += 1
+
+			return default
+
+		self.hits += 1
+		value = self.__values.pop(key)
+		self.__values[key] = value
+
+		return value
+
+	## Sets a value as the most recently used and drops the least recently
+	#  used if we have too many.
+	#
+	#  @param {object} self The object
+	#  @param {mixed} key The key
+	#  @param {mixed} value The value
+	#  @return void
+	def set(self, key, value):
+		self.__values.pop(key, None)
+		self.__values[key] = value
+
+		while len(self.__values) > self.__size:
+			self.__values.popitem(False)
+			self.evictions += 1
+
+	## Drops every value.
+	#
+	#  @param {object} self The object
+	#  @return void
+	def clear(self):
+		self.__values.clear()
+
+	## Gets how many values we have.
+	#
+	#  @param {object} self The object
+	#  @return {int} The number of values
+	def __len__(self):
+		return len(self.__values)
+
 ## Prints a progress bar for a given itteration out of a total number of
 #  itterations.
 #
 #  @param {int} itteration The current itteration
 #  @param {int} total The total number of itterations
+#  @param {string} unit What the itterations are counting if anything
 #  @return void
-def progressBar(itteration, total):
-	## Get's the ascii representation of the progress bar.
+def progressBar(itteration, total, unit = ''):
+	## Get's the ascii representation of the progress bar. Nothing to do is
+	#  shown as done, so a total that rounds down to 0 doesn't divide by it.
 	#
 	#  @param {int} itteration The current itteration
 	#  @param {int} total The total number of itterations
 	#  @return {string} The progress bar
 	def getProgressBar(current, total):
 		steps = 19.0
+
+		if total <= 0:
+			return '[~' + ('~' * int(steps)) + ']'
+
 		progress = int(float(current) / float(total) * steps)
 		progressRemaining = int(steps) - progress
 
 		return '[~' + ('~' * progress) + (' ' * progressRemaining) + ']'
 
 	stdout.write('\r' + getProgressBar(itteration, total) +
-			' (' + str(itteration) + '/' + str(total) + ')')
+			' (' + str(itteration) + '/' + str(total) + unit + ')')
 	stdout.flush()
 
 ## Prints a loading icon for a given itteration.
@@ -133,4 +282,28 @@ def loading(itteration, speedReduction = 250):
 #  @param {string} message The message to print
 #  @return void
 def loadingComplete(message):
-	stdout.write('\r' + message + '\n')
\ No newline at end of file
+	stdout.write('\r' + message + '\n')
+
+## Ignores keyboard interruptions in pool workers so only the process that
+#  started them handles them.
+#
+#  @return void
+def ignoreInterrupts():
+	signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+# @constant Maps upper case letters to lower case the way SQLite's NOCASE does,
+#	which only folds ascii
+NOCASE = dict((ord(letter), ord(letter.lower()))
+		for letter in string.ascii_uppercase)
+
+## Gets the key an actor's name is matched on, so names that only differ by
+#  case are the same actor like they are in the data.
+#
+#  @param {string} actorName The actor name
+#  @return {string} The key for the name
+def getActorNameKey(actorName):
+	if isinstance(actorName, unicode):
+		return actorName.translate(NOCASE)
+
+	return actorName.translate(string.maketrans(string.ascii_uppercase,
+			string.ascii_lowercase))
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+
+from bisect import bisect_left
+import marshal
+import os
+
+## A sorted index of every actor name so we can find the names that start
+#  with a prefix without scanning the Actors table. Names are sorted by a
+#  lower cased key, so the matches for a prefix sit next to each other and a
+#  binary search finds the first one. The index is saved next to the database
+#  when the data is updated and kept in memory once it's loaded, so long
+#  running processes only read it once.
+#
+#  @author Chris Lock
+class BaconNames():
+	# @constant The value every names file starts with
+	MAGIC = 'BACONNAM'
+	# @constant The version of the file layout
+	VERSION = 1
+	# @constant How many names we complete a prefix with
+	LIMIT = 10
+
+	# @type {string} The path to the names file
+	__filePath = None
+	# @type {list} The lower cased keys in sorted order
+	__keys = None
+	# @type {list} The actor names in the same order as their keys
+	__names = None
+
+	## Sets the path to the file.
+	#
+	#  @param {object} self The object
+	#  @param {string} filePath The path to the names file
+	#  @return void
+	def __init__(self, filePath):
+		self.__filePath = filePath
+
+	## Checks if there's a saved index.
+	#
+	#  @param {object} self The object
+	#  @return {bool} The file exists
+	def exists(self):
+		return os.path.isfile(self.__filePath)
+
+	## Sorts the names by their keys and writes them to a temporary file that
+	#  we move over the old one so anyone reading the old one never gets half
+	#  an index.
+	#
+	#  @param {object} self The object
+	#  @param {iterable} actorNames Every actor name
+	#  @return void
+	def build(self, actorNames):
+		keysAndNames = sorted((self.getKey(actorName), actorName)
+				for actorName in actorNames)
+		self.__keys = [key for (key, actorName) in keysAndNames]
+		self.__names = [actorName for (key, actorName) in keysAndNames]
+		temporaryPath = self.__filePath + '.tmp'
+
+		with open(temporaryPath, 'wb') as namesFile:
+			marshal.dump((self.MAGIC, self.VERSION, self.__keys, self.__names),
+					namesFile)
+
+		os.rename(temporaryPath, self.__filePath)
+
+	## Reads the index into memory if it isn't already. Leaves it empty if the
+	#  file is missing or from another layout.
+	#
+	#  @param {object} self The object
+	#  @return {bool} The index is loaded
+	def load(self):
+		if self.__keys is not None:
+			return True
+
+		if not self.exists():
+			return False
+
+		with open(self.__filePath, 'rb') as namesFile:
+			try:
+				(magic, version, keys, names) = marshal.load(namesFile)
+
+			except (EOFError, ValueError, TypeError):
+				return False
+
+		if magic != self.MAGIC or version != self.VERSION:
+			return False
+
+		self.__keys = keys
+		self.__names = names
+
+		return True
+
+	## Gets the key a name is sorted and matched on.
+	#
+	#  @param {object} self The object
+	#  @param {string} name The name or prefix
+	#  @return {unicode} The lower cased name
+	def getKey(self, name):
+		if isinstance(name, str):
+			name = name.decode('utf-8')
+
+		return name.lower()
+
+	## Finds the first names that start with a prefix in sorted order.
+	#
+	#  @param {object} self The object
+	#  @param {string} prefix The start of the name
+	#  @param {int} limit The most names to return
+	#  @return {list} The actor names, empty if the index isn't loaded
+	def complete(self, prefix, limit = LIMIT):
+		if not self.load():
+			return []
+
+		key = self.getKey(prefix)
+		names = []
+		index = bisect_left(self.__keys, key)
+
+		while (len(names) < limit and index < len(self.__keys)
+				and self.__keys[index].startswith(key)):
+			names.append(self.__names[index])
+			index += 1
+
+		return names
+
+	## Drops the index from memory and removes the file if there is one.
+	#
+	#  @param {object} self The object
+	#  @return void
+	def remove(self):
+		self.__keys = None
+		self.__names = None
+
+		if self.exists():
+			os.remove(self.__filePath)
@@ -1,412 +1,827 @@
 #!/usr/bin/env python
 
+from array import array
 from baconsearch import BaconSearch
-from copy import deepcopy, copy
-from baconhelpers import printAndExit, loading
-import gc
-
-## Builds a pyramid of all the nodes with their connection to Kevin. The 
-#  approach is to add alternating tiers of actors and films starting at Kevin
-#  and filtering the ones we've already found until there are none left. Solving
-#  starting at Kevin allows us to have solved any actor found on the way and 
-#  store the pyramid for future look ups so we don't have to start over. The
-#  results is a dictionary that include the actor and film ids in the path to 
-#  the node and the path of ids. We can exclude the two en points since we know
-#  where we're starting and finishing.
+from bacongraph import BaconGraph
+from baconfrontier import BaconFrontier
+from bacontiers import BaconTiers
+from baconhelpers import Benchmark, printAndExit, loading
+import signal
+from time import time
+
+## Builds a pyramid of all the nodes with their connection to Kevin. The
+#  approach is a breadth first walk starting at Kevin, adding the films for
+#  each actor we reach and the casts of those films, and filtering the ones
+#  we've already found until there are none left. Solving starting at Kevin
+#  allows us to have solved any actor found on the way and store the pyramid
+#  for future look ups so we don't have to start over. The pyramid is kept as
+#  columns indexed by id: each actor's degrees and the film it was found from,
+#  each film's actor it was found from, and a queue of actors in the order they
+#  were found with a pointer to the next one to expand. Each found actor is
+#  saved as their degrees and parents, and the result read back is a
+#  dictionary that include the actor and film ids in the path to the node and
+#  the path of ids. We can exclude the two en points since we know where we're
+#  starting and finishing. By default the casts are walked in memory with the
+#  graph, but the pyramid can still walk them through the search object one
+#  query at a time. Long walks that cache are saved every so often, and when
+#  they're interrupted, so the next walk picks up where the last save left
+#  off.
 #
 #  @author Chris Lock
 class BaconPyramid():
-	# @constant The no results string used.
-	NO_RESULTS = '__NO_RESULT__'
+	# @constant The degrees for an actor we haven't found
+	NOT_FOUND = -1
+	# @constant How long a walk goes in seconds before it's saved
+	CHECKPOINT_SECONDS = 300
+	# @constant How many actors a walk expands before it's saved
+	CHECKPOINT_ACTORS = 1000000
+	# @constant How many actors we expand one at a time between checking if
+	#	it's time to save
+	CHECKPOINT_INTERVAL = 1000
 
 	# @type {object} An instance of the search object
 	__baconSearch = BaconSearch()
-	# @type {int} The actor id we're looking for.
-	__actorId = 0
+	# @type {object} An instance of the graph object
+	__baconGraph = BaconGraph()
+	# @type {object} An instance of the NumPy frontier object
+	__baconFrontier = BaconFrontier()
+	# @type {object} An instance of the benchmark object for the profile
+	__benchmark = Benchmark()
+	# @type {bool} Should we walk the in memory graph instead of the database
+	__useGraph = True
+	# @type {int} How many processes solve the entire pyramid
+	__workers = 1
+	# @type {set} The actor ids we're looking for and haven't found yet
+	__actorIds = set()
 	# @type {bool} Should we cache results
 	__useCaching = False
-	# @type {dictionary} The pyramid including actors, films, the completed 
-	#	tier, and the pyramid
+	# @type {bool} Should we print the loading icon as we walk
+	__showLoading = True
+	# @type {dictionary} The pyramid including the columns, queue, and pointer
 	__pyramid = {}
-	# @type {tuples} All the actor ids found so far
-	__actors = ()
-	# @type {tuples} All the film ids found so far
-	__films = ()
-	# @type {list} All the tiers
-	__tiers = []
-	# @type {dictionary} The current tier
-	__tier = {}
-	# @type {int} The current tier index
-	__tierIndex = 0
-	# @type {bool} Is the current tier complete
-	__tierIsComplete = False
-	# @type {int} The pointer in the current tier
+	# @type {array} The degrees for each actor id, NOT_FOUND if not found yet
+	__actorDegrees = array('i')
+	# @type {array} The film id each actor id was found from
+	__actorParents = array('i')
+	# @type {array} The actor id each film id was found from, 0 if not found
+	__filmParents = array('i')
+	# @type {array} The actor ids in the order they were found
+	__queue = array('i')
+	# @type {int} The index in the queue of the next actor to expand
 	__pointer = 0
-	# @type {list} The nodes on the current tier
-	__nodes = []
-	# @type {int} The current node index
-	__nodeId = 0
-	# @type {bool} Have we found the actor
-	__actorNodeFound = None
-	# @type {tuple} All the paths to actors to cache
-	__paths = ()
+	# @type {list} The degrees and parents of found actors to cache
+	__results = []
+	# @type {int} How long the queue was when the walk was last saved
+	__savedLength = 0
+	# @type {int} The pointer when the walk was last saved
+	__savedPointer = 0
+	# @type {float} When the walk was last saved
+	__savedTime = 0
+	# @type {bool} Have we been interrupted and should stop at the next save
+	__isStopping = False
+	# @type {mixed} The interrupt handler from before the walk, None if we
+	#	haven't replaced it
+	__interruptHandler = None
 	# @type {int} How many itterations we've been through
 	__itterations = 0
+	# @type {int} How many film and cast ids we've read this walk
+	__edgesScanned = 0
 
-	## An empty constructor.
+	## Sets whether we walk the in memory graph or query the database.
 	#
 	#  @param {object} self The object
+	#  @param {bool} useGraph Should we walk the in memory graph
 	#  @return void
-	def __init__(self):
-		pass
+	def __init__(self, useGraph = True):
+		self.__useGraph = useGraph
 
-	## Checks to see if we already have a cached pyramid. Sets pyramid 
-	#  properties as attributes for easier reference. Then tries to find the
-	#  result catching any keyboard interruptions.
+	## Sets how many processes solve the entire pyramid. One or less solves it
+	#  in this process.
+	#
+	#  @param {object} self The object
+	#  @param {int} workers The number of processes
+	#  @return void
+	def setWorkers(self, workers):
+		self.__workers = workers
+
+	## Checks to see if we already have a cached pyramid and finds the actor.
+	#  If we're not caching there's no pyramid to save, so we search from both
+	#  ends instead.
 	#
 	#  @param {object} self The object
 	#  @param {int} actorId The actor id we're looking for
 	#  @param {bool} useCaching Should we cache the state of the tree and found
 	#		actors
-	#  @return void
+	#  @return {mixed} None if there's no path or the actor dictionary
 	def find(self, actorId, useCaching):
-		gc.collect()
+		if not useCaching and self.__useGraph:
+			return self.__findBidirectional(actorId)
 
+		return self.findMany((actorId,), useCaching).get(actorId)
+
+	## Finds a set of actors from a single walk. Sets pyramid properties as
+	#  attributes for easier reference. Any actors already in the saved pyramid
+	#  are answered straight from the mapped file and counted as cache hits for
+	#  the profile. If there are any left and the saved pyramid isn't complete,
+	#  we load it and keep walking until we've found all of them catching any
+	#  keyboard interruptions.
+	#
+	#  @param {object} self The object
+	#  @param {list} actorIds The actor ids we're looking for
+	#  @param {bool} useCaching Should we cache the state of the tree and found
+	#		actors
+	#  @param {bool} showLoading Should we print the loading icon as we walk
+	#  @return {dictionary} The actor ids we found to their actor dictionaries
+	def findMany(self, actorIds, useCaching = False, showLoading = True):
 		oldPyramid = self.__baconSearch.getBaconPyramid()
 
-		self.__actorId = actorId
 		self.__useCaching = useCaching
+		self.__showLoading = showLoading
 		self.__pyramid = oldPyramid if oldPyramid else self.__getTip()
-		self.__actors = self.__pyramid['actors']
-		self.__films = self.__pyramid['films']
-		self.__tiers = self.__pyramid['tiers']
-		self.__tierIndex = self.__pyramid['complete'] + 1
+		self.__setColumns()
+		self.__results = []
+		self.__actorIds = set(actorId for actorId in actorIds
+				if not self.__isFound(actorId))
+		self.__benchmark.count('cacheHits', len(set(actorIds)) -
+				len(self.__actorIds))
 
+		if self.__actorIds and not self.__isComplete():
+			self.__loadColumns()
+
+			if self.__useGraph:
+				self.__baconGraph.load()
+
+			try:
+				self.__findActorPyramid()
+
+			except KeyboardInterrupt:
+				printAndExit('\nPatience...')
+
+		return dict((actorId, self.__getActorResult(actorId))
+				for actorId in actorIds if self.__isFound(actorId))
+
+	## Searches out from both the actor and Kevin at once and gets the result
+	#  dictionary for the shortest path between them.
+	#
+	#  @param {object} self The object
+	#  @param {int} actorId The actor id we're looking for
+	#  @return {mixed} None if there's no path or the actor dictionary
+	def __findBidirectional(self, actorId):
+		return self.findBetween(actorId, self.__baconSearch.getBaconActorId())
+
+	## Searches out from both actors at once and gets the result dictionary for
+	#  the shortest path from the actor to the center.
+	#
+	#  @param {object} self The object
+	#  @param {int} actorId The actor id we're looking for
+	#  @param {int} centerActorId The actor id we're measuring from
+	#  @return {mixed} None if there's no path or the actor dictionary
+	def findBetween(self, actorId, centerActorId):
 		try:
-			return self.__findActorPyramid()
+			path = self.__baconGraph.load().getPath(actorId, centerActorId)
 
 		except KeyboardInterrupt:
 			printAndExit('\nPatience...')
 
-	## Gets a new tip for the pyramid.
+		if path is None:
+			return None
+
+		return self.__getActorResultDictionary(path)
+
+	## Walks a whole tree in memory from any actor without saving anything.
+	#  Results are read from it with getResult.
 	#
 	#  @param {object} self The object
-	#  @return {dictionary} The pyramid dictionary
-	def __getTip(self):
-		baconActorId = self.__baconSearch.getBaconActorId()
-		tiers = [
-			self.__getNewTier(True, [self.__getNewNode(baconActorId)])
-			]
+	#  @param {int} centerActorId The actor id to walk from
+	#  @return {dictionary} The complete pyramid dictionary
+	def walk(self, centerActorId):
+		self.__useCaching = False
+		self.__showLoading = False
+		self.__pyramid = self.__getTip(centerActorId)
+		self.__results = []
+		self.__actorIds = set()
+		self.__loadColumns()
 
-		return {
-			'actors': (baconActorId, ),
-			'films': (),
-			'tiers': tiers,
-			'complete': -1,
-			}
+		if self.__useGraph:
+			self.__baconGraph.load()
+
+		self.__findActorPyramid()
+		self.__pyramid['pointer'] = self.__pointer
+
+		return self.__pyramid
 
-	## Gets a new tier for the pyramid.
+	## Gets a new tip for the pyramid with just the center in the queue.
 	#
 	#  @param {object} self The object
-	#  @param {bool} isActors Is this an actor tier
-	#  @param {list} nodes The nodes on the tier
-	#  @return {dictionary} The tier dictionary
-	def __getNewTier(self, isActors = True, nodes = []):
-		return deepcopy({
-			'isActors': isActors,
+	#  @param {int} centerActorId The actor id to start at, Kevin if None
+	#  @return {dictionary} The pyramid dictionary
+	def __getTip(self, centerActorId = None):
+		if centerActorId is None:
+			centerActorId = self.__baconSearch.getBaconActorId()
+
+		pyramid = {
+			'actorDegrees': array('i'),
+			'actorParents': array('i'),
+			'filmParents': array('i'),
+			'queue': array('i', [centerActorId]),
 			'pointer': 0,
-			'nodes': nodes,
-			})
+			}
+
+		self.__growColumns(pyramid, centerActorId, 0)
+		pyramid['actorDegrees'][centerActorId] = 0
+
+		return pyramid
+
+	## Grows the columns so every actor and film id has a spot. New actors
+	#  start out not found and new films start out with no parent.
+	#
+	#  @param {object} self The object
+	#  @param {dictionary} pyramid The pyramid dictionary
+	#  @param {int} actorIdMax The largest actor id
+	#  @param {int} filmIdMax The largest film id
+	#  @return void
+	def __growColumns(self, pyramid, actorIdMax, filmIdMax):
+		actorGrowth = actorIdMax + 1 - len(pyramid['actorDegrees'])
+		filmGrowth = filmIdMax + 1 - len(pyramid['filmParents'])
+
+		if actorGrowth > 0:
+			pyramid['actorDegrees'].extend(
+					array('i', [self.NOT_FOUND]) * actorGrowth)
+			pyramid['actorParents'].extend(array('i', [0]) * actorGrowth)
+
+		if filmGrowth > 0:
+			pyramid['filmParents'].extend(array('i', [0]) * filmGrowth)
 
-	## Gets a new node for the pyramid.
+	## Sets the pyramid columns as attributes for easier reference.
 	#
 	#  @param {object} self The object
-	#  @param {int} id The id of the actor of film
-	#  @param {mixed} parentNode The index of the parent node if one
-	#  @return {tuple} The node tuple
-	def __getNewNode(self, id, parentNode = False):
-		return copy((id, parentNode))
+	#  @return void
+	def __setColumns(self):
+		self.__actorDegrees = self.__pyramid['actorDegrees']
+		self.__actorParents = self.__pyramid['actorParents']
+		self.__filmParents = self.__pyramid['filmParents']
+		self.__queue = self.__pyramid['queue']
+		self.__pointer = self.__pyramid['pointer']
+
+	## Checks if there are no actors left in the queue to expand.
+	#
+	#  @param {object} self The object
+	#  @return {bool} Whether the pyramid is complete
+	def __isComplete(self):
+		return self.__pointer >= len(self.__queue)
 
-	## Looks itteratively for the actor id in the pyramid and does garbage
-	#  collection on each loop.
+	## Copies any columns mapped from the saved pyramid into arrays so we can
+	#  keep walking, and makes sure they cover every id in the data.
+	#
+	#  @param {object} self The object
+	#  @return void
+	def __loadColumns(self):
+		self.__benchmark.startPhase('pyramidLoad')
+
+		for (column, values) in self.__pyramid.items():
+			if hasattr(values, 'toarray'):
+				self.__pyramid[column] = values.toarray()
+
+		self.__growColumns(self.__pyramid, *self.__baconSearch.getIdMaxes())
+		self.__setColumns()
+		self.__benchmark.endPhase('pyramidLoad')
+
+	## Expands the actors in the queue one at a time until we find all the
+	#  actors or run out, saving every so often between actors. When we find
+	#  the last actor the pointer stays on the actor we were expanding, since
+	#  the films we already added are skipped next time, so it's counted as
+	#  expanded each time.
 	#
 	#  @param {object} self The object
 	#  @return void
 	def __findActorPyramid(self):
-		result = None
+		pointer = self.__pointer
 
-		while not result:
-			result = self.__getNextOpenTier()
-			gc.collect()
+		self.__startSaving()
+		self.__startExpansion()
 
-		self.__updatePyramidAndActorPaths()
+		while self.__pointer < len(self.__queue):
+			if self.__expandActor(self.__queue[self.__pointer]):
+				break
+
+			self.__pointer += 1
 
-		return result if not result == self.NO_RESULTS else None
+			if (self.__pointer % self.CHECKPOINT_INTERVAL == 0
+					and self.isCheckpointDue(self.__pointer)):
+				self.__checkpoint()
 
-	## Finds the next unsolved tier and determines if it's a actor or film tier.
+		self.__endExpansion(self.__pointer - pointer +
+				(not self.__isComplete()))
+		self.__save()
+		self.__stopSaving()
+
+	## Starts keeping track of what's been saved for a walk that caches. An
+	#  interruption is held until the next save, so what's saved is always
+	#  between actors or tiers. Interrupting again stops right away and
+	#  keeps the last save.
 	#
 	#  @param {object} self The object
-	#  @return {mixed} None if we need to keep going. No result if we've 
-	#		finished. Or the actor dictionary.
-	def __getNextOpenTier(self):
-		if self.__tierIndex >= len(self.__tiers):
-			return self.NO_RESULTS
-
-		if self.__tiers[self.__tierIndex]['isActors']:
-			return self.__updateActorTier()
+	#  @return void
+	def __startSaving(self):
+		self.__savedLength = len(self.__queue)
+		self.__savedPointer = self.__pointer
+		self.__savedTime = time()
+		self.__isStopping = False
 
-		else:
-			return self.__updateFilmTier()
+		if self.__useCaching:
+			self.__interruptHandler = signal.signal(signal.SIGINT,
+					self.__interrupt)
 
-	## Adds films to the next tier for the actors in the current tier. For the
-	#  films of each actor, we check the casts for the actor so we don't have
-	#  uneccessary films in the pyramid. Once we've comleted the tier, we go to
-	#  the next actor tier. On the last tiers, we may not have another actor
-	#  tier until we've checked a few films.
+	## Holds the first interruption until the next save and stops right away
+	#  on the next.
 	#
 	#  @param {object} self The object
-	#  @return {mixed} None if we need to keep going. No result if we've 
-	#		finished since we can't find an actor when adding films.
-	def __updateActorTier(self):
-		self.__setTier()
+	#  @param {int} signalNumber The signal
+	#  @param {object} frame The frame we were interrupted in
+	#  @return void
+	def __interrupt(self, signalNumber, frame):
+		if self.__isStopping:
+			raise KeyboardInterrupt
 
-		if self.__tierIsComplete:
-			self.__updateTiersComplete()
-			self.__tierIndex += 2
+		self.__isStopping = True
+
+	## Puts back the interrupt handler from before the walk.
+	#
+	#  @param {object} self The object
+	#  @return void
+	def __stopSaving(self):
+		if self.__interruptHandler is not None:
+			signal.signal(signal.SIGINT, self.__interruptHandler)
+			self.__interruptHandler = None
 
-			return self.__updateActorTierOrFinish()
+	## Checks if a walk that caches should be saved, because we've been
+	#  interrupted or it's gone long enough or far enough since the last save.
+	#
+	#  @param {object} self The object
+	#  @param {int} pointer The index in the queue of the next actor to expand
+	#  @return {bool} Whether to save now
+	def isCheckpointDue(self, pointer):
+		return self.__useCaching and (self.__isStopping
+				or pointer - self.__savedPointer >= self.CHECKPOINT_ACTORS
+				or time() - self.__savedTime >= self.CHECKPOINT_SECONDS)
+
+	## Saves a walk done a tier at a time between tiers. The pyramid has to
+	#  have the columns and pointer as they are after the last tier.
+	#
+	#  @param {object} self The object
+	#  @param {dictionary} pyramid The pyramid
+	#  @return void
+	def checkpoint(self, pyramid):
+		self.__pyramid = pyramid
+		self.__setColumns()
+		self.__checkpoint()
 
-		for film in self.__baconSearch.getFilmsByActorId(self.__nodeId):
-			self.__addFilmToTier(film['FilmId'], self.__tierIndex + 1)
+	## Saves the walk so far and stops if we've been interrupted.
+	#
+	#  @param {object} self The object
+	#  @return void
+	def __checkpoint(self):
+		self.__save()
 
-		self.__setPointer()
+		if self.__isStopping:
+			self.__stopSaving()
+			printAndExit('\nPatience... Your bacon\'s been set aside. Run it '
+					'again to pick up where it left off.')
 
-		if self.__tierIndex + 1 < len(self.__tiers):
-			self.__tierIndex += 1
+	## Saves the pyramid and the results for every actor found since the last
+	#  save if we're caching.
+	#
+	#  @param {object} self The object
+	#  @return void
+	def __save(self):
+		if not self.__useCaching:
+			return
 
-		return None
+		self.__addResults(self.__queue[self.__savedLength:])
+		self.__updatePyramidAndActorPaths()
+		self.__results = []
+		self.__savedLength = len(self.__queue)
+		self.__savedPointer = self.__pointer
+		self.__savedTime = time()
 
-	## We can only set complete tiers for actor tiers, since film tiers are
-	#  filled and complete repeatedly.
+	## Starts timing a walk and counting the edges it scans for the profile.
 	#
 	#  @param {object} self The object
 	#  @return void
-	def __updateTiersComplete(self):
-		self.__pyramid['complete'] = self.__tierIndex
+	def __startExpansion(self):
+		self.__edgesScanned = 0
+		self.__benchmark.startPhase('expansion')
 
-	## Sets all the properties for the current tier.
+	## Stops timing a walk and counts the actors it expanded and the edges it
+	#  scanned for the profile.
 	#
 	#  @param {object} self The object
+	#  @param {int} nodeCount How many actors were expanded
 	#  @return void
-	def __setTier(self):
-		self.__tier = self.__tiers[self.__tierIndex]
-		self.__pointer = self.__tier['pointer']
-		self.__nodes = self.__tier['nodes']
+	def __endExpansion(self, nodeCount):
+		self.__benchmark.endPhase('expansion')
+		self.__benchmark.count('nodesExpanded', nodeCount)
+		self.__benchmark.count('edgesScanned', self.__edgesScanned)
+
+	## Checks if we've found an actor.
+	#
+	#  @param {object} self The object
+	#  @param {int} actorId The actor id
+	#  @return {bool} Whether the actor is in the pyramid
+	def __isFound(self, actorId):
+		return (0 < actorId < len(self.__actorDegrees)
+				and self.__actorDegrees[actorId] != self.NOT_FOUND)
+
+	## Adds each film for an actor we haven't added yet and the casts for
+	#  those films.
+	#
+	#  @param {object} self The object
+	#  @param {int} actorId The actor id to expand
+	#  @return {bool} Whether we found the last actor we're looking for
+	def __expandActor(self, actorId):
+		castDegrees = self.__actorDegrees[actorId] + 1
+		filmIds = self.__getFilmIdsByActorId(actorId)
+		self.__edgesScanned += len(filmIds)
+
+		for filmId in filmIds:
+			if self.__filmParents[filmId]:
+				continue
 
-		if self.__pointer < len(self.__nodes):
-			self.__tierIsComplete = False
-			self.__nodeId = self.__nodes[self.__pointer][0]
+			self.__filmParents[filmId] = actorId
 
-		else:
-			self.__updateTiersComplete()
-			self.__tierIsComplete = True
-			self.__nodeId = 0
+			if self.__addCast(filmId, castDegrees):
+				return True
 
-	## Checks to see if there's another actor tier. If not, we're finished
+		return False
+
+	## Gets the film ids for an actor from the graph or the database.
+	#
+	#  @param {object} self The object
+	#  @param {int} actorId The actor id
+	#  @return {mixed} An array or list of film ids
+	def __getFilmIdsByActorId(self, actorId):
+		if self.__useGraph:
+			return self.__baconGraph.getFilmIdsByActorId(actorId)
+
+		return [film['FilmId'] for film in
+				self.__baconSearch.getFilmsByActorId(actorId)]
+
+	## Adds the cast members of a film we haven't found yet to the queue and
+	#  the set of results to cache. The result is the same for the whole cast
+	#  since we don't store their id.
 	#
 	#  @param {object} self The object
-	#  @return {mixed} None if we need to keep going. No result if we've 
-	#		finished since we can't find an actor when adding films.
-	def __updateActorTierOrFinish(self):
-		if self.__tierIndex >= len(self.__tiers):
-			self.__updateTiersComplete()
+	#  @param {int} filmId The film id
+	#  @param {int} castDegrees The degrees for the cast of the film
+	#  @return {bool} Whether we found the last actor we're looking for
+	def __addCast(self, filmId, castDegrees):
+		actorIds = self.__getActorIdsByFilmId(filmId)
+		actorNodeFound = False
+		self.__edgesScanned += len(actorIds)
+
+		self.__itterate(len(actorIds))
+
+		for actorId in actorIds:
+			if self.__actorDegrees[actorId] != self.NOT_FOUND:
+				continue
 
-			return self.NO_RESULTS
+			self.__actorDegrees[actorId] = castDegrees
+			self.__actorParents[actorId] = filmId
+			self.__queue.append(actorId)
 
-		return self.__updateActorTier()
+			if actorId in self.__actorIds:
+				self.__actorIds.discard(actorId)
+				actorNodeFound = not self.__actorIds
 
-	## Adds a film to the next tier and the tuple of found films.
+		return actorNodeFound
+
+	## Gets the actor ids for a film from the graph or the database.
 	#
 	#  @param {object} self The object
-	#  @param {int} filmId The id for the film
-	#  @param {int} newTierIndex The new tier index
-	#  @return void
-	def __addFilmToTier(self, filmId, newTierIndex):
-		self.__itterate()
+	#  @param {int} filmId The film id
+	#  @return {mixed} An array or list of actor ids
+	def __getActorIdsByFilmId(self, filmId):
+		if self.__useGraph:
+			return self.__baconGraph.getActorIdsByFilmId(filmId)
 
-		if filmId not in self.__films:
-			self.__films += (filmId, )
-			self.__addNodeToTier(newTierIndex, filmId, self.__pointer, False)
+		return [actor['ActorId'] for actor in
+				self.__baconSearch.getActorsByFilmId(filmId)]
 
-	## Prints a updating loading icon for each itteration.
+	## Prints a updating loading icon as we pass every step of itterations.
 	#
 	#  @param {object} self The object
+	#  @param {int} count How many itterations we just went through
 	#  @return void
-	def __itterate(self):
-		self.__itterations += 1
-		loading(self.__itterations)
+	def __itterate(self, count):
+		speedReduction = 250
+		step = self.__itterations / speedReduction
+		self.__itterations += count
 
-	## Checks to see if the tier already exists. If not, creates it, then, adds
-	#  the node to it
+		if self.__showLoading and self.__itterations / speedReduction != step:
+			loading(self.__itterations, speedReduction)
+
+	## Gets the dictionary of path to an actor from the film they were found
+	#  from.
 	#
 	#  @param {object} self The object
-	#  @param {object} newTierIndex The index for the tier
-	#  @param {object} nodeId The id of the entity to add
-	#  @param {object} nodeParentIndex The index of the parent node
-	#  @param {object} isActors If the new tier is an actors tier
-	#  @return void
-	def __addNodeToTier(self, newTierIndex, nodeId, nodeParentIndex, isActors):
-		if len(self.__tiers) <= newTierIndex:
-			self.__tiers.append(self.__getNewTier(isActors))
+	#  @param {int} actorId The actor id
+	#  @return {dictionary} The actor dictionary
+	def __getActorResult(self, actorId):
+		return self.__getFilmResult(self.__actorParents[actorId])
+
+	## Gets what we save for a found actor, which is just enough to follow
+	#  their path back to Kevin one step at a time.
+	#
+	#  @param {object} self The object
+	#  @param {int} actorId The actor id
+	#  @return {tuple} The degrees, the film id the actor was found from, the
+	#		actor id that film was found from, and the actor id
+	def __getActorParents(self, actorId):
+		filmId = self.__actorParents[actorId]
 
-		node = self.__getNewNode(nodeId, nodeParentIndex)
-		self.__tiers[newTierIndex]['nodes'].append(node)
+		return (self.__actorDegrees[actorId], filmId,
+				self.__filmParents[filmId], actorId)
 
-		return node
+	## Gets the dictionary of path to a film.
+	#
+	#  @param {object} self The object
+	#  @param {int} filmId The film id to start at
+	#  @return {dictionary} The results dictionary for the film's cast
+	def __getFilmResult(self, filmId):
+		return self.__getActorResultDictionary(self.__getPath(
+				self.__actorParents, self.__filmParents, filmId))
+
+	## Gets the path to a film by following each film's actor and each actor's
+	#  film until we get to the center, who wasn't found from a film.
+	#
+	#  @param {object} self The object
+	#  @param {mixed} actorParents The film id each actor id was found from
+	#  @param {mixed} filmParents The actor id each film id was found from
+	#  @param {int} filmId The film id to start at
+	#  @return {tuple} The ids that lead from the film to the center
+	def __getPath(self, actorParents, filmParents, filmId):
+		path = []
+
+		while filmId:
+			path.append(filmId)
+			actorId = filmParents[filmId]
+			filmId = actorParents[actorId]
+
+			if filmId:
+				path.append(actorId)
+
+		return tuple(path)
+
+	## Gets the dictionary of path to the actor based on every other id being a
+	#  actor if then a film id.
+	#
+	#  @param {object} self The object
+	#  @param {tuple} path The ids that lead from the actor to Kevin
+	#  @return {dictionary} The actor dictionary
+	def __getActorResultDictionary(self, path):
+		return {
+			'actors': path[1::2],
+			'films': path[0::2],
+			'path': path,
+			'baconDegrees': (len(path) + 1) / 2
+			}
 
-	## Updates the pointer one index.
+	## Saves the found actors to the database and then the current state of
+	#  the pyramid. If we're stopped in between, the saved pyramid is from
+	#  before those actors were found, so they're found and saved again.
 	#
 	#  @param {object} self The object
 	#  @return void
-	def __setPointer(self):
-		self.__tier['pointer'] = self.__pointer + 1
+	def __updatePyramidAndActorPaths(self):
+		if self.__useCaching:
+			self.__benchmark.startPhase('persist')
+			self.__pyramid['pointer'] = self.__pointer
 
-	## Adds actors to the next tier for the films in the current tier. If we
-	#  find the actor, we add his fellow cast members since we've already found
-	#  them. If we don't find it, we go back to the previous film tier so it
-	#  can add more actors or move uus forward.
+			self.__baconSearch.updateActorResults(self.__results)
+			self.__baconSearch.updateBaconPyramid(self.__pyramid)
+			self.__benchmark.endPhase('persist')
+
+	## Repairs a complete saved pyramid after films have been added instead of
+	#  starting over. Each new film is given the cast member closest to Kevin,
+	#  and its cast is moved closer if that's shorter than what they had. Then
+	#  any actor that got closer does the same for all of their films, working
+	#  out from the closest tier, until nothing else gets closer. Only the
+	#  actors that moved have their results saved again.
 	#
 	#  @param {object} self The object
-	#  @return {mixed} None if we need to keep going. No result if we've 
-	#		finished. Or the actor dictionary.
-	def __updateFilmTier(self):
-		self.__setTier()
+	#  @param {list} casts The added casts, film id then actor id
+	#  @return {bool} Whether the saved pyramid is up to date. If it wasn't
+	#		complete, or is missing while actors still have degrees cached,
+	#		it can't be repaired and should be cleared.
+	def repair(self, casts):
+		oldPyramid = self.__baconSearch.getBaconPyramid()
 
-		if self.__tierIsComplete:
-			self.__tierIndex -= 1
+		if not oldPyramid:
+			return not self.__baconSearch.hasActorResults()
 
-			return self.__updateActorTier()
+		self.__pyramid = oldPyramid
+		self.__setColumns()
 
-		resultForCast = self.__getResultForCast(self.__pointer, 
-				self.__tierIndex)
+		if not self.__isComplete():
+			return False
 
-		for actor in self.__baconSearch.getActorsByFilmId(self.__nodeId):
-			self.__addActorToTier(actor['ActorId'], self.__tierIndex + 1,
-					resultForCast)
+		self.__useCaching = True
+		self.__results = []
+		self.__loadColumns()
 
-		self.__setPointer()
+		if self.__useGraph:
+			self.__baconGraph.load()
 
-		if not self.__actorNodeFound:
-			return None
+		self.__startExpansion()
+		self.__relaxActors(self.__getRepairTiers(casts))
+		self.__pointer = len(self.__queue)
+		self.__updatePyramidAndActorPaths()
 
-		return self.__getActorResult(self.__actorNodeFound, self.__tierIndex)
+		return True
 
-	## Gets the dictionary for the path to the current move since it will be the
-	#  same for all cast members since we don't store their id.
+	## Relaxes each added film from its cast member closest to Kevin.
 	#
 	#  @param {object} self The object
-	#  @param {object} nodeParentIndex The index of the parent node
-	#  @param {object} tierIndex The index of the tier
-	#  @return {dictionary} The results dictionary for all cast members since
-	#		don't include their id
-	def __getResultForCast(self, nodeParentIndex, tierIndex):
-		if not self.__useCaching:
+	#  @param {list} casts The added casts, film id then actor id
+	#  @return {dictionary} Degrees to the actor ids that moved to them
+	def __getRepairTiers(self, casts):
+		tiers = {}
+		filmIds = []
+
+		for (filmId, actorId) in casts:
+			if not filmIds or filmIds[-1] != filmId:
+				filmIds.append(filmId)
+
+		for filmId in filmIds:
+			actorIds = self.__getActorIdsByFilmId(filmId)
+			castActorIds = [actorId for actorId in actorIds
+					if self.__isFound(actorId)]
+			self.__edgesScanned += len(actorIds)
+
+			if castActorIds:
+				closestActorId = min(castActorIds,
+						key = lambda actorId: self.__actorDegrees[actorId])
+				self.__relaxFilm(filmId, closestActorId, tiers)
+
+		return tiers
+
+	## Makes an actor a film's parent if they're closer to Kevin than its
+	#  current one, or already are its parent, then moves any of the cast that
+	#  are now closer through the film.
+	#
+	#  @param {object} self The object
+	#  @param {int} filmId The film id
+	#  @param {int} actorId The actor id to relax the film from
+	#  @param {dictionary} tiers Degrees to the actor ids that moved to them
+	#  @return void
+	def __relaxFilm(self, filmId, actorId, tiers):
+		parentActorId = self.__filmParents[filmId]
+		castDegrees = self.__actorDegrees[actorId] + 1
+
+		if (parentActorId and parentActorId != actorId
+				and self.__actorDegrees[parentActorId] < castDegrees):
 			return
 
-		startingNode = self.__getNewNode(0, nodeParentIndex)
+		self.__filmParents[filmId] = actorId
+		castActorIds = self.__getActorIdsByFilmId(filmId)
+		self.__edgesScanned += len(castActorIds)
+
+		for castActorId in castActorIds:
+			if (self.__isFound(castActorId)
+					and self.__actorDegrees[castActorId] <= castDegrees):
+				continue
 
-		return self.__getActorResult(startingNode, tierIndex)
+			if not self.__isFound(castActorId):
+				self.__queue.append(castActorId)
 
-	## Adds a actor to the next tier, the tuple of found actors, and set of 
-	#  results to cache
+			self.__actorDegrees[castActorId] = castDegrees
+			self.__actorParents[castActorId] = filmId
+			tiers.setdefault(castDegrees, []).append(castActorId)
+
+	## Works through the actors that moved from the closest tier out, relaxing
+	#  each of their films, then adds the results for everyone that moved.
 	#
 	#  @param {object} self The object
-	#  @param {int} actorId The id for the actor
-	#  @param {int} newTierIndex The new tier index
-	#  @param {dictionary} resultForCast The path to the film
+	#  @param {dictionary} tiers Degrees to the actor ids that moved to them
 	#  @return void
-	def __addActorToTier(self, actorId, newTierIndex, resultForCast):
-		self.__itterate()
+	def __relaxActors(self, tiers):
+		movedActorIds = set()
+
+		while tiers:
+			degrees = min(tiers)
+
+			for actorId in tiers.pop(degrees):
+				if (actorId in movedActorIds
+						or self.__actorDegrees[actorId] != degrees):
+					continue
+
+				movedActorIds.add(actorId)
+				filmIds = self.__getFilmIdsByActorId(actorId)
+				self.__edgesScanned += len(filmIds)
+
+				for filmId in filmIds:
+					self.__relaxFilm(filmId, actorId, tiers)
 
-		if actorId not in self.__actors:
-			self.__actors += (actorId, )
-			node = self.__addNodeToTier(newTierIndex, actorId, self.__pointer, 
-					True)
-			self.__addActorResult(actorId, resultForCast)
+		self.__endExpansion(len(movedActorIds))
 
-			if actorId == self.__actorId:
-				self.__actorNodeFound = node
+		for actorId in movedActorIds:
+			self.__results.append(self.__getActorParents(actorId))
 
-	## Adds a tuple to the set of results to cache.
+	## Walks the entire pyramid in memory without saving anything, starting
+	#  from the saved pyramid if there is one, so any actor can be read with
+	#  getResult.
 	#
 	#  @param {object} self The object
-	#  @param {int} actorId The id for the actor
-	#  @param {dictionary} resultForCast The path to the film
-	#  @return void
-	def __addActorResult(self, actorId, resultForCast):
-		if self.__useCaching:
-			baconDegrees = resultForCast['baconDegrees']
-			self.__paths += ((resultForCast, baconDegrees, actorId,),)
+	#  @return {object} The object for chaining
+	def solve(self):
+		self.findMany((False,), False, False)
+		self.__loadColumns()
+
+		return self
 
-	## Gets the dictionary of path to the actor by recursively getting each
-	#  nodes parent node until none if left.
+	## Gets the actor dictionary for an actor in the pyramid we've walked or in
+	#  a tree from walk. Nothing is changed so trees can be read by any thread.
 	#
 	#  @param {object} self The object
-	#  @param {tuple} node The tuple of the starting node
-	#  @param {int} tierIndex The tier we're starting at
-	#  @param {tuple} path The ids that lead from the actor to Kevin
-	#  @param {dictionary} resultForCast The path to the film
-	#  @return void
-	def __getActorResult(self, node, tierIndex, path = ()):
-		if tierIndex == 0:
-			return self.__getActorResultDictionary(path)
+	#  @param {int} actorId The actor id
+	#  @param {dictionary} pyramid The tree to read, the pyramid if None
+	#  @return {mixed} None if the actor wasn't found or the actor dictionary
+	def getResult(self, actorId, pyramid = None):
+		if pyramid is None:
+			pyramid = self.__pyramid
 
-		parentNodeIndex = node[1]
-		parentNode = self.__tiers[tierIndex]['nodes'][parentNodeIndex]
-		path += (parentNode[0],)
+		actorDegrees = pyramid['actorDegrees']
 
-		return self.__getActorResult(parentNode, tierIndex - 1, path)
+		if (not 0 < actorId < len(actorDegrees)
+				or actorDegrees[actorId] == self.NOT_FOUND):
+			return None
 
-	## Gets the dictionary of path to the actor based on every other id being a
-	#  actor if then a film id.
+		return self.__getActorResultDictionary(self.__getPath(
+				pyramid['actorParents'], pyramid['filmParents'],
+				pyramid['actorParents'][actorId]))
+
+	## Solves the entire pyrmaid. If we have workers or NumPy is installed we
+	#  walk whatever's left a tier at a time, saving between tiers every so
+	#  often and the results for every actor we found after. Otherwise we look
+	#  for a non-existent actor id. Either way it picks up from the last save.
 	#
 	#  @param {object} self The object
-	#  @param {tuple} path The ids that lead from the actor to Kevin
-	#  @param {dictionary} resultForCast The path to the film
 	#  @return void
-	def __getActorResultDictionary(self, path):
-		pathDictionary = {
-			'actors': (),
-			'films': (),
-			'path': path,
-			'baconDegrees': (len(path) + 1) / 2
-			}
+	def findAll(self):
+		tiers = self.__getTiers()
 
-		for index, node in enumerate(path):
-			if index % 2 == 0:
-				pathDictionary['films'] += (node,)
+		if not tiers:
+			return self.find(False, True)
 
-			else:
-				pathDictionary['actors'] += (node,)
+		oldPyramid = self.__baconSearch.getBaconPyramid()
+
+		self.__useCaching = True
+		self.__pyramid = oldPyramid if oldPyramid else self.__getTip()
+		self.__setColumns()
+		self.__results = []
+
+		if self.__isComplete():
+			return
+
+		self.__loadColumns()
+		self.__startSaving()
+
+		try:
+			baconGraph = self.__baconGraph.load()
+			self.__benchmark.startPhase('expansion')
+			tiers.expand(self.__pyramid, baconGraph, self)
+
+		except KeyboardInterrupt:
+			printAndExit('\nPatience...')
 
-		return pathDictionary
+		self.__benchmark.endPhase('expansion')
+		self.__setColumns()
+		self.__save()
+		self.__stopSaving()
 
-	## Saves the current state of the pyramid and all the found actors to the
-	#  database.
+	## Gets what to walk the pyramid a tier at a time with. Workers split each
+	#  tier across processes and NumPy walks it in this one.
 	#
 	#  @param {object} self The object
-	#  @return void
-	def __updatePyramidAndActorPaths(self):
-		if self.__useCaching:
-			self.__pyramid['actors'] = self.__actors
-			self.__pyramid['films'] = self.__films
+	#  @return {mixed} None if we should walk an actor at a time or an object
+	#		with an expand method
+	def __getTiers(self):
+		if not self.__useGraph:
+			return None
 
-			self.__baconSearch.updateBaconPyramid(self.__pyramid)
-			self.__baconSearch.updateActorResults(self.__paths)
+		if self.__workers > 1:
+			return BaconTiers(self.__workers)
+
+		if self.__baconFrontier.isAvailable():
+			return self.__baconFrontier
 
-	## Solves the entire pyrmaid by looking for a non-existent actor id.
+		return None
+
+	## Adds the degrees and parents for actors to the set of results to cache.
 	#
 	#  @param {object} self The object
+	#  @param {array} actorIds The actor ids
 	#  @return void
-	def findAll(self):
-		self.find(False, True)
\ No newline at end of file
+	def __addResults(self, actorIds):
+		self.__results.extend(self.__getActorParents(actorId)
+				for actorId in actorIds)
@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+
+from array import array
+import mmap
+import os
+import struct
+
+## Saves the pyramid columns as a binary file that sits next to the database.
+#  The file is a small header with the column lengths and pointer followed by
+#  each column as fixed width integers. Opening a saved pyramid maps the file
+#  instead of reading it, so looking up a few actors only touches the pages
+#  their ids land on.
+#
+#  @author Chris Lock
+class BaconPyramidFile():
+	# @constant The bytes every pyramid file starts with
+	MAGIC = 'BACONPYR'
+	# @constant The version of the file layout
+	VERSION = 1
+	# @constant The struct format of the header: magic, version, actor column
+	#	length, film column length, queue length, and pointer
+	HEADER_FORMAT = '=8siiiii'
+	# @constant The array type code of each column
+	TYPE_CODE = 'i'
+	# @constant The columns in the order they're written and their lengths
+	COLUMNS = (
+		('actorDegrees', 'actorLength'),
+		('actorParents', 'actorLength'),
+		('filmParents', 'filmLength'),
+		('queue', 'queueLength'),
+		)
+
+	# @type {string} The path to the pyramid file
+	__filePath = None
+
+	## Sets the path to the file.
+	#
+	#  @param {object} self The object
+	#  @param {string} filePath The path to the pyramid file
+	#  @return void
+	def __init__(self, filePath):
+		self.__filePath = filePath
+
+	## Checks if there's a saved pyramid.
+	#
+	#  @param {object} self The object
+	#  @return {bool} The file exists
+	def exists(self):
+		return os.path.isfile(self.__filePath)
+
+	## Writes the pyramid to a temporary file and moves it over the old one so
+	#  anyone reading the old one is never left with half a pyramid. The file
+	#  is synced before it's moved so a crash can't leave the new name
+	#  pointing at a file that was never written out.
+	#
+	#  @param {object} self The object
+	#  @param {dictionary} pyramid The pyramid with its columns and pointer
+	#  @return void
+	def write(self, pyramid):
+		temporaryPath = self.__filePath + '.tmp'
+
+		with open(temporaryPath, 'wb') as pyramidFile:
+			pyramidFile.write(struct.pack(self.HEADER_FORMAT, self.MAGIC,
+					self.VERSION, len(pyramid['actorDegrees']),
+					len(pyramid['filmParents']), len(pyramid['queue']),
+					pyramid['pointer']))
+
+			for (column, length) in self.COLUMNS:
+				pyramid[column].tofile(pyramidFile)
+
+			pyramidFile.flush()
+			os.fsync(pyramidFile.fileno())
+
+		os.rename(temporaryPath, self.__filePath)
+
+	## Maps the file and gets the pyramid with columns that read straight from
+	#  the map. Returns None if the file is missing, from another layout, or
+	#  cut short, since an empty file can't be mapped at all. The map stays
+	#  open for as long as the columns are around.
+	#
+	#  @param {object} self The object
+	#  @return {mixed} None or the pyramid dictionary with mapped columns
+	def open(self):
+		if (not self.exists() or os.path.getsize(self.__filePath) <
+				struct.calcsize(self.HEADER_FORMAT)):
+			return None
+
+		with open(self.__filePath, 'rb') as pyramidFile:
+			memoryMap = mmap.mmap(pyramidFile.fileno(), 0,
+					access = mmap.ACCESS_READ)
+
+		header = self.__getHeader(memoryMap)
+
+		if not header:
+			memoryMap.close()
+
+			return None
+
+		pyramid = {'pointer': header['pointer']}
+		offset = struct.calcsize(self.HEADER_FORMAT)
+
+		for (column, length) in self.COLUMNS:
+			pyramid[column] = BaconPyramidColumn(memoryMap, offset,
+					header[length], self.TYPE_CODE)
+			offset += header[length] * pyramid[column].itemsize
+
+		return pyramid
+
+	## Reads the header from the map if it's a pyramid file we can read and
+	#  the file is as long as the header says it should be.
+	#
+	#  @param {object} self The object
+	#  @param {object} memoryMap The memory map of the file
+	#  @return {mixed} None or the header dictionary
+	def __getHeader(self, memoryMap):
+		headerSize = struct.calcsize(self.HEADER_FORMAT)
+
+		if len(memoryMap) < headerSize:
+			return None
+
+		(magic, version, actorLength, filmLength, queueLength,
+				pointer) = struct.unpack_from(self.HEADER_FORMAT, memoryMap)
+
+		if magic != self.MAGIC or version != self.VERSION:
+			return None
+
+		valueCount = actorLength * 2 + filmLength + queueLength
+		itemSize = array(self.TYPE_CODE).itemsize
+
+		if (min(actorLength, filmLength, queueLength) < 0
+				or not 0 <= pointer <= queueLength
+				or len(memoryMap) != headerSize + valueCount * itemSize):
+			return None
+
+		return {
+			'actorLength': actorLength,
+			'filmLength': filmLength,
+			'queueLength': queueLength,
+			'pointer': pointer,
+			}
+
+	## Removes the file if there is one. Anything still mapping it keeps
+	#  reading the old pyramid.
+	#
+	#  @param {object} self The object
+	#  @return void
+	def remove(self):
+		if self.exists():
+			os.remove(self.__filePath)
+
+	## Marks the file as just used by setting its modified time to now, so
+	#  the files used least recently can be found from it. A file that's gone
+	#  or can't be changed is left as is.
+	#
+	#  @param {object} self The object
+	#  @return void
+	def touch(self):
+		try:
+			os.utime(self.__filePath, None)
+
+		except OSError:
+			pass
+
+## A read only column of fixed width integers in a memory map that can be
+#  indexed like an array.
+#
+#  @author Chris Lock
+class BaconPyramidColumn():
+	# @type {object} The memory map the column is in
+	__map = None
+	# @type {int} Where the column starts in the map
+	__offset = 0
+	# @type {int} How many values are in the column
+	__length = 0
+	# @type {string} The array type code of the values
+	__typeCode = 'i'
+	# @type {string} The struct format of a value
+	__format = '=i'
+	# @type {int} The size of each value in bytes
+	itemsize = 0
+
+	## Sets where the column is in the map.
+	#
+	#  @param {object} self The object
+	#  @param {object} memoryMap The memory map the column is in
+	#  @param {int} offset Where the column starts in the map
+	#  @param {int} length How many values are in the column
+	#  @param {string} typeCode The array type code of the values
+	#  @return void
+	def __init__(self, memoryMap, offset, length, typeCode):
+		self.__map = memoryMap
+		self.__offset = offset
+		self.__length = length
+		self.__typeCode = typeCode
+		self.__format = '=' + typeCode
+		self.itemsize = array(typeCode).itemsize
+
+	## Gets the number of values in the column.
+	#
+	#  @param {object} self The object
+	#  @return {int} The length
+	def __len__(self):
+		return self.__length
+
+	## Reads a single value out of the map.
+	#
+	#  @param {object} self The object
+	#  @param {int} index The index of the value
+	#  @return {int} The value
+	def __getitem__(self, index):
+		if not 0 <= index < self.__length:
+			raise IndexError('pyramid column index out of range')
+
+		return struct.unpack_from(self.__format, self.__map,
+				self.__offset + index * self.itemsize)[0]
+
+	## Copies the whole column into an array.
+	#
+	#  @param {object} self The object
+	#  @return {array} The column values
+	def toarray(self):
+		values = array(self.__typeCode)
+		end = self.__offset + self.__length * self.itemsize
+		values.fromstring(self.__map[self.__offset:end])
+
+		return values
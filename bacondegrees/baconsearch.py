@@ -1,9 +1,67 @@
 #!/usr/bin/env python
 
 import os
+import shutil
 import sqlite3
-from baconhelpers import printAndExit
-import pickle
+from baconhelpers import Benchmark, printAndExit, getActorNameKey, LruCache
+from baconpyramidfile import BaconPyramidFile
+from baconnames import BaconNames
+from bacontrigrams import BaconTrigrams
+
+## Adds the parent film and parent actor columns to Actors and moves any
+#  pickled results into them. Each result's path starts with the film the
+#  actor was found from and then the actor that film was found from, which is
+#  Kevin if it's the only film in the path. The pickles are cleared after, and
+#  the Result column dropped if SQLite can drop columns. Databases created
+#  with the columns are left as they are, so pickle is only imported for
+#  databases that still have them. A result that can't be unpickled is
+#  raised as a database error so the migration is rolled back.
+#
+#  @param {object} cursor The cursor object
+#  @return void
+def addActorParents(cursor):
+	columns = [row[1] for row in cursor.execute('PRAGMA table_info(Actors)')]
+
+	for column in ('ParentFilmId', 'ParentActorId'):
+		if column not in columns:
+			cursor.execute('ALTER TABLE Actors ADD COLUMN ' + column + ' INT')
+
+	if 'Result' not in columns:
+		return
+
+	import pickle
+
+	bacon = cursor.execute('SELECT ActorId FROM Bacon').fetchone()
+	baconActorId = bacon[0] if bacon else None
+	actorParents = []
+
+	for (actorId, result) in cursor.execute('SELECT ActorId, Result '
+			'FROM Actors '
+			'WHERE Result IS NOT NULL AND Result != \'\'').fetchall():
+		try:
+			path = pickle.loads(str(result))['path'] if result else None
+
+		except (pickle.UnpicklingError, EOFError, ValueError, TypeError,
+				KeyError, IndexError, AttributeError, ImportError), error:
+			raise sqlite3.DatabaseError('Couldn\'t read the result for actor ' +
+					str(actorId) + ': ' + repr(error))
+
+		if not path:
+			continue
+
+		actorParents.append((path[0], path[1] if len(path) > 1
+				else baconActorId, actorId))
+
+	cursor.executemany('UPDATE Actors '
+			'SET ParentFilmId = ?, ParentActorId = ? '
+			'WHERE ActorId = ?', actorParents)
+	cursor.execute('UPDATE Actors SET Result = NULL')
+
+	try:
+		cursor.execute('ALTER TABLE Actors DROP COLUMN Result')
+
+	except sqlite3.OperationalError:
+		pass
 
 ## A seach object abstarted so it can be swapped out. Currently uses SQLite.
 #
@@ -11,22 +69,168 @@ import pickle
 class BaconSearch():
 	# @constant The row to add Kevin at in the Bacon table
 	BACON_ROW_ID = 1
-
-	# @type {string} The absolute path to the directory that this file lives in
+	# @constant The degrees counted in BaconStats for actors without any
+	NO_DEGREES = -1
+	# @constant How many keys each look up cache keeps
+	CACHE_SIZE = 10000
+	# @constant How many prepared statements the connection keeps
+	CACHED_STATEMENTS = 100
+	# @constant The workload for looking things up and saving results
+	QUERY = 'query'
+	# @constant The workload for loading data in bulk
+	BULK = 'bulk'
+	# @constant The workload for only looking things up, which opens the
+	#	database read only
+	READ = 'read'
+	# @constant How many casts a bulk load needs for each cast already saved
+	#	before dropping and rebuilding the indexes is quicker than keeping
+	#	them up to date
+	REBUILD_INDEXES_RATIO = 0.25
+	# @constant The name of the default tar file containing json files with
+	#	films, which is kept in the same directory as the database
+	DEFAULT_TAR_FILE = 'films.tar.gz'
+	# @constant How many values a look up can have before they're passed as a
+	#	json array instead of a placeholder each
+	PLACEHOLDERS_MAX = 16
+	# @constant How many trees walked from other centers are kept on disk
+	CENTERS_SIZE = 32
+	# @constant What's added to the path of the database and each file kept
+	#	next to it while a replacement is built
+	REPLACEMENT_SUFFIX = '.new'
+	# @constant The files kept next to the database that are swapped in with
+	#	a replacement, in the order they're moved
+	SIDECARS = ('pyramid', 'names', 'trigrams', 'centers')
+
+	# @type {string} The absolute path to the directory the data is kept in,
+	#	the one this file lives in unless it's set
 	__directory = os.path.dirname(os.path.realpath(__file__))
-	# @type {object} The connection object
+	# @type {object} The connection shared by every search object in this
+	#	process
 	__connection = None
+	# @type {int} The id of the process the connection was opened in, so a
+	#	forked process opens its own
+	__connectionPid = None
+	# @type {bool} Can SQLite read lists of values out of json
+	__hasJsonEach = True
+	# @type {string} The workload the connection's PRAGMAs are set for
+	__workload = QUERY
+	# @type {dictionary} The PRAGMAs set on the connection for each workload.
+	#	Writers keep the database in WAL mode so readers see the last commit
+	#	instead of waiting on them.
+	__pragmas = {
+		QUERY: (
+			('journal_mode', 'WAL'),
+			('synchronous', 'NORMAL'),
+			('cache_size', -16384),
+			('mmap_size', 268435456),
+			('temp_store', 'MEMORY'),
+			),
+		BULK: (
+			('journal_mode', 'WAL'),
+			('synchronous', 'NORMAL'),
+			('cache_size', -262144),
+			('mmap_size', 268435456),
+			('temp_store', 'MEMORY'),
+			),
+		READ: (
+			('cache_size', -16384),
+			('mmap_size', 268435456),
+			('temp_store', 'MEMORY'),
+			),
+		}
 	# @type {string} The path to the database
 	__databasePath = __directory + '/baconsearch.db'
+	# @type {object} The binary pyramid file that sits next to the database
+	__baconPyramidFile = BaconPyramidFile(__directory + '/baconsearch.pyramid')
+	# @type {object} The sorted index of actor names next to the database
+	__baconNames = BaconNames(__directory + '/baconsearch.names')
+	# @type {object} The trigram index of actor names next to the database
+	__baconTrigrams = BaconTrigrams(__directory + '/baconsearch.trigrams')
+	# @type {string} The directory trees walked from other centers are saved in
+	__centersDirectory = __directory + '/baconsearch.centers'
 	# @type {dictionary} The tables for the database
 	__databaseTables = {
 		'Bacon': 'ActorId INT, Pyramid TEXT',
 		'Actors': 'ActorId INTEGER PRIMARY KEY, '
-				'ActorName VARCHAR COLLATE NOCASE, Result TEXT, '
-				'BaconDegrees Int',
+				'ActorName VARCHAR COLLATE NOCASE, BaconDegrees Int, '
+				'ParentFilmId INT, ParentActorId INT',
 		'Films': 'FilmId INTEGER PRIMARY KEY, FilmName VARCHAR',
 		'Casts': 'FilmId INT, ActorId INT',
 		}
+	# @type {dictionary} The indexes for the database
+	__databaseIndexes = {
+		'CastsActorFilm': 'Casts (ActorId, FilmId)',
+		'CastsFilmActor': 'Casts (FilmId, ActorId)',
+		'ActorsName': 'Actors (ActorName COLLATE NOCASE)',
+		'FilmsName': 'Films (FilmName)',
+		}
+	# @type {tuple} The migrations in order, each a tuple of statements or
+	#	functions that take the cursor. The database's user_version is how
+	#	many of them have been run. Moving results to parent columns also
+	#	clears the pickled pyramid, which the pyramid file replaced.
+	__databaseMigrations = (
+		tuple('CREATE INDEX IF NOT EXISTS ' + indexName + ' ON ' + index
+				for (indexName, index) in __databaseIndexes.items()) +
+			('ANALYZE',),
+		(
+			'CREATE TABLE IF NOT EXISTS BaconStats '
+				'(BaconDegrees INTEGER PRIMARY KEY, ActorCount INT)',
+			'CREATE TRIGGER IF NOT EXISTS BaconStatsInsert '
+				'AFTER INSERT ON Actors '
+				'BEGIN '
+					'INSERT OR IGNORE INTO BaconStats '
+						'VALUES (COALESCE(NEW.BaconDegrees, ' +
+						str(NO_DEGREES) + '), 0); '
+					'UPDATE BaconStats SET ActorCount = ActorCount + 1 '
+						'WHERE BaconDegrees = COALESCE(NEW.BaconDegrees, ' +
+						str(NO_DEGREES) + '); '
+				'END',
+			'CREATE TRIGGER IF NOT EXISTS BaconStatsUpdate '
+				'AFTER UPDATE OF BaconDegrees ON Actors '
+				'WHEN OLD.BaconDegrees IS NOT NEW.BaconDegrees '
+				'BEGIN '
+					'UPDATE BaconStats SET ActorCount = ActorCount - 1 '
+						'WHERE BaconDegrees = COALESCE(OLD.BaconDegrees, ' +
+						str(NO_DEGREES) + '); '
+					'INSERT OR IGNORE INTO BaconStats '
+						'VALUES (COALESCE(NEW.BaconDegrees, ' +
+						str(NO_DEGREES) + '), 0); '
+					'UPDATE BaconStats SET ActorCount = ActorCount + 1 '
+						'WHERE BaconDegrees = COALESCE(NEW.BaconDegrees, ' +
+						str(NO_DEGREES) + '); '
+				'END',
+			'CREATE TRIGGER IF NOT EXISTS BaconStatsDelete '
+				'AFTER DELETE ON Actors '
+				'BEGIN '
+					'UPDATE BaconStats SET ActorCount = ActorCount - 1 '
+						'WHERE BaconDegrees = COALESCE(OLD.BaconDegrees, ' +
+						str(NO_DEGREES) + '); '
+				'END',
+			'DELETE FROM BaconStats',
+			'INSERT INTO BaconStats '
+				'SELECT COALESCE(BaconDegrees, ' + str(NO_DEGREES) + '), '
+					'COUNT(*) '
+				'FROM Actors '
+				'GROUP BY 1',
+			),
+		(
+			addActorParents,
+			'UPDATE Bacon SET Pyramid = NULL',
+			),
+		)
+	# @type {bool} Have we already brought the database up to date
+	__isMigrated = False
+	# @type {dictionary} The look up caches shared by every search object so
+	#	any change to the data clears all of them
+	__caches = {
+		'ActorsByName': LruCache(CACHE_SIZE),
+		'ActorsById': LruCache(CACHE_SIZE),
+		'FilmsById': LruCache(CACHE_SIZE),
+		'FilmsByActorId': LruCache(CACHE_SIZE),
+		'ActorsByFilmId': LruCache(CACHE_SIZE),
+		}
+	# @type {object} An instance of the benchmark object for the profile
+	__benchmark = Benchmark()
 	# @type {object} The cursor object
 	__cursor = None
 
@@ -37,7 +241,9 @@ class BaconSearch():
 	def __init__(self):
 		pass
 
-	## Creates the database tables if they don't exist.
+	## Creates the database tables if they don't exist and runs any migrations
+	#  the database hasn't had yet. We only check for migrations until the
+	#  database is up to date.
 	#
 	#  @param {object} self The object
 	#  @return {object} The object for chaining
@@ -45,6 +251,9 @@ class BaconSearch():
 		if not self.__isSetup():
 			self.start().__createDatabaseTables().end()
 
+		if not BaconSearch.__isMigrated:
+			self.start().__migrate().end()
+
 		return self
 
 	## Checks if the databse is set up.
@@ -54,25 +263,145 @@ class BaconSearch():
 	def __isSetup(self):
 		return os.path.isfile(self.__databasePath)
 
-	## Starts the database connection. Adds the row factory to return 
-	#  dictionaries. Sets the cursor object.
+	## Starts the database connection if this process doesn't have one yet.
+	#  Every search object shares it and it stays open until it's closed, so
+	#  SQLite's page cache and the prepared statements last the whole run.
+	#  Adds the row factory to return dictionaries, sets the cursor object, and
+	#  sets the PRAGMAs for the workload. The connection can be used from
+	#  other threads since the server walks trees for other centers from
+	#  whichever request thread needs them, one at a time.
 	#
 	#  @param {object} self The object
 	#  @return {object} The object for chaining
 	def start(self):
-		if self.__connection:
+		if self.__connection and self.__connectionPid == os.getpid():
 			return self
 
 		try:
-			self.__connection = sqlite3.connect(self.__databasePath)
-			self.__connection.row_factory = sqlite3.Row
-			self.__cursor = self.__connection.cursor()
+			BaconSearch.__connection = self.__connect()
+			BaconSearch.__connection.row_factory = sqlite3.Row
+			BaconSearch.__cursor = BaconSearch.__connection.cursor()
+			BaconSearch.__connectionPid = os.getpid()
+			BaconSearch.__hasJsonEach = self.__isSupported(
+					'SELECT value FROM json_each(\'[]\')')
+			self.__setPragmas()
 
 			return self
 
 		except sqlite3.Error, error:
 			printAndExit('Error %s:' % error.args[0])
 
+	## Opens a connection to the database. Read only workloads open it with a
+	#  mode=ro uri so they can't take a write lock, falling back to a normal
+	#  connection if SQLite wasn't built to take uris or the database can't be
+	#  opened that way.
+	#
+	#  @param {object} self The object
+	#  @return {object} The connection object
+	def __connect(self):
+		if self.__workload == self.READ and self.__hasUris():
+			try:
+				return sqlite3.connect('file:' +
+						self.__getUriPath(self.__databasePath) + '?mode=ro',
+						check_same_thread = False,
+						cached_statements = self.CACHED_STATEMENTS)
+
+			except sqlite3.OperationalError:
+				pass
+
+		return sqlite3.connect(self.__databasePath,
+				check_same_thread = False,
+				cached_statements = self.CACHED_STATEMENTS)
+
+	## Escapes the characters that would start an escape, the query, or the
+	#  fragment in the path of a SQLite uri. It's all urllib.quote would do
+	#  that matters here, without importing urllib on every read only look up.
+	#
+	#  @param {object} self The object
+	#  @param {string} path The path to the database
+	#  @return {string} The path for the uri
+	def __getUriPath(self, path):
+		return path.replace('%', '%25').replace('?', '%3f').replace('#', '%23')
+
+	## Checks if SQLite treats file: names as uris. Otherwise it would create a
+	#  database with the uri as its name.
+	#
+	#  @param {object} self The object
+	#  @return {bool} SQLite was built to take uris
+	def __hasUris(self):
+		connection = sqlite3.connect(':memory:')
+		compileOptions = [row[0]
+				for row in connection.execute('PRAGMA compile_options')]
+		connection.close()
+
+		return 'USE_URI' in compileOptions
+
+	## Checks if SQLite can run a statement, since some features are left out
+	#  of older builds.
+	#
+	#  @param {object} self The object
+	#  @param {string} statement The statement to try
+	#  @return {bool} The statement ran
+	def __isSupported(self, statement):
+		try:
+			self.__execute(statement).fetchall()
+
+			return True
+
+		except sqlite3.OperationalError:
+			return False
+
+	## Sets which workload the connection is tuned for and sets its PRAGMAs if
+	#  it's open. Setting PRAGMAs commits any pending changes. Switching to or
+	#  from READ closes the connection so the next one is opened the right
+	#  way.
+	#
+	#  @param {object} self The object
+	#  @param {string} workload QUERY, BULK, or READ
+	#  @return {object} The object for chaining
+	def setWorkload(self, workload):
+		isReopening = (workload == self.READ) != (self.__workload == self.READ)
+		BaconSearch.__workload = workload
+
+		if isReopening:
+			self.close()
+
+		elif self.__connection:
+			self.__commit().__setPragmas()
+
+		return self
+
+	## Changes the PRAGMAs set for a workload. Ones that aren't passed keep
+	#  their values.
+	#
+	#  @param {object} self The object
+	#  @param {string} workload QUERY, BULK, or READ
+	#  @param {dictionary} pragmas PRAGMA names to their values
+	#  @return {object} The object for chaining
+	def setPragmas(self, workload, pragmas):
+		pragmasSet = dict(self.__pragmas[workload])
+		pragmasSet.update(pragmas)
+		BaconSearch.__pragmas[workload] = tuple(pragmasSet.items())
+
+		if self.__connection and workload == self.__workload:
+			self.__commit().__setPragmas()
+
+		return self
+
+	## Sets the PRAGMAs for the workload on the connection. If the database is
+	#  read only, the ones that need to write, like journal_mode, are left as
+	#  they are.
+	#
+	#  @param {object} self The object
+	#  @return void
+	def __setPragmas(self):
+		for (pragma, value) in self.__pragmas[self.__workload]:
+			try:
+				self.__execute('PRAGMA ' + pragma + ' = ' + str(value))
+
+			except sqlite3.OperationalError:
+				pass
+
 	## Creates the database tables and adds the BBacon row to the Bacon table
 	#  for Kevin's stuff.
 	#
@@ -92,12 +421,92 @@ class BaconSearch():
 
 		return self
 
-	## A wrapper for execute to dry code out.
+	## Runs each migration newer than the database's version and bumps the
+	#  version after each one, so an existing database is upgraded in place.
+	#  An up to date database is only read, so read only look ups can check it
+	#  on the connection they'll use. If there are migrations to run, we run
+	#  them on a connection that can write and then open the read only one
+	#  again. If the database file is read only we leave it as is without
+	#  marking it migrated, since lookups still work without the migrations.
+	#  Each migration and its version bump run in their own transaction, since
+	#  the sqlite3 module would otherwise commit before every table change. A
+	#  migration that fails is rolled back and stops the run with a message.
+	#  The migrations before it stay committed and the version says so, so
+	#  the next run starts again from the one that failed.
+	#
+	#  @param {object} self The object
+	#  @return {object} The object for chaining
+	def __migrate(self):
+		version = self.__execute('PRAGMA user_version').fetchone()[0]
+
+		if version >= len(self.__databaseMigrations):
+			BaconSearch.__isMigrated = True
+
+			return self
+
+		if self.__workload == self.READ:
+			if not os.access(self.__databasePath, os.W_OK):
+				return self
+
+			self.setWorkload(self.QUERY).start().__migrate()
+
+			return self.setWorkload(self.READ).start()
+
+		connection = self.__getConnection()
+		isolationLevel = connection.isolation_level
+		connection.isolation_level = None
+
+		try:
+			for statements in self.__databaseMigrations[version:]:
+				self.__runMigration(statements, version + 1)
+				version += 1
+
+		except sqlite3.Error, error:
+			printAndExit('Error migrating the database to version %d: %s' %
+					(version + 1, error.args[0]))
+
+		finally:
+			connection.isolation_level = isolationLevel
+
+		BaconSearch.__isMigrated = True
+
+		return self
+
+	## Runs a migration's statements and sets the version in one transaction,
+	#  rolling all of it back if anything goes wrong.
+	#
+	#  @param {object} self The object
+	#  @param {tuple} statements The statements or functions that take the
+	#		cursor
+	#  @param {int} version The version the database is at after
+	#  @return void
+	def __runMigration(self, statements, version):
+		try:
+			self.__execute('BEGIN')
+
+			for statement in statements:
+				if callable(statement):
+					statement(self.__getCursor())
+
+				else:
+					self.__execute(statement)
+
+			self.__execute('PRAGMA user_version = ' + str(version))
+			self.__execute('COMMIT')
+
+		except BaseException:
+			self.__execute('ROLLBACK')
+			raise
+
+	## A wrapper for execute to dry code out that counts the statement for the
+	#  profile.
 	#
 	#  @param {object} self The object
 	#  @param {args} *args the arguments for execute
 	#  @return {object} The cursor object or results
 	def __execute(self, *args):
+		self.__benchmark.count('sqlStatements')
+
 		return self.__getCursor().execute(*args)
 
 	## Gets the cursor object. If there's non, we probably don't have a 
@@ -106,7 +515,7 @@ class BaconSearch():
 	#  @param {object} self The object
 	#  @return {object} The cursor object
 	def __getCursor(self):
-		if not self.__cursor:
+		if not self.__cursor or self.__connectionPid != os.getpid():
 			self.start()
 
 		return self.__cursor
@@ -116,25 +525,50 @@ class BaconSearch():
 	#  @param {object} self The object
 	#  @return void
 	def clearCache(self):
+		self.__clearCaches()
+		self.__baconPyramidFile.remove()
+		self.clearCenters()
 		self.__execute(''
 				'UPDATE Bacon '
 				'SET Pyramid = NULL')
 		self.__execute(''
 				'UPDATE Actors '
-				'SET Result = NULL, BaconDegrees = NULL')
+				'SET BaconDegrees = NULL, ParentFilmId = NULL, '
+					'ParentActorId = NULL')
 		self.__commit()
 
-	## Commits any changes and closes the connection if we had one.
+	## Checks if any actor other than Kevin has degrees cached.
+	#
+	#  @param {object} self The object
+	#  @return {bool} Some actor has degrees cached
+	def hasActorResults(self):
+		query = ('SELECT 1 '
+				'FROM Actors '
+				'WHERE BaconDegrees != 0 '
+				'LIMIT 1')
+
+		return self.__execute(query).fetchone() is not None
+
+	## Commits any changes. The connection stays open for the next time it's
+	#  needed in this process.
 	#
 	#  @param {object} self The object
 	#  @return void
 	def end(self):
 		self.__commit()
 
+	## Commits any changes and closes the connection if we had one.
+	#
+	#  @param {object} self The object
+	#  @return void
+	def close(self):
+		self.__commit()
+
 		if self.__connection:
 			self.__connection.close()
-			self.__connection = None
-			self.__cursor = None
+			BaconSearch.__connection = None
+			BaconSearch.__cursor = None
+			BaconSearch.__connectionPid = None
 
 	## Commits any changes. If we don't have a connection we'll need one, but
 	#  this scenario is super unlikely. Just being safe.
@@ -142,7 +576,7 @@ class BaconSearch():
 	#  @param {object} self The object
 	#  @return {object} The object for chaining
 	def __commit(self):
-		if self.__connection:
+		if self.__connection and self.__connectionPid == os.getpid():
 			self.__connection.commit()
 
 		return self
@@ -180,7 +614,12 @@ class BaconSearch():
 
 		return self.__getFirstResult(results)
 
-	## Gets films or actors value by a where value.
+	## Gets films or actors value by a where value. A few values, like the
+	#  ones along a path, get a placeholder each, which only makes a few
+	#  different statements to prepare and keeps a look up from importing the
+	#  json module. More values are passed as a single json array, so the
+	#  query is the same however many there are and the prepared statement is
+	#  reused. Builds without json get a placeholder for each value instead.
 	#
 	#  @param {object} self The object
 	#  @param {string} entityType A film or actor
@@ -189,12 +628,18 @@ class BaconSearch():
 	#  @param {string} values The values for the where to match
 	#  @return {list} A list of results
 	def __getEntities(self, entityType, select, where, values):
-		valuesString = ', '.join(['?'] * len(values))
 		query = ('SELECT ' + select + ' '
 				'FROM ' + entityType + 's '
-				'WHERE ' + where + ' IN (' + valuesString + ') ')
+				'WHERE ' + where + ' IN ')
 
-		return self.__execute(query, values).fetchall()
+		if not self.__hasJsonEach or len(values) <= self.PLACEHOLDERS_MAX:
+			return self.__execute(query + '(' + ', '.join(['?'] * len(values)) +
+					')', tuple(values)).fetchall()
+
+		import json
+
+		return self.__execute(query + '(SELECT value FROM json_each(?))',
+				(json.dumps(list(values)),)).fetchall()
 
 	## Gets the first results from a list of results or returns None if there
 	#  are none.
@@ -219,7 +664,87 @@ class BaconSearch():
 	#  @param {tuple} actorNames Actor names
 	#  @return {mixed} None or a dictionary
 	def getActorsByName(self, actorNames):
-		return self.__getEntitiesByName('Actor', actorNames)
+		return self.__getCachedRows('ActorsByName', actorNames,
+				self.__getNameKey,
+				lambda names: self.__getEntitiesByName('Actor', names),
+				lambda row: self.__getNameKey(row['ActorName']))
+
+	## Gets the key a name is cached under, which matches names the same way
+	#  the database does.
+	#
+	#  @param {object} self The object
+	#  @param {string} name The name
+	#  @return {string} The key
+	def __getNameKey(self, name):
+		if isinstance(name, str):
+			name = name.decode('utf-8')
+
+		return getActorNameKey(name)
+
+	## Gets rows for a set of values from a cache and any the cache doesn't
+	#  have from the database in a single query. Every value we look up is
+	#  cached, even the ones without rows, so looking them up again doesn't go
+	#  back to the database either.
+	#
+	#  @param {object} self The object
+	#  @param {string} cacheName The name of the cache
+	#  @param {tuple} values The values to look up
+	#  @param {function} getValueKey Gets the cache key for a value
+	#  @param {function} getRows Gets the rows for a tuple of values
+	#  @param {function} getRowKey Gets the cache key for a row
+	#  @return {list} A list of results
+	def __getCachedRows(self, cacheName, values, getValueKey, getRows,
+			getRowKey):
+		cache = self.__caches[cacheName]
+		rows = []
+		missingRows = {}
+		missingValues = []
+
+		for value in values:
+			key = getValueKey(value)
+
+			if key in missingRows:
+				continue
+
+			keyRows = cache.get(key)
+
+			if keyRows is None:
+				missingRows[key] = []
+				missingValues.append(value)
+
+			else:
+				rows += keyRows
+
+		if missingValues:
+			for row in getRows(tuple(missingValues)):
+				missingRows.setdefault(getRowKey(row), []).append(row)
+
+			for (key, keyRows) in missingRows.items():
+				cache.set(key, keyRows)
+				rows += keyRows
+
+		return rows
+
+	## Gets how each look up cache is doing.
+	#
+	#  @param {object} self The object
+	#  @return {dictionary} Cache names to their hits, misses, evictions, and
+	#		size
+	def getCacheStats(self):
+		return dict((cacheName, {
+			'hits': cache.hits,
+			'misses': cache.misses,
+			'evictions': cache.evictions,
+			'size': len(cache),
+			}) for (cacheName, cache) in self.__caches.items())
+
+	## Empties every look up cache after the data changes.
+	#
+	#  @param {object} self The object
+	#  @return void
+	def __clearCaches(self):
+		for cache in self.__caches.values():
+			cache.clear()
 
 
 	## Gets a set of actors or films info by their names.
@@ -235,7 +760,8 @@ class BaconSearch():
 
 		return self.__getEntities(entityType, selects, where, entityNames)
 
-	## Gets an actor's info by a name.
+	## Gets an actor's info by a name. Actors with a saved result are counted
+	#  as cache hits for the profile.
 	#
 	#  @param {object} self The object
 	#  @param {string} actorName The actor name
@@ -247,26 +773,74 @@ class BaconSearch():
 		if not result:
 			return result
 
+		actorResult = self.__getActorResult(result['ActorId'],
+				result['BaconDegrees'])
+
+		if actorResult:
+			self.__benchmark.count('cacheHits')
+
 		return {
 			'ActorId': result['ActorId'],
 			'ActorName': result['ActorName'],
-			'Result': self.__loadPickle(result['Result']),
+			'Result': actorResult,
 			}
 
-	## A wrapper for loading a pickle.
+	## Gets the result dictionary for a solved actor by following each
+	#  actor's parent film and parent actor back to Kevin in a single
+	#  recursive query. The path alternates the films and actors between them,
+	#  leaving out Kevin. Each step is a primary key look up, and the parents
+	#  are only checked once we're done walking, since filtering on them while
+	#  we walk has SQLite scan every actor to build a bloom filter. If the
+	#  parents don't lead back to Kevin in as many steps as the actor's degrees,
+	#  or the database hasn't been migrated to have them, the actor is treated
+	#  as not solved.
 	#
 	#  @param {object} self The object
-	#  @param {string} pickles The result of the previosu pickling
-	#  @return {object} The pickled object
-	def __loadPickle(self, pickles):
-		if pickles:
-			try:
-				return pickle.loads(pickles)
+	#  @param {int} actorId The actor id
+	#  @param {mixed} baconDegrees None or the actor's degrees
+	#  @return {mixed} None if the actor isn't solved or the actor dictionary
+	def __getActorResult(self, actorId, baconDegrees):
+		if baconDegrees is None:
+			return None
+
+		query = ('WITH RECURSIVE '
+				'Parents (ParentFilmId, ParentActorId, Depth) AS ('
+					'SELECT ParentFilmId, ParentActorId, 1 '
+					'FROM Actors '
+					'WHERE ActorId = ? '
+					'UNION ALL '
+					'SELECT Actors.ParentFilmId, Actors.ParentActorId, '
+						'Parents.Depth + 1 '
+					'FROM Parents '
+					'JOIN Actors ON Actors.ActorId = Parents.ParentActorId '
+					'WHERE Parents.Depth < ?) '
+				'SELECT ParentFilmId, ParentActorId '
+				'FROM Parents '
+				'WHERE ParentFilmId IS NOT NULL '
+				'ORDER BY Depth')
+
+		try:
+			parents = self.__execute(query, (actorId, baconDegrees)).fetchall()
+
+		except sqlite3.OperationalError:
+			return None
 
-			except error:
-				return pickles
+		if len(parents) != baconDegrees:
+			return None
 
-		return pickles
+		path = []
+
+		for parent in parents:
+			path += [parent['ParentFilmId'], parent['ParentActorId']]
+
+		path = tuple(path[:-1])
+
+		return {
+			'actors': path[1::2],
+			'films': path[0::2],
+			'path': path,
+			'baconDegrees': baconDegrees,
+			}
 
 	## Gets a set of films info by their names.
 	#
@@ -292,7 +866,9 @@ class BaconSearch():
 	#  @param {tuple} filmIds The film ids
 	#  @return {mixed} None or a dictionary
 	def getFilmsById(self, filmIds):
-		return self.__getEntitiesById('Film', filmIds)
+		return self.__getCachedRows('FilmsById', filmIds, int,
+				lambda ids: self.__getEntitiesById('Film', ids),
+				lambda row: row['FilmId'])
 
 	## Gets a set of films' or actors' info by their ids.
 	#
@@ -304,7 +880,8 @@ class BaconSearch():
 		selects = '*'
 		where = entityName
 
-		return self.__getEntities(entityType, selects, where, entityIds)
+		return self.__getEntities(entityType, selects, where,
+				[int(entityId) for entityId in entityIds])
 
 	## Gets a set of films' or actors' info by their ids.
 	#
@@ -312,7 +889,9 @@ class BaconSearch():
 	#  @param {tuple} entityIds The film ids
 	#  @return {mixed} None or a dictionary
 	def getActorsById(self, actorIds):
-		return self.__getEntitiesById('Actor', actorIds)
+		return self.__getCachedRows('ActorsById', actorIds, int,
+				lambda ids: self.__getEntitiesById('Actor', ids),
+				lambda row: row['ActorId'])
 
 	## Gets a set of film ids for a given actor id from the Casts table
 	#
@@ -320,7 +899,10 @@ class BaconSearch():
 	#  @param {string} actorId The actor id
 	#  @return {mixed} None or a dictionary
 	def getFilmsByActorId(self, actorId):
-		return self.__getCastEntityByCounterId('Film', 'Actor', actorId)
+		return self.__getCachedRows('FilmsByActorId', (actorId,), int,
+				lambda ids: self.__getCastEntityByCounterId('Film', 'Actor',
+						ids[0]),
+				lambda row: int(actorId))
 
 	## Gets either a set of film ids from an actor id or vice versa.
 	#
@@ -331,7 +913,7 @@ class BaconSearch():
 	#  @return {mixed} None or a dictionary
 	def __getCastEntityByCounterId(self, entityColumn, counterColumn, id):
 		return self.__getEntities('Cast', entityColumn + 'Id',
-				counterColumn + 'Id', (id, '',))
+				counterColumn + 'Id', (int(id),))
 
 	## Gets a set of actor ids for a given film id from the Casts table
 	#
@@ -339,7 +921,44 @@ class BaconSearch():
 	#  @param {string} filmId The film id
 	#  @return {mixed} None or a dictionary
 	def getActorsByFilmId(self, filmId):
-		return self.__getCastEntityByCounterId('Actor', 'Film', filmId)
+		return self.__getCachedRows('ActorsByFilmId', (filmId,), int,
+				lambda ids: self.__getCastEntityByCounterId('Actor', 'Film',
+						ids[0]),
+				lambda row: int(filmId))
+
+	## Gets every cast row in the order they were added.
+	#
+	#  @param {object} self The object
+	#  @return {list} A list of film id and actor id tuples
+	def getCasts(self):
+		query = ('SELECT FilmId, ActorId '
+				'FROM Casts '
+				'ORDER BY ROWID')
+
+		return self.__execute(query).fetchall()
+
+	## Gets the last cast row id so we can tell if casts have changed.
+	#
+	#  @param {object} self The object
+	#  @return {int} The last cast row id
+	def getCastsVersion(self):
+		query = ('SELECT MAX(ROWID) AS CastsVersion '
+				'FROM Casts')
+
+		return self.__execute(query).fetchone()['CastsVersion']
+
+	## Gets the largest actor and film ids so columns indexed by id can be
+	#  sized.
+	#
+	#  @param {object} self The object
+	#  @return {int} The largest actor id, {int} The largest film id
+	def getIdMaxes(self):
+		query = ('SELECT '
+				'(SELECT MAX(ActorId) FROM Actors) AS ActorIdMax, '
+				'(SELECT MAX(FilmId) FROM Films) AS FilmIdMax')
+		result = self.__execute(query).fetchone()
+
+		return result['ActorIdMax'] or 0, result['FilmIdMax'] or 0
 
 	## Adds a film to the table.
 	#
@@ -361,6 +980,7 @@ class BaconSearch():
 				'VALUES (?)')
 		self.__execute(insert, (entityNameValue,))
 		self.__commit()
+		self.__clearCaches()
 
 		return self.__getCursor().lastrowid
 
@@ -383,13 +1003,109 @@ class BaconSearch():
 				'VALUES (?, ?)')
 		self.__executemany(insert, castMembers)
 		self.__commit()
+		self.__clearCaches()
+
+	## Gets every film's id and name.
+	#
+	#  @param {object} self The object
+	#  @return {list} A list of results
+	def getFilms(self):
+		return self.__execute('SELECT FilmId, FilmName FROM Films').fetchall()
+
+	## Gets every actor's id and name.
+	#
+	#  @param {object} self The object
+	#  @return {list} A list of results
+	def getActors(self):
+		return self.__execute(
+				'SELECT ActorId, ActorName FROM Actors').fetchall()
+
+	## Adds films, actors, and casts that already have their ids in a single
+	#  transaction. If the load is big next to what's already saved the indexes
+	#  are dropped for it and built again after, since that's quicker than
+	#  keeping them up to date on every insert. A small load into a big
+	#  database keeps them, since rebuilding would cost more than the load and
+	#  the planner's statistics barely change. If anything goes wrong none of
+	#  it is saved.
+	#
+	#  @param {object} self The object
+	#  @param {list} films Tuples of film id then film name
+	#  @param {list} actors Tuples of actor id then actor name
+	#  @param {list} casts Tuples of film id then actor id
+	#  @return void
+	def addInBulk(self, films, actors, casts):
+		self.__clearCaches()
+		connection = self.__getConnection()
+		isolationLevel = connection.isolation_level
+		connection.isolation_level = None
+
+		try:
+			self.__execute('BEGIN')
+			isRebuilding = self.__isRebuildQuicker(len(casts))
+
+			if isRebuilding:
+				self.__dropIndexes()
+
+			self.__executemany('INSERT INTO Films (FilmId, FilmName) '
+					'VALUES (?, ?)', films)
+			self.__executemany('INSERT INTO Actors (ActorId, ActorName) '
+					'VALUES (?, ?)', actors)
+			self.__executemany('INSERT INTO Casts (FilmId, ActorId) '
+					'VALUES (?, ?)', casts)
+
+			if isRebuilding:
+				self.__createIndexes()
+
+			self.__execute('COMMIT')
+
+		except BaseException:
+			self.__execute('ROLLBACK')
+			raise
+
+		finally:
+			connection.isolation_level = isolationLevel
+
+	## Checks if dropping and rebuilding the indexes is quicker than keeping
+	#  them for a load. The largest cast row id stands in for how many casts
+	#  are saved, since counting them would read the whole table.
+	#
+	#  @param {object} self The object
+	#  @param {int} castCount How many casts are being loaded
+	#  @return {bool} If the indexes should be rebuilt
+	def __isRebuildQuicker(self, castCount):
+		savedCount = self.__execute(
+				'SELECT MAX(ROWID) FROM Casts').fetchone()[0] or 0
+
+		return castCount >= savedCount * self.REBUILD_INDEXES_RATIO
+
+	## Drops all the indexes.
+	#
+	#  @param {object} self The object
+	#  @return void
+	def __dropIndexes(self):
+		for indexName in self.__databaseIndexes:
+			self.__execute('DROP INDEX IF EXISTS ' + indexName)
 
-	## A wrapper for execute many.
+	## Creates all the indexes and updates the planner's statistics.
+	#
+	#  @param {object} self The object
+	#  @return void
+	def __createIndexes(self):
+		for (indexName, index) in self.__databaseIndexes.items():
+			self.__execute('CREATE INDEX IF NOT EXISTS ' + indexName + ' '
+					'ON ' + index)
+
+		self.__execute('ANALYZE')
+
+	## A wrapper for execute many that counts it as one statement for the
+	#  profile.
 	#
 	#  @param {object} self The object
 	#  @param {args} *args The arguments for execute many
 	#  @return {object} The cursor object
 	def __executemany(self, *args):
+		self.__benchmark.count('sqlStatements')
+
 		return self.__getCursor().executemany(*args)
 
 	## Reverts any pending changes to the database.
@@ -405,49 +1121,27 @@ class BaconSearch():
 	#  @param {object} self The object
 	#  @return {object} The connection object
 	def __getConnection(self):
-		if not self.__connection:
+		if not self.__connection or self.__connectionPid != os.getpid():
 			self.start()
 
 		return self.__connection
 
-	## Updates actor results in sets of 100 to be safe.
+	## Updates actor results, which are just their degrees and what they were
+	#  found from, so paths can be followed back to Kevin.
 	#
 	#  @param {object} self The object
-	#  @param {tuple} results A tuple of tuples (result, bacon degrees, id)
+	#  @param {list} results Tuples of bacon degrees, the film id the actor
+	#		was found from, the actor id that film was found from, and the
+	#		actor id
 	#  @return void
 	def updateActorResults(self, results):
 		update = ('UPDATE Actors '
-				'SET Result = ?, BaconDegrees = ? '
+				'SET BaconDegrees = ?, ParentFilmId = ?, ParentActorId = ? '
 				'WHERE ActorId = ?')
 
-		for actorResultsUpdateSet in self.__getActorResultsUpdateSets(results):
-			self.__executemany(update, actorResultsUpdateSet)
-
+		self.__executemany(update, results)
 		self.__commit()
-
-	## Builds sets of 100 tuples for updates.
-	#
-	#  @param {object} self The object
-	#  @param {tuple} results A tuple of tuples (result, bacon degrees, id)
-	#  @return {list} Sets of 100 actor updates
-	def __getActorResultsUpdateSets(self, results):
-		index = 0
-		actorResultsUpdateSets = []
-		actorResultsUpdateSet = ()
-
-		for path in results:
-			if index and index % 100 == 0:
-				actorResultsUpdateSets.append(actorResultsUpdateSet)
-				actorResultsUpdateSet = ()
-
-			actorResultsUpdateSet += ((pickle.dumps(path[0]), str(path[1]),
-					str(path[2]),),)
-
-			index += 1
-
-		actorResultsUpdateSets.append(actorResultsUpdateSet)
-
-		return actorResultsUpdateSets
+		self.__clearCaches()
 
 	## Updates Kevo's actor id and sets his path and degrees in the actor table.
 	#
@@ -456,7 +1150,7 @@ class BaconSearch():
 	#  @return {void}
 	def updateBaconActorId(self, baconActorId):
 		self.__updateBaconValue('ActorId', baconActorId)
-		self.updateActorResults((('', '0', baconActorId,),))
+		self.updateActorResults(((0, None, None, baconActorId),))
 
 	## Updates a given value in the Bacon table.
 	#
@@ -471,13 +1165,13 @@ class BaconSearch():
 		self.__execute(update, (value, self.BACON_ROW_ID,))
 		self.__commit()
 
-	## Saves the state of the bacon pyramid in a pickle in the table.
+	## Saves the state of the bacon pyramid in the binary pyramid file.
 	#
 	#  @param {object} self The object
 	#  @param {dictionary} pyramid The pyramid
 	#  @return {void}
 	def updateBaconPyramid(self, pyramid):
-		self.__updateBaconValue('Pyramid', pickle.dumps(pyramid))
+		self.__baconPyramidFile.write(pyramid)
 
 	## Gets Kevin Bacon's actor id from the Bacon table so the look up is 
 	#  quicker.
@@ -500,12 +1194,165 @@ class BaconSearch():
 
 		return result[column]
 
-	## Gets the pyramid object from the database
+	## Gets the pyramid from the binary pyramid file. The columns are mapped
+	#  from the file and read only.
 	#
 	#  @param {object} self The object
-	#  @return {dictionary} The pyramid
+	#  @return {mixed} None or the pyramid
 	def getBaconPyramid(self):
-		return self.__loadPickle(self.__getBaconValue('Pyramid'))
+		return self.__baconPyramidFile.open()
+
+	## Checks if the saved pyramid has been walked all the way, so every
+	#  actor without degrees has no connection to Kevin. Only the header and
+	#  the length of the queue are read from the file.
+	#
+	#  @param {object} self The object
+	#  @return {bool} The saved pyramid is complete
+	def isSolved(self):
+		pyramid = self.getBaconPyramid()
+
+		return bool(pyramid) and pyramid['pointer'] >= len(pyramid['queue'])
+
+	## Saves a tree walked from another center in its own pyramid file, then
+	#  removes the trees used least recently so only CENTERS_SIZE are kept.
+	#
+	#  @param {object} self The object
+	#  @param {int} centerActorId The actor id the tree was walked from
+	#  @param {dictionary} pyramid The pyramid
+	#  @return {void}
+	def updateCenterPyramid(self, centerActorId, pyramid):
+		if not os.path.isdir(self.__centersDirectory):
+			os.mkdir(self.__centersDirectory)
+
+		self.__getCenterPyramidFile(centerActorId).write(pyramid)
+		self.__removeOldCenters()
+
+	## Gets a tree walked from another center. The columns are mapped from the
+	#  file and read only. The file is marked as used so it's kept over the
+	#  ones that haven't been.
+	#
+	#  @param {object} self The object
+	#  @param {int} centerActorId The actor id the tree was walked from
+	#  @return {mixed} None or the pyramid
+	def getCenterPyramid(self, centerActorId):
+		pyramidFile = self.__getCenterPyramidFile(centerActorId)
+		pyramid = pyramidFile.open()
+
+		if pyramid:
+			pyramidFile.touch()
+
+		return pyramid
+
+	## Removes the saved trees used least recently, by modified time, until
+	#  there are only CENTERS_SIZE left. Files another process already
+	#  removed are skipped.
+	#
+	#  @param {object} self The object
+	#  @return void
+	def __removeOldCenters(self):
+		modifiedTimes = {}
+
+		for fileName in os.listdir(self.__centersDirectory):
+			if not fileName.endswith('.pyramid'):
+				continue
+
+			filePath = self.__centersDirectory + '/' + fileName
+
+			try:
+				modifiedTimes[filePath] = os.path.getmtime(filePath)
+
+			except OSError:
+				continue
+
+		filePaths = sorted(modifiedTimes, key = modifiedTimes.get)
+
+		for filePath in filePaths[:-self.CENTERS_SIZE]:
+			try:
+				os.remove(filePath)
+
+			except OSError:
+				pass
+
+	## Gets the pyramid file for a center.
+	#
+	#  @param {object} self The object
+	#  @param {int} centerActorId The actor id the tree was walked from
+	#  @return {object} The pyramid file
+	def __getCenterPyramidFile(self, centerActorId):
+		return BaconPyramidFile(self.__centersDirectory + '/' +
+				str(int(centerActorId)) + '.pyramid')
+
+	## Removes every tree walked from other centers. They can't be repaired
+	#  like Kevin's so any change to the casts means walking them again.
+	#
+	#  @param {object} self The object
+	#  @return void
+	def clearCenters(self):
+		if os.path.isdir(self.__centersDirectory):
+			shutil.rmtree(self.__centersDirectory)
+
+	## Rebuilds the sorted and trigram indexes of actor names from the Actors
+	#  table.
+	#
+	#  @param {object} self The object
+	#  @return void
+	def updateActorNames(self):
+		actorNames = [actorRow['ActorName'] for actorRow in self.getActors()]
+
+		self.__baconNames.build(actorNames)
+		self.__baconTrigrams.build(actorNames)
+
+	## Loads the indexes of actor names into memory, building them first if
+	#  the data was added before we kept them.
+	#
+	#  @param {object} self The object
+	#  @return void
+	def loadActorNames(self):
+		if not (self.__baconNames.load() and self.__baconTrigrams.load()):
+			self.updateActorNames()
+
+	## Gets the first actor names that start with a prefix, ignoring case.
+	#
+	#  @param {object} self The object
+	#  @param {string} prefix The start of the name
+	#  @param {int} limit The most names to return
+	#  @return {list} The actor names in sorted order
+	def getActorNamesByPrefix(self, prefix, limit = BaconNames.LIMIT):
+		self.loadActorNames()
+
+		return self.__baconNames.complete(prefix, limit)
+
+	## Gets the actor names closest to one that isn't in the data, most
+	#  similar first.
+	#
+	#  @param {object} self The object
+	#  @param {string} actorName The actor name we couldn't find
+	#  @param {int} limit The most names to return
+	#  @return {list} The actor names
+	def getActorNamesLike(self, actorName, limit = BaconTrigrams.LIMIT):
+		self.loadActorNames()
+
+		return self.__baconTrigrams.getClosest(actorName, limit)
+
+	## Gets how many actors have each number of degrees from BaconStats, which
+	#  triggers keep up to date whenever Actors.BaconDegrees changes. Actors
+	#  without any are counted under NO_DEGREES.
+	#
+	#  @param {object} self The object
+	#  @return {list} Tuples of degrees and actor count from the fewest degrees,
+	#		empty if the database hasn't been migrated
+	def getStats(self):
+		query = ('SELECT BaconDegrees, ActorCount '
+				'FROM BaconStats '
+				'WHERE ActorCount > 0 '
+				'ORDER BY BaconDegrees')
+
+		try:
+			return [(row['BaconDegrees'], row['ActorCount'])
+					for row in self.__execute(query).fetchall()]
+
+		except sqlite3.OperationalError:
+			return []
 
 	## Films are islands not actors so we get all the films with actor's who
 	#  have no bacon degrees. We assume the pyrmiad has been solved or this
@@ -530,12 +1377,160 @@ class BaconSearch():
 
 		return unsolvedFilms
 
+	## Points every search object at a new empty database and files next to
+	#  the ones being served, so look ups keep reading the old database,
+	#  pyramid, trees, and name indexes while the new ones are built. Anything
+	#  left from a replacement that didn't finish is removed.
+	#
+	#  @param {object} self The object
+	#  @return {object} The object for chaining
+	def startReplacement(self):
+		self.close()
+		self.__clearCaches()
+		self.__setPaths(self.__getPaths(self.REPLACEMENT_SUFFIX))
+		self.__removeFiles()
+		BaconSearch.__isMigrated = False
+
+		return self
+
+	## Moves the new database and the files built next to it over the ones
+	#  being served. The database is taken out of WAL mode first so everything
+	#  is in the one file, and the old database's WAL files are removed so
+	#  they're never read as the new one's. Served files the replacement
+	#  didn't build, like trees for the old data, are removed. Anything that
+	#  already had the old files open keeps reading them until it opens them
+	#  again.
+	#
+	#  @param {object} self The object
+	#  @return {object} The object for chaining
+	def endReplacement(self):
+		self.__execute('PRAGMA journal_mode = DELETE')
+		self.close()
+		self.__clearCaches()
+		servedPaths = self.__getPaths()
+		replacementPaths = self.__getPaths(self.REPLACEMENT_SUFFIX)
+		os.rename(replacementPaths['database'], servedPaths['database'])
+		self.__removeDatabase(servedPaths['database'], False)
+
+		for sidecar in self.SIDECARS:
+			self.__moveOver(replacementPaths[sidecar], servedPaths[sidecar])
+
+		self.__setPaths(servedPaths)
+
+		return self
+
+	## Moves a file or directory over another, or removes the other if
+	#  there's nothing to move.
+	#
+	#  @param {object} self The object
+	#  @param {string} sourcePath The path to move
+	#  @param {string} targetPath The path to move it to
+	#  @return void
+	def __moveOver(self, sourcePath, targetPath):
+		if os.path.isdir(targetPath):
+			shutil.rmtree(targetPath)
+
+		if os.path.exists(sourcePath):
+			os.rename(sourcePath, targetPath)
+
+		elif os.path.isfile(targetPath):
+			os.remove(targetPath)
+
+	## Gets the paths to the database and every file kept next to it in the
+	#  data's directory.
+	#
+	#  @param {object} self The object
+	#  @param {string} suffix What's added to each path
+	#  @return {dictionary} The paths for the database and each sidecar
+	def __getPaths(self, suffix = ''):
+		basePath = self.__directory + '/baconsearch'
+
+		return {
+			'database': basePath + '.db' + suffix,
+			'pyramid': basePath + '.pyramid' + suffix,
+			'names': basePath + '.names' + suffix,
+			'trigrams': basePath + '.trigrams' + suffix,
+			'centers': basePath + '.centers' + suffix,
+			}
+
+	## Points every search object at a database and the files next to it.
+	#
+	#  @param {object} self The object
+	#  @param {dictionary} paths The paths for the database and each sidecar
+	#  @return void
+	def __setPaths(self, paths):
+		BaconSearch.__databasePath = paths['database']
+		BaconSearch.__baconPyramidFile = BaconPyramidFile(paths['pyramid'])
+		BaconSearch.__baconNames = BaconNames(paths['names'])
+		BaconSearch.__baconTrigrams = BaconTrigrams(paths['trigrams'])
+		BaconSearch.__centersDirectory = paths['centers']
+
+	## Keeps the database and every file kept next to it in another directory.
+	#  The connection is closed and the caches are cleared so nothing from the
+	#  old directory is read after.
+	#
+	#  @param {object} self The object
+	#  @param {string} directory The absolute path to the directory
+	#  @return {object} The object for chaining
+	def setDirectory(self, directory):
+		self.close()
+		self.__clearCaches()
+		BaconSearch.__directory = directory
+		self.__setPaths(self.__getPaths())
+		BaconSearch.__isMigrated = False
+
+		return self
+
+	## Gets the directory the data is kept in.
+	#
+	#  @param {object} self The object
+	#  @return {string} The absolute path to the directory
+	def getDirectory(self):
+		return self.__directory
+
+	## Gets the path to the default tar file in the data's directory.
+	#
+	#  @param {object} self The object
+	#  @return {string} The path
+	def getDefaultTarFile(self):
+		return self.__directory + '/' + self.DEFAULT_TAR_FILE
+
+	## Removes a database and its WAL files.
+	#
+	#  @param {object} self The object
+	#  @param {string} databasePath The path to the database
+	#  @param {bool} shouldRemoveDatabase Should we remove the database too or
+	#		just its WAL files
+	#  @return void
+	def __removeDatabase(self, databasePath, shouldRemoveDatabase = True):
+		suffixes = ('-wal', '-shm')
+
+		if shouldRemoveDatabase:
+			suffixes += ('',)
+
+		for suffix in suffixes:
+			if os.path.isfile(databasePath + suffix):
+				os.remove(databasePath + suffix)
+
 	## Deletes the entire database.
 	#
 	#  @param {object} self The object
 	#  @return void
 	def clearAll(self):
-		if self.__isSetup():
-			os.remove(self.__databasePath)
+		self.close()
+		self.__clearCaches()
+		self.__removeFiles()
+		BaconSearch.__isMigrated = False
 
-		return self
\ No newline at end of file
+		return self
+
+	## Removes the database and every file kept next to it.
+	#
+	#  @param {object} self The object
+	#  @return void
+	def __removeFiles(self):
+		self.__baconPyramidFile.remove()
+		self.__baconNames.remove()
+		self.__baconTrigrams.remove()
+		self.clearCenters()
+		self.__removeDatabase(self.__databasePath)
\ No newline at end of file
@@ -0,0 +1,330 @@
+#!/usr/bin/env python
+
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from SocketServer import ThreadingMixIn
+from baconsearch import BaconSearch
+from baconpyramid import BaconPyramid
+from baconcenters import BaconCenters
+from baconhelpers import getActorNameKey
+import json
+import socket
+import urllib
+import urllib2
+import urlparse
+
+## Keeps the whole pyramid and every name in memory and answers lookups over
+#  http on localhost. The pyramid and names are loaded before we start
+#  listening and never change after, so each request thread reads them
+#  without locks. Trees for other centers are walked the first time they're
+#  asked for and kept in the centers object, which only locks its trees while
+#  reading or adding one so a center it has never waits on another's walk.
+#  Restart it after burning or flipping the bacon.
+#
+#  @author Chris Lock
+class BaconServer():
+	# @constant The host we listen on
+	HOST = '127.0.0.1'
+	# @constant The port we listen on if we're not given one
+	PORT = 8787
+	# @constant The path lookups are served from
+	PATH = '/degrees'
+	# @constant The path name completions are served from
+	COMPLETE_PATH = '/complete'
+
+	# @type {object} An instance of the search object
+	__baconSearch = BaconSearch()
+	# @type {object} An instance of the pyramid builder object
+	__baconPyramid = BaconPyramid()
+	# @type {object} An instance of the centers object
+	__baconCenters = BaconCenters()
+	# @type {int} The port we listen on
+	__port = PORT
+	# @type {int} Kevin's actor id
+	__baconActorId = None
+	# @type {dictionary} Actor name keys to actor ids
+	__actorIds = {}
+	# @type {dictionary} Actor ids to actor names
+	__actorNames = {}
+	# @type {dictionary} Film ids to film names
+	__filmNames = {}
+
+	## Sets the port.
+	#
+	#  @param {object} self The object
+	#  @param {int} port The port to listen on
+	#  @return void
+	def __init__(self, port = PORT):
+		self.__port = port
+
+	## Solves the pyramid and loads every actor and film name along with the
+	#  indexes of actor names.
+	#
+	#  @param {object} self The object
+	#  @return {object} The object for chaining
+	def load(self):
+		self.__baconSearch.setWorkload(BaconSearch.READ).setup().start()
+		self.__baconPyramid.solve()
+		self.__baconActorId = self.__baconSearch.getBaconActorId()
+		self.__actorIds = {}
+		self.__actorNames = {}
+		self.__filmNames = {}
+
+		for actor in self.__baconSearch.getActors():
+			self.__actorIds.setdefault(getActorNameKey(actor['ActorName']),
+					actor['ActorId'])
+			self.__actorNames[actor['ActorId']] = actor['ActorName']
+
+		for film in self.__baconSearch.getFilms():
+			self.__filmNames[film['FilmId']] = film['FilmName']
+
+		self.__baconSearch.loadActorNames()
+		self.__baconSearch.end()
+
+		return self
+
+	## Listens until we're interrupted, handling each request in its own
+	#  thread.
+	#
+	#  @param {object} self The object
+	#  @return void
+	def serve(self):
+		server = BaconHTTPServer((self.HOST, self.__port), BaconRequestHandler)
+		server.baconServer = self
+
+		try:
+			server.serve_forever()
+
+		except KeyboardInterrupt:
+			pass
+
+		finally:
+			server.server_close()
+
+	## Gets the record for a name. The degrees and path are None if the name
+	#  isn't an actor or they have no connection to the center. If the name
+	#  isn't an actor the suggestions are the closest names that are.
+	#
+	#  @param {object} self The object
+	#  @param {string} actorName The name to look up
+	#  @param {string} centerName The name to measure from, Kevin if None
+	#  @return {mixed} None if the center isn't an actor or the record
+	def get(self, actorName, centerName = None):
+		actorId = self.__actorIds.get(getActorNameKey(actorName))
+		centerId = (self.__actorIds.get(getActorNameKey(centerName))
+				if centerName else self.__baconActorId)
+
+		if not centerId:
+			return None
+
+		record = {
+			'name': actorName,
+			'actorName': self.__actorNames.get(actorId),
+			'center': self.__actorNames[centerId],
+			'baconDegrees': None,
+			'path': None,
+			'suggestions': ([] if actorId
+					else self.__baconSearch.getActorNamesLike(actorName)),
+			}
+		actorResult = self.__getResult(actorId, centerId)
+
+		if actorResult:
+			record['baconDegrees'] = actorResult['baconDegrees']
+			record['path'] = self.__getPathAsActorsAndFilms(record['actorName'],
+					actorResult['path'], record['center'])
+
+		return record
+
+	## Gets the record for the actor names that start with a prefix.
+	#
+	#  @param {object} self The object
+	#  @param {string} prefix The start of the name
+	#  @return {dictionary} The record
+	def complete(self, prefix):
+		return {
+			'prefix': prefix,
+			'names': self.__baconSearch.getActorNamesByPrefix(prefix),
+			}
+
+	## Gets the actor dictionary for the path from an actor to a center.
+	#
+	#  @param {object} self The object
+	#  @param {mixed} actorId None or the actor id
+	#  @param {int} centerId The actor id we're measuring from
+	#  @return {mixed} None if there's no path or the actor dictionary
+	def __getResult(self, actorId, centerId):
+		if not actorId:
+			return None
+
+		if centerId == self.__baconActorId:
+			return self.__baconPyramid.getResult(actorId)
+
+		return self.__baconCenters.get(actorId, centerId)
+
+	## Gets the names for a path of ids from the actor to the center.
+	#
+	#  @param {object} self The object
+	#  @param {string} actorName The actor name the path starts at
+	#  @param {tuple} path The tuple of ids to get to the center
+	#  @param {string} centerName The actor name the path ends at
+	#  @return {list} The path as names
+	def __getPathAsActorsAndFilms(self, actorName, path, centerName):
+		pathAsActorsAndFilms = [actorName]
+
+		for index, entityId in enumerate(path):
+			if index % 2 == 0:
+				pathAsActorsAndFilms.append(self.__filmNames[entityId])
+
+			else:
+				pathAsActorsAndFilms.append(self.__actorNames[entityId])
+
+		if path:
+			pathAsActorsAndFilms.append(centerName)
+
+		return pathAsActorsAndFilms
+
+## The http server with a thread for each request. Request threads don't keep
+#  the process alive once we stop serving.
+#
+#  @author Chris Lock
+class BaconHTTPServer(ThreadingMixIn, HTTPServer):
+	# @type {bool} Don't wait on request threads when we exit
+	daemon_threads = True
+	# @type {object} The server object answering lookups
+	baconServer = None
+
+## Answers GET requests for a name with the json record.
+#
+#  @author Chris Lock
+class BaconRequestHandler(BaseHTTPRequestHandler):
+	# @type {string} Keep connections open between requests
+	protocol_version = 'HTTP/1.1'
+	# @type {int} Buffer each response so it goes out in a single send and
+	#	doesn't wait on the client acknowledging the headers
+	wbufsize = -1
+
+	## Routes a GET request. The name is passed as the name query parameter
+	#  and the actor to measure from as the center query parameter.
+	#  Completions take the start of a name as the prefix query parameter.
+	#  Query parameters that aren't utf-8 are a bad request.
+	#
+	#  @param {object} self The object
+	#  @return void
+	def do_GET(self):
+		url = urlparse.urlparse(self.path)
+
+		try:
+			query = dict((key, [value.decode('utf-8') for value in values])
+					for (key, values) in urlparse.parse_qs(url.query).items())
+
+		except UnicodeDecodeError:
+			return self.__sendJson(400, {'error': 'Pass the query as utf-8.'})
+
+		names = query.get('name')
+		centers = query.get('center')
+
+		if url.path == BaconServer.COMPLETE_PATH:
+			return self.__sendCompletions(query.get('prefix'))
+
+		if url.path != BaconServer.PATH:
+			return self.__sendJson(404, {'error': 'Not found.'})
+
+		if not names:
+			return self.__sendJson(400, {'error': 'Pass a name.'})
+
+		record = self.server.baconServer.get(names[0],
+				centers[0] if centers else None)
+
+		if not record:
+			return self.__sendJson(404, {'error': 'Couldn\'t find the '
+					'center.'})
+
+		self.__sendJson(200, record)
+
+	## Sends the names that start with a prefix.
+	#
+	#  @param {object} self The object
+	#  @param {mixed} prefixes None or the prefix query parameter values
+	#  @return void
+	def __sendCompletions(self, prefixes):
+		if not prefixes:
+			return self.__sendJson(400, {'error': 'Pass a prefix.'})
+
+		self.__sendJson(200, self.server.baconServer.complete(prefixes[0]))
+
+	## Sends a json response.
+	#
+	#  @param {object} self The object
+	#  @param {int} status The http status
+	#  @param {dictionary} body The body to send as json
+	#  @return void
+	def __sendJson(self, status, body):
+		response = json.dumps(body)
+
+		self.send_response(status)
+		self.send_header('Content-Type', 'application/json')
+		self.send_header('Content-Length', str(len(response)))
+		self.end_headers()
+		self.wfile.write(response)
+
+	## Keeps each request from being logged to stderr.
+	#
+	#  @param {object} self The object
+	#  @param {string} format The format of the message
+	#  @param {args} *args The values for the format
+	#  @return void
+	def log_message(self, format, *args):
+		pass
+
+## Asks a running server for names.
+#
+#  @author Chris Lock
+class BaconClient():
+	# @constant How long to wait on the server in seconds
+	TIMEOUT = 10
+
+	# @type {int} The port the server listens on
+	__port = BaconServer.PORT
+
+	## Sets the port.
+	#
+	#  @param {object} self The object
+	#  @param {int} port The port the server listens on
+	#  @return void
+	def __init__(self, port = BaconServer.PORT):
+		self.__port = port
+
+	## Gets the record for a name from the server.
+	#
+	#  @param {object} self The object
+	#  @param {string} actorName The name to look up
+	#  @param {string} centerName The name to measure from, Kevin if None
+	#  @return {mixed} None if the server isn't running or the record, which
+	#		has an error if the server couldn't answer
+	def get(self, actorName, centerName = None):
+		query = {'name': self.__encode(actorName)}
+
+		if centerName:
+			query['center'] = self.__encode(centerName)
+
+		url = ('http://' + BaconServer.HOST + ':' + str(self.__port) +
+				BaconServer.PATH + '?' + urllib.urlencode(query))
+
+		try:
+			return json.load(urllib2.urlopen(url, timeout = self.TIMEOUT))
+
+		except urllib2.HTTPError, error:
+			return json.load(error)
+
+		except (urllib2.URLError, socket.error):
+			return None
+
+	## Encodes a name for the url.
+	#
+	#  @param {object} self The object
+	#  @param {string} name The name
+	#  @return {string} The utf-8 name
+	def __encode(self, name):
+		if isinstance(name, unicode):
+			return name.encode('utf-8')
+
+		return name
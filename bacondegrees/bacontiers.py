@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+
+from baconhelpers import Benchmark, ignoreInterrupts, loading
+
+## Walks the rest of a pyramid a whole tier at a time across a pool of
+#  processes. Each tier is split into chunks of actors in queue order and each
+#  worker walks its chunk like the one at a time walk would, only checking
+#  what was found before the tier started. Then we merge the chunks back in
+#  order, skipping any film or actor an earlier chunk already found. Anything
+#  a worker skipped because it saw it earlier in its own chunk is found by the
+#  time we merge that chunk, so the pyramid comes out the same as walking it
+#  one actor at a time. A new pool is forked for each tier so the workers
+#  share the graph and what's been found so far without copying them.
+#
+#  @author Chris Lock
+class BaconTiers():
+	# @constant The degrees for an actor we haven't found
+	NOT_FOUND = -1
+	# @constant Tiers with fewer actors than this are walked in this process
+	MIN_PARALLEL = 1000
+	# @constant How many chunks to split a tier into for each worker
+	CHUNKS_PER_WORKER = 4
+	# @constant How long to wait on a tier in seconds before giving up
+	TIER_TIMEOUT = 86400
+
+	# @type {object} An instance of the benchmark object for the profile
+	__benchmark = Benchmark()
+	# @type {int} The number of worker processes
+	__workers = 1
+
+	## Sets the number of workers.
+	#
+	#  @param {object} self The object
+	#  @param {int} workers The number of worker processes
+	#  @return void
+	def __init__(self, workers = 1):
+		self.__workers = workers
+
+	## Walks every tier left in the pyramid, updating its columns, queue, and
+	#  pointer in place. Between tiers the pyramid is saved whenever the
+	#  checkpointer says it's time. The actors expanded and the edges the
+	#  chunks scanned are counted once we're done for the profile.
+	#
+	#  @param {object} self The object
+	#  @param {dictionary} pyramid The pyramid with array columns that cover
+	#		every id in the graph
+	#  @param {object} baconGraph The loaded graph
+	#  @param {mixed} checkpointer None or the object with isCheckpointDue and
+	#		checkpoint methods that saves the pyramid
+	#  @return void
+	def expand(self, pyramid, baconGraph, checkpointer = None):
+		actorDegrees = pyramid['actorDegrees']
+		queue = pyramid['queue']
+		pointer = pyramid['pointer']
+		startPointer = pointer
+		edgeCount = 0
+
+		tierState['baconGraph'] = baconGraph
+		tierState['actorDegrees'] = actorDegrees
+		tierState['filmParents'] = pyramid['filmParents']
+
+		while pointer < len(queue):
+			castDegrees = actorDegrees[queue[pointer]] + 1
+			tierEnd = pointer
+
+			while (tierEnd < len(queue)
+					and actorDegrees[queue[tierEnd]] < castDegrees):
+				tierEnd += 1
+
+			for (expandedFilms, chunkEdgeCount) in self.__expandTier(
+					queue[pointer:tierEnd]):
+				self.__mergeFilms(pyramid, expandedFilms, castDegrees)
+				edgeCount += chunkEdgeCount
+
+			pointer = tierEnd
+			loading(castDegrees, 1)
+
+			if checkpointer and checkpointer.isCheckpointDue(pointer):
+				pyramid['pointer'] = pointer
+				checkpointer.checkpoint(pyramid)
+
+		pyramid['pointer'] = pointer
+		tierState.clear()
+		self.__benchmark.count('nodesExpanded', pointer - startPointer)
+		self.__benchmark.count('edgesScanned', edgeCount)
+
+	## Expands the actors on a tier in chunks, across the pool if it's big
+	#  enough to be worth forking for.
+	#
+	#  @param {object} self The object
+	#  @param {array} actorIds The actor ids on the tier
+	#  @return {list} The films each chunk expanded and how many edges it
+	#		scanned in order
+	def __expandTier(self, actorIds):
+		if self.__workers <= 1 or len(actorIds) < self.MIN_PARALLEL:
+			return [expandActors(actorIds)]
+
+		chunkCount = self.__workers * self.CHUNKS_PER_WORKER
+		chunkSize = -(-len(actorIds) // chunkCount)
+		chunks = [actorIds[start:start + chunkSize]
+				for start in range(0, len(actorIds), chunkSize)]
+
+		import multiprocessing
+
+		pool = multiprocessing.Pool(self.__workers, ignoreInterrupts)
+
+		try:
+			expandedChunks = pool.map_async(expandActors, chunks).get(
+					self.TIER_TIMEOUT)
+
+		except:
+			pool.terminate()
+			pool.join()
+
+			raise
+
+		pool.close()
+		pool.join()
+
+		return expandedChunks
+
+	## Adds the films a chunk expanded and their casts to the pyramid unless
+	#  an earlier chunk already found them.
+	#
+	#  @param {object} self The object
+	#  @param {dictionary} pyramid The pyramid
+	#  @param {list} expandedFilms Tuples of film id, the actor id it was found
+	#		from, and the cast actor ids the chunk found from it
+	#  @param {int} castDegrees The degrees for the casts of the films
+	#  @return void
+	def __mergeFilms(self, pyramid, expandedFilms, castDegrees):
+		actorDegrees = pyramid['actorDegrees']
+		actorParents = pyramid['actorParents']
+		filmParents = pyramid['filmParents']
+		queue = pyramid['queue']
+
+		for (filmId, actorId, castActorIds) in expandedFilms:
+			if filmParents[filmId]:
+				continue
+
+			filmParents[filmId] = actorId
+
+			for castActorId in castActorIds:
+				if actorDegrees[castActorId] != self.NOT_FOUND:
+					continue
+
+				actorDegrees[castActorId] = castDegrees
+				actorParents[castActorId] = filmId
+				queue.append(castActorId)
+
+# @type {dictionary} The graph and the columns as they were at the start of
+#	the tier, set before the pool is forked so workers can read them
+tierState = {}
+
+## Walks a chunk of actors in order checking what was found before the tier
+#  started and what this chunk has found so far. It lives outside the class so
+#  it can be sent to pool workers.
+#
+#  @param {array} actorIds The actor ids in the chunk
+#  @return {list} Tuples of film id, the actor id it was found from, and the
+#		cast actor ids found from it, {int} How many film and cast ids we read
+def expandActors(actorIds):
+	baconGraph = tierState['baconGraph']
+	actorDegrees = tierState['actorDegrees']
+	filmParents = tierState['filmParents']
+	filmIds = set()
+	castActorIds = set()
+	expandedFilms = []
+	edgeCount = 0
+
+	for actorId in actorIds:
+		actorFilmIds = baconGraph.getFilmIdsByActorId(actorId)
+		edgeCount += len(actorFilmIds)
+
+		for filmId in actorFilmIds:
+			if filmParents[filmId] or filmId in filmIds:
+				continue
+
+			filmIds.add(filmId)
+			filmActorIds = baconGraph.getActorIdsByFilmId(filmId)
+			edgeCount += len(filmActorIds)
+			newActorIds = [castActorId for castActorId in filmActorIds
+					if actorDegrees[castActorId] == BaconTiers.NOT_FOUND
+					and castActorId not in castActorIds]
+			castActorIds.update(newActorIds)
+			expandedFilms.append((filmId, actorId, newActorIds))
+
+	return expandedFilms, edgeCount
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+
+import heapq
+import marshal
+import os
+
+## An index of the three letter pieces of every actor name so we can suggest
+#  names close to one we couldn't find. Each trigram keeps the list of names
+#  it's in. To find the closest names we count how many trigrams each name
+#  shares with the one we're looking for, starting with the rarest ones, and
+#  rank them by how much of both names the shared trigrams cover. Common
+#  trigrams are in so many names that we stop reading lists once we've read
+#  enough, so a look up costs about the same no matter how many actors there
+#  are. The index is saved next to the database when the data is updated.
+#
+#  @author Chris Lock
+class BaconTrigrams():
+	# @constant The value every trigrams file starts with
+	MAGIC = 'BACONTRI'
+	# @constant The version of the file layout
+	VERSION = 1
+	# @constant How many names we suggest
+	LIMIT = 3
+	# @constant The most names we read from the trigram lists for a look up
+	MAX_READS = 20000
+	# @constant How similar a name needs to be to suggest it, from 0 to 1
+	MIN_SIMILARITY = 0.4
+
+	# @type {string} The path to the trigrams file
+	__filePath = None
+	# @type {list} The actor names
+	__names = None
+	# @type {list} How many trigrams are in each name
+	__trigramCounts = None
+	# @type {dictionary} Trigrams to the indexes of the names they're in
+	__trigramNames = None
+
+	## Sets the path to the file.
+	#
+	#  @param {object} self The object
+	#  @param {string} filePath The path to the trigrams file
+	#  @return void
+	def __init__(self, filePath):
+		self.__filePath = filePath
+
+	## Checks if there's a saved index.
+	#
+	#  @param {object} self The object
+	#  @return {bool} The file exists
+	def exists(self):
+		return os.path.isfile(self.__filePath)
+
+	## Breaks every name into trigrams and writes the index to a temporary
+	#  file that we move over the old one.
+	#
+	#  @param {object} self The object
+	#  @param {iterable} actorNames Every actor name
+	#  @return void
+	def build(self, actorNames):
+		self.__names = []
+		self.__trigramCounts = []
+		self.__trigramNames = {}
+
+		for actorName in actorNames:
+			trigrams = self.getTrigrams(actorName)
+
+			for trigram in trigrams:
+				self.__trigramNames.setdefault(trigram, []).append(
+						len(self.__names))
+
+			self.__names.append(actorName)
+			self.__trigramCounts.append(len(trigrams))
+
+		temporaryPath = self.__filePath + '.tmp'
+
+		with open(temporaryPath, 'wb') as trigramsFile:
+			marshal.dump((self.MAGIC, self.VERSION, self.__names,
+					self.__trigramCounts, self.__trigramNames), trigramsFile)
+
+		os.rename(temporaryPath, self.__filePath)
+
+	## Reads the index into memory if it isn't already. Leaves it empty if the
+	#  file is missing or from another layout.
+	#
+	#  @param {object} self The object
+	#  @return {bool} The index is loaded
+	def load(self):
+		if self.__names is not None:
+			return True
+
+		if not self.exists():
+			return False
+
+		with open(self.__filePath, 'rb') as trigramsFile:
+			try:
+				(magic, version, names, trigramCounts,
+						trigramNames) = marshal.load(trigramsFile)
+
+			except (EOFError, ValueError, TypeError):
+				return False
+
+		if magic != self.MAGIC or version != self.VERSION:
+			return False
+
+		self.__names = names
+		self.__trigramCounts = trigramCounts
+		self.__trigramNames = trigramNames
+
+		return True
+
+	## Gets the trigrams in a name, lower cased and padded with a space on
+	#  each end so the first and last letters count too.
+	#
+	#  @param {object} self The object
+	#  @param {string} name The name
+	#  @return {set} The trigrams
+	def getTrigrams(self, name):
+		if isinstance(name, str):
+			name = name.decode('utf-8')
+
+		paddedName = u' ' + u' '.join(name.lower().split()) + u' '
+
+		return set(paddedName[index:index + 3]
+				for index in range(len(paddedName) - 2))
+
+	## Finds the names closest to one we couldn't find, most similar first.
+	#  Similarity is twice the shared trigrams over the trigrams in both names.
+	#
+	#  @param {object} self The object
+	#  @param {string} name The name we couldn't find
+	#  @param {int} limit The most names to return
+	#  @return {list} The actor names, empty if the index isn't loaded
+	def getClosest(self, name, limit = LIMIT):
+		if not self.load():
+			return []
+
+		trigrams = self.getTrigrams(name)
+		sharedCounts = {}
+		reads = 0
+
+		for nameIndexes in sorted((self.__trigramNames[trigram]
+				for trigram in trigrams if trigram in self.__trigramNames),
+				key = len):
+			if reads and reads + len(nameIndexes) > self.MAX_READS:
+				break
+
+			reads += len(nameIndexes)
+
+			for nameIndex in nameIndexes:
+				sharedCounts[nameIndex] = sharedCounts.get(nameIndex, 0) + 1
+
+		similarities = ((2.0 * sharedCount /
+				(len(trigrams) + self.__trigramCounts[nameIndex]), nameIndex)
+				for (nameIndex, sharedCount) in sharedCounts.items())
+
+		return [self.__names[nameIndex] for (similarity, nameIndex)
+				in heapq.nlargest(limit, similarities)
+				if similarity >= self.MIN_SIMILARITY]
+
+	## Drops the index from memory and removes the file if there is one.
+	#
+	#  @param {object} self The object
+	#  @return void
+	def remove(self):
+		self.__names = None
+		self.__trigramCounts = None
+		self.__trigramNames = None
+
+		if self.exists():
+			os.remove(self.__filePath)
@@ -2,30 +2,72 @@
 
 import os
 from baconsearch import BaconSearch
-from baconhelpers import Benchmark, alertAndExit, bold, progressBar
-import tarfile
-import json
+from baconpyramid import BaconPyramid
+from baconhelpers import (Benchmark, alertAndExit, bold, progressBar, loading,
+		ignoreInterrupts, getActorNameKey)
+import sys
 
 ## A class for update the data with a tar.gz contaontaining json files 
-#  formatted film.name, cast[].name.
+#  formatted film.name, cast[].name. By default films are added in bulk: names
+#  are matched against dictionaries of what's already in the data, ids are
+#  handed out here, and everything is written in one go at the end. The
+#  update can still add each film as it's read. Decoding the json files is
+#  spread across a pool of worker processes while this process does all the
+#  writing. Archives are read as a stream in a single pass, so they can be
+#  piped in on stdin. Every look up checks if the default tar file still
+#  needs cooking, so the modules for reading archives are only imported once
+#  we're updating.
 #
 #  @author Chris Lock
 class BaconUpdate():
-	# @type {string} The absolute path to the directory that this file lives in
-	__directory = os.path.dirname(os.path.realpath(__file__))
-	# @type {string} The default tar file containing json files with films
-	__defaultTarFile = __directory + '/films.tar.gz'
+	# @constant The tar file name that reads the archive from stdin
+	STDIN = '-'
+	# @constant How many json files are sent to the pool at once
+	BATCH_SIZE = 1000
+	# @constant How long to wait on a batch, so the wait can be interrupted
+	BATCH_TIMEOUT = 86400
+
 	# @type {object} An instance of the search object
 	__baconSearch = BaconSearch()
 	# @type {object} An instance of the benchmark object
 	__benchmark = Benchmark()
+	# @type {object} An instance of the pyramid builder object
+	__baconPyramid = BaconPyramid()
+	# @type {bool} Should we add films in bulk
+	__useBulk = True
+	# @type {dictionary} Film names to film ids
+	__filmIds = {}
+	# @type {dictionary} Actor name keys to actor ids
+	__actorIds = {}
+	# @type {int} The largest film id handed out
+	__filmIdMax = 0
+	# @type {int} The largest actor id handed out
+	__actorIdMax = 0
+	# @type {list} The films to add, film id then film name
+	__films = []
+	# @type {list} The actors to add, actor id then actor name
+	__actors = []
+	# @type {list} The casts to add, film id then actor id
+	__casts = []
+	# @type {int} How many processes decode json files, None for every core
+	__workers = None
+
+	## Sets whether we add films in bulk or one at a time.
+	#
+	#  @param {object} self The object
+	#  @param {bool} useBulk Should we add films in bulk
+	#  @return void
+	def __init__(self, useBulk = True):
+		self.__useBulk = useBulk
 
-	## An empty constructor.
+	## Sets how many processes decode json files. One or less decodes them in
+	#  this process.
 	#
 	#  @param {object} self The object
+	#  @param {int} workers The number of processes
 	#  @return void
-	def __init__(self):
-		pass
+	def setWorkers(self, workers):
+		self.__workers = workers
 
 	## Creates the data with the tar file.
 	#
@@ -34,7 +76,7 @@ class BaconUpdate():
 	#  @return void
 	def prep(self, verbose = False):
 		if self.__hasDefaultTarFile():
-			self.update(self.__defaultTarFile, True)
+			self.update(self.__baconSearch.getDefaultTarFile(), True)
 		elif verbose:
 			print('Your bacon is already cooked.')
 
@@ -43,58 +85,92 @@ class BaconUpdate():
 	#  @param {object} self The object
 	#  @return {bool} Whether we still have the file
 	def __hasDefaultTarFile(self):
-		return os.path.isfile(self.__defaultTarFile)
-
-	## Starts the benchmark, setups the data, starts the connection, and clears
-	#  any cached results since they could be inaccurate with new info. We 
-	#  check if the file is actually a tar file. We try to upload the file,
-	#  catch the keyboard interruption. Then set Kevin Baon's info and delete
-	#  the default file.
+		return os.path.isfile(self.__baconSearch.getDefaultTarFile())
+
+	## Starts the benchmark, setups the data, starts the connection tuned for
+	#  loading in bulk, and clears any cached results since they could be
+	#  inaccurate with new info. If the update is incremental and we're adding
+	#  in bulk, we keep the cache and repair it once the films are added
+	#  instead. We check if the file is actually a tar file. Since stdin can't
+	#  be checked ahead of time, we also check while reading it. We try to
+	#  upload the file, catch the keyboard interruption. Then set Kevin Baon's
+	#  info, rebuild the index of actor names, tune the connection for look ups
+	#  again, and delete the default file.
 	#
 	#  @param {object} self The object
-	#  @param {string} tarFile The path to the tarfile for the update
+	#  @param {string} tarFile The path to the tarfile for the update or STDIN
+	#  @param {bool} shouldClean Should we remove the default tar file after
+	#  @param {bool} isIncremental Should we repair the cache instead of
+	#		clearing it
 	#  @return void
-	def update(self, tarFile, shouldClean = False):
+	def update(self, tarFile, shouldClean = False, isIncremental = False):
+		import tarfile
+
+		isRepairing = isIncremental and self.__useBulk
+
 		self.__benchmark.start()
-		self.__baconSearch.setup().start().clearCache()
+		self.__baconSearch.setup().start().setWorkload(BaconSearch.BULK)
+
+		if isRepairing:
+			self.__baconSearch.clearCenters()
 
-		if not tarfile.is_tarfile(tarFile):
+		else:
+			self.__baconSearch.clearCache()
+
+		if tarFile != self.STDIN and not tarfile.is_tarfile(tarFile):
 			alertAndExit(bold(tarFile) + ' is not a tar file.')
 		else:
 			try:
 				self.__uploadTarFile(tarFile)
 
+			except tarfile.ReadError:
+				self.__baconSearch.revert()
+				alertAndExit('\n' + bold(tarFile) + ' is not a tar file.')
+
 			except KeyboardInterrupt, SystemExit:
 				self.__baconSearch.revert()
 				alertAndExit('\nYour bacon is undercooked.')
 
+			if isRepairing:
+				self.__repairCache()
+
 			self.__setBacon()
-			self.__baconSearch.end()
+			self.__baconSearch.updateActorNames()
+			self.__baconSearch.setWorkload(BaconSearch.QUERY).end()
 
 			if shouldClean:
 				self.__clean()
 
-	## Opens the tar file. Prints a starting message. Loops through the JSON 
-	#  files and adding each film and showing a progress bar based on the total 
-	#  number of files. Prints a complete message at the end.
+	## Opens the tar file as a stream. Prints a starting message. Loops through
+	#  the JSON files and adding each film and showing a progress bar based on
+	#  how much of the file we've read. Prints a complete message at the end.
+	#  Reading the archive is timed as parsing for the profile, which includes
+	#  writing each film if we're not adding in bulk.
 	#
 	#  @param {object} self The object
-	#  @param {string} tarFile The path to the tarfile for the update
+	#  @param {string} tarFile The path to the tarfile for the update or STDIN
 	#  @return void
 	def __uploadTarFile(self, tarFileForUpdate):
-		itteration = 1
-
-		self.__startProgress()
-
-		with tarfile.open(tarFileForUpdate) as archive:
-			jsonFileTotal = len(archive.getmembers())
+		import tarfile
 
-			for tarinfo in archive:
-				if tarinfo.isreg():
-					self.__addFileContents(archive.extractfile(tarinfo.name))
-					progressBar(itteration, jsonFileTotal)
-					itteration += 1
+		isStdin = tarFileForUpdate == self.STDIN
+		byteTotal = None if isStdin else os.path.getsize(tarFileForUpdate)
+		tarReader = BaconTarReader(sys.stdin if isStdin
+				else open(tarFileForUpdate, 'rb'))
 
+		self.__startProgress()
+		self.__startBulk()
+		self.__benchmark.startPhase('ingestParse')
+
+		with tarfile.open(fileobj = tarReader, mode = 'r|*') as archive:
+			for (filmName, castNames, bytesRead) in (
+					self.__getFilmsAndCastNames(archive, tarReader)):
+				self.__addFilmAndCastNames(filmName, castNames)
+				self.__showProgress(bytesRead, byteTotal)
+
+		self.__benchmark.endPhase('ingestParse')
+		tarReader.close()
+		self.__endBulk()
 		self.__endProgress()
 
 	## Prints a starting message.
@@ -104,26 +180,130 @@ class BaconUpdate():
 	def __startProgress(self):
 		print('No Bacon? Let\'s cook some.')
 
-	## Adds a film from the json file.
+	## Shows a progress bar of the kilobytes read, or a loading icon if we
+	#  don't know how big the file is.
 	#
 	#  @param {object} self The object
-	#  @param {object} jsonFile The json file object
+	#  @param {int} bytesRead How many bytes of the file we've read
+	#  @param {mixed} byteTotal The size of the file or None
 	#  @return void
-	def __addFileContents(self, jsonFile):
-		(film, cast) = self.__getFilmAndCastFromJsonFile(jsonFile)
-		self.__addFilmAndCast(film, cast)
+	def __showProgress(self, bytesRead, byteTotal):
+		if byteTotal:
+			progressBar(bytesRead / 1024, byteTotal / 1024, ' KB')
+
+		else:
+			loading(bytesRead, 65536)
 
-	## Gets the film and cast from the json file.
+	## Loads the films and actors already in the data into dictionaries and
+	#  clears out the lists of what to add if we're adding in bulk.
+	#
+	#  @param {object} self The object
+	#  @return void
+	def __startBulk(self):
+		if not self.__useBulk:
+			return
+
+		self.__filmIds = {}
+		self.__actorIds = {}
+		self.__films = []
+		self.__actors = []
+		self.__casts = []
+		(self.__actorIdMax, self.__filmIdMax) = (
+				self.__baconSearch.getIdMaxes())
+
+		for filmRow in self.__baconSearch.getFilms():
+			self.__filmIds.setdefault(filmRow['FilmName'], filmRow['FilmId'])
+
+		for actorRow in self.__baconSearch.getActors():
+			self.__actorIds.setdefault(
+					getActorNameKey(actorRow['ActorName']),
+					actorRow['ActorId'])
+
+	## Reads the json files out of the archive in batches and decodes each
+	#  batch in the pool, or here if we only have one worker, keeping the
+	#  order they're in the archive.
+	#
+	#  @param {object} self The object
+	#  @param {object} archive The open tar stream
+	#  @param {object} tarReader The reader counting the bytes of the file
+	#  @return {generator} The film name, cast names, and bytes read by the
+	#		end of each json file
+	def __getFilmsAndCastNames(self, archive, tarReader):
+		import multiprocessing
+
+		workers = self.__workers or multiprocessing.cpu_count()
+		pool = None
+
+		if workers > 1:
+			pool = multiprocessing.Pool(workers, ignoreInterrupts)
+
+		try:
+			for (jsonDataBatch, bytesReadBatch) in (
+					self.__getJsonDataBatches(archive, tarReader)):
+				if pool:
+					filmsAndCastNames = pool.map_async(getFilmAndCastNames,
+							jsonDataBatch).get(self.BATCH_TIMEOUT)
+
+				else:
+					filmsAndCastNames = map(getFilmAndCastNames, jsonDataBatch)
+
+				for ((filmName, castNames), bytesRead) in zip(
+						filmsAndCastNames, bytesReadBatch):
+					yield filmName, castNames, bytesRead
+
+		except BaseException:
+			if pool:
+				pool.terminate()
+
+			raise
+
+		if pool:
+			pool.close()
+			pool.join()
+
+	## Reads the contents of the json files in the archive into batches, in
+	#  the order they come in the stream, along with how many bytes of the file
+	#  we'd read by the end of each one.
 	#
 	#  @param {object} self The object
-	#  @param {object} jsonFile The json file object
-	#  @return {string} The film name, {list} The cast of the film
-	def __getFilmAndCastFromJsonFile(self, jsonFile):
-		jsonData = jsonFile.read()
-		jsonContent = json.loads(jsonData)
-		jsonFile.close()
+	#  @param {object} archive The open tar stream
+	#  @param {object} tarReader The reader counting the bytes of the file
+	#  @return {generator} Lists of json file contents, lists of bytes read
+	def __getJsonDataBatches(self, archive, tarReader):
+		jsonDataBatch = []
+		bytesReadBatch = []
+
+		for tarinfo in archive:
+			if tarinfo.isreg():
+				jsonFile = archive.extractfile(tarinfo)
+				jsonDataBatch.append(jsonFile.read())
+				bytesReadBatch.append(tarReader.bytesRead)
+				jsonFile.close()
+
+			if len(jsonDataBatch) == self.BATCH_SIZE:
+				yield jsonDataBatch, bytesReadBatch
+				jsonDataBatch = []
+				bytesReadBatch = []
+
+		if jsonDataBatch:
+			yield jsonDataBatch, bytesReadBatch
+
+	## Adds a film and its cast either in bulk or one at a time. Adding one at
+	#  a time writes to the database, so it's timed as a write for the profile.
+	#
+	#  @param {object} self The object
+	#  @param {string} filmName The film name
+	#  @param {tuple} castNames Tuples of actor name then name key
+	#  @return void
+	def __addFilmAndCastNames(self, filmName, castNames):
+		if self.__useBulk:
+			self.__addFilmAndCastInBulk(filmName, castNames)
 
-		return jsonContent['film']['name'], jsonContent['cast']
+		else:
+			self.__benchmark.startPhase('dbWrite')
+			self.__addFilmAndCast(filmName,
+					tuple(actorName for (actorName, actorNameKey) in castNames))
+			self.__benchmark.endPhase('dbWrite')
 
 	## Checks to see if the film is already in the data. If not, we add it and 
 	#  get its id. We then look up all the actors in the database. Find the ones
@@ -131,12 +311,11 @@ class BaconUpdate():
 	#
 	#  @param {object} self The object
 	#  @param {string} filmName The film name
-	#  @param {list} cast The cast members' names
+	#  @param {tuple} actorNames The cast members' names
 	#  @return void
-	def __addFilmAndCast(self, filmName, cast):
+	def __addFilmAndCast(self, filmName, actorNames):
 		if not self.__baconSearch.getFilmIdByName(filmName):
 			filmId = str(self.__baconSearch.addFilm(filmName))
-			actorNames = self.__getActorNamesFromCast(cast)
 			castMembers = ()
 			actorNamesInSearch = ()
 			actorNamesNeeded = ()
@@ -155,18 +334,47 @@ class BaconUpdate():
 
 			self.__baconSearch.addCast(castMembers)
 
-	## Takes the list of actor objects and returns a tuples of names.
+	## Checks to see if we already have the film. If not, we give it the next
+	#  id and look up each actor, giving the ones we don't have yet the next id,
+	#  then add each actor to the cast once.
 	#
 	#  @param {object} self The object
-	#  @param {list} cast The cast members' objects
-	#  @return {tuple} Actors' names
-	def __getActorNamesFromCast(self, cast):
-		actorNames = ()
+	#  @param {string} filmName The film name
+	#  @param {tuple} castNames Tuples of actor name then name key
+	#  @return void
+	def __addFilmAndCastInBulk(self, filmName, castNames):
+		if filmName in self.__filmIds:
+			return
 
-		for actor in cast:
-			actorNames += (actor['name'],)
+		self.__filmIdMax += 1
+		filmId = self.__filmIdMax
+		castActorIds = set()
 
-		return actorNames
+		self.__filmIds[filmName] = filmId
+		self.__films.append((filmId, filmName))
+
+		for (actorName, actorNameKey) in castNames:
+			if actorNameKey not in self.__actorIds:
+				self.__actorIdMax += 1
+				self.__actorIds[actorNameKey] = self.__actorIdMax
+				self.__actors.append((self.__actorIdMax, actorName))
+
+			actorId = self.__actorIds[actorNameKey]
+
+			if actorId not in castActorIds:
+				castActorIds.add(actorId)
+				self.__casts.append((filmId, actorId))
+
+	## Writes everything we've gathered if we're adding in bulk.
+	#
+	#  @param {object} self The object
+	#  @return void
+	def __endBulk(self):
+		if self.__useBulk:
+			self.__benchmark.startPhase('dbWrite')
+			self.__baconSearch.addInBulk(self.__films, self.__actors,
+					self.__casts)
+			self.__benchmark.endPhase('dbWrite')
 
 	## Prints the end message with benchmark.
 	#
@@ -189,18 +397,81 @@ class BaconUpdate():
 
 		self.__baconSearch.updateBaconActorId(baconActorRow['ActorId'])
 
+	## Repairs the saved pyramid with the casts we added. If it can't be
+	#  repaired we clear the cache like a full update.
+	#
+	#  @param {object} self The object
+	#  @return void
+	def __repairCache(self):
+		if not self.__baconPyramid.repair(self.__casts):
+			self.__baconSearch.clearCache()
+
 	## Removes the default tar file.
 	#
 	#  @param {object} self The object
 	#  @return void
 	def __clean(self):
-		os.remove(self.__defaultTarFile)
+		os.remove(self.__baconSearch.getDefaultTarFile())
 
-	## Clears all the existing data and uploads a new tar file.
+	## Uploads a new tar file into a new database and swaps it in for the
+	#  existing data once it's done, so look ups keep being answered from the
+	#  existing data in the meantime.
 	#
 	#  @param {object} self The object
 	#  @return void
 	def overwrite(self, tarFileForOverwite):
-		self.__baconSearch.clearAll().setup().start()
+		self.__baconSearch.startReplacement().setup().start()
 		self.update(tarFileForOverwite)
-		self.__baconSearch.end()
\ No newline at end of file
+		self.__baconSearch.endReplacement()
+
+## A file wrapper that counts how many bytes have been read from it, so we can
+#  show progress while reading a compressed stream.
+#
+#  @author Chris Lock
+class BaconTarReader():
+	# @type {object} The file being read
+	__file = None
+	# @type {int} How many bytes have been read
+	bytesRead = 0
+
+	## Sets the file to read.
+	#
+	#  @param {object} self The object
+	#  @param {object} fileObject The file being read
+	#  @return void
+	def __init__(self, fileObject):
+		self.__file = fileObject
+
+	## Reads from the file and counts the bytes.
+	#
+	#  @param {object} self The object
+	#  @param {int} size How many bytes to read
+	#  @return {string} The bytes read
+	def read(self, size = -1):
+		data = self.__file.read(size)
+		self.bytesRead += len(data)
+
+		return data
+
+	## Closes the file unless it's stdin.
+	#
+	#  @param {object} self The object
+	#  @return void
+	def close(self):
+		if self.__file is not sys.stdin:
+			self.__file.close()
+
+## Decodes the contents of a json file into the film name and the cast's names
+#  with the keys they're matched on. It lives outside the class so it can be
+#  sent to pool workers.
+#
+#  @param {string} jsonData The contents of the json file
+#  @return {string} The film name, {tuple} Tuples of actor name then name key
+def getFilmAndCastNames(jsonData):
+	import json
+
+	jsonContent = json.loads(jsonData)
+	castNames = tuple((actor['name'], getActorNameKey(actor['name']))
+			for actor in jsonContent['cast'])
+
+	return jsonContent['film']['name'], castNames
@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+
+from cStringIO import StringIO
+import json
+import optparse
+import random
+import tarfile
+import time
+
+## Writes a synthetic archive in the same layout as films.tar.gz, a json file
+#  for each film formatted film.name, cast[].name, so updates, solves, and
+#  look ups can be timed on data of any size. Casts are drawn from a pool of
+#  actors where a few are in lots of films and most are in a few, like the
+#  real data. Kevin isn't in the pool. He's in a share of the films instead,
+#  always including the first, so there's always some bacon. The same
+#  options and seed always write the same films.
+#
+#	python benchmarks/generate.py --films 100000 films.tar.gz
+#
+#  @author Chris Lock
+
+# @constant How many actors there are for each film if we're not told
+ACTORS_PER_FILM = 5
+# @constant Kevin's actor id
+BACON_ACTOR_ID = 0
+# @constant The cast size distributions we can draw from
+CAST_SIZES = ('uniform', 'pareto')
+# @constant The first names actor names are made from
+FIRST_NAMES = ('Ada', 'Ben', 'Cora', 'Dev', 'Eli', 'Faye', 'Gus', 'Hana',
+		'Ike', 'June', 'Kai', 'Lena', 'Milo', 'Nia', 'Otto', 'Pia', 'Quin',
+		'Rosa', 'Sol', 'Tess', 'Uma', 'Vic', 'Wren', 'Xavi', 'Yara', 'Zane')
+# @constant The last names actor names are made from
+LAST_NAMES = ('Abbott', 'Brisket', 'Chorizo', 'Dumont', 'Eggers', 'Frye',
+		'Griddle', 'Hash', 'Ingram', 'Jowl', 'Kettle', 'Lardner', 'Maple',
+		'Nitrate', 'Oakes', 'Pancetta', 'Quince', 'Rasher', 'Skillet',
+		'Toast', 'Umber', 'Vance', 'Waffle', 'Yolk', 'Zest')
+# @constant The words film names are made from
+FILM_WORDS = ('Crispy', 'Smoked', 'Maple', 'Midnight', 'Sizzling', 'Lost',
+		'Savory', 'Return', 'Griddle', 'Streaky', 'Thick', 'Cut', 'Canadian',
+		'Brunch', 'Breakfast', 'Strip', 'Side', 'Slab')
+
+## Writes the archive from the command line options.
+#
+#  @return void
+def main():
+	parser = addParserOptions(optparse.OptionParser(
+			usage = '%prog [options] archive.tar.gz'))
+	parser.add_option('--films', type = 'int', default = 10000,
+			help = 'How many films to write. Defaults to 10000.')
+	(options, arguments) = parser.parse_args()
+
+	if len(arguments) != 1:
+		parser.error('Pass the path to write the archive to.')
+
+	start = time.time()
+	generate(arguments[0], options.films, options.actors, options.castSizes,
+			options.castMin, options.castMax, options.popularity,
+			options.bacon, options.seed)
+	print('Wrote ' + str(options.films) + ' films in %.2f seconds.' %
+			(time.time() - start))
+
+## Adds the options for what the films are like to optparse. How many films
+#  is left to whatever's generating them.
+#
+#  @param {object} parser The optparse.OptionParser() object
+#  @return The optparse object
+def addParserOptions(parser):
+	parser.add_option('--actors', type = 'int',
+			help = 'How many actors are in the pool. Defaults to ' +
+					str(ACTORS_PER_FILM) + ' for each film.')
+	parser.add_option('--cast-sizes', dest = 'castSizes',
+			choices = CAST_SIZES, default = 'uniform',
+			help = 'How cast sizes are drawn, uniform between the min and max '
+					'or pareto, where most are near the min and a few are '
+					'near the max. Defaults to uniform.')
+	parser.add_option('--cast-min', dest = 'castMin', type = 'int',
+			default = 5, help = 'The smallest cast. Defaults to 5.')
+	parser.add_option('--cast-max', dest = 'castMax', type = 'int',
+			default = 30, help = 'The biggest cast. Defaults to 30.')
+	parser.add_option('--popularity', type = 'float', default = 2.0,
+			help = 'How much more often the first actors in the pool are '
+					'cast, 1 for every actor being as likely. Defaults to 2.')
+	parser.add_option('--bacon', type = 'float', default = 0.01,
+			help = 'The share of films Kevin is in. Defaults to 0.01.')
+	parser.add_option('--seed', type = 'int', default = 0,
+			help = 'The random seed. Defaults to 0.')
+
+	return parser
+
+## Writes the archive. Each film is added to the archive as it's made, so
+#  nothing is kept in memory however many films there are.
+#
+#  @param {string} archivePath The path to write the archive to
+#  @param {int} filmCount How many films to write
+#  @param {mixed} actorCount How many actors are in the pool, None for
+#		ACTORS_PER_FILM for each film
+#  @param {string} castSizes How cast sizes are drawn, one of CAST_SIZES
+#  @param {int} castMin The smallest cast
+#  @param {int} castMax The biggest cast
+#  @param {float} popularity How much more often the first actors are cast
+#  @param {float} bacon The share of films Kevin is in
+#  @param {int} seed The random seed
+#  @return void
+def generate(archivePath, filmCount, actorCount = None, castSizes = 'uniform',
+		castMin = 5, castMax = 30, popularity = 2.0, bacon = 0.01, seed = 0):
+	randomState = random.Random(seed)
+	actorCount = max(actorCount or filmCount * ACTORS_PER_FILM, castMax + 1)
+
+	with tarfile.open(archivePath, 'w:gz') as archive:
+		for filmId in xrange(1, filmCount + 1):
+			actorIds = getCastActorIds(randomState, actorCount,
+					getCastSize(randomState, castSizes, castMin, castMax),
+					popularity)
+
+			if filmId == 1 or randomState.random() < bacon:
+				actorIds.add(BACON_ACTOR_ID)
+
+			addFilm(archive, filmId, getFilmName(filmId),
+					[getActorName(actorId) for actorId in sorted(actorIds)])
+
+## Draws how many actors are in a film.
+#
+#  @param {object} randomState The random object
+#  @param {string} castSizes How cast sizes are drawn, one of CAST_SIZES
+#  @param {int} castMin The smallest cast
+#  @param {int} castMax The biggest cast
+#  @return {int} The cast size
+def getCastSize(randomState, castSizes, castMin, castMax):
+	if castSizes == 'pareto':
+		return min(castMax, int(castMin * randomState.paretovariate(1.5)))
+
+	return randomState.randint(castMin, castMax)
+
+## Draws the actors in a film without repeating any. Lower actor ids are
+#  drawn more often the more popular the first actors are. Kevin is never
+#  drawn.
+#
+#  @param {object} randomState The random object
+#  @param {int} actorCount How many actors are in the pool
+#  @param {int} castSize How many actors to draw
+#  @param {float} popularity How much more often the first actors are cast
+#  @return {set} The actor ids
+def getCastActorIds(randomState, actorCount, castSize, popularity):
+	actorIds = set()
+
+	while len(actorIds) < castSize:
+		actorIds.add(1 + int((actorCount - 1) *
+				randomState.random() ** popularity))
+
+	return actorIds
+
+## Adds a film's json file to the archive.
+#
+#  @param {object} archive The open tar file
+#  @param {int} filmId The film id the file is named for
+#  @param {string} filmName The film name
+#  @param {list} actorNames The cast's names
+#  @return void
+def addFilm(archive, filmId, filmName, actorNames):
+	jsonData = json.dumps({
+		'film': {
+			'name': filmName,
+			'image': getImage('films', filmId),
+			},
+		'cast': [{
+			'name': actorName,
+			'image': getImage('actors', index),
+			} for (index, actorName) in enumerate(actorNames)],
+		})
+	tarInfo = tarfile.TarInfo('films/' + str(filmId) + '.json')
+	tarInfo.size = len(jsonData)
+	tarInfo.mtime = 0
+
+	archive.addfile(tarInfo, StringIO(jsonData))
+
+## Gets an image url about as long as the real ones so the files are about
+#  the same size.
+#
+#  @param {string} kind What the image is of
+#  @param {int} index The index it's for
+#  @return {string} The url
+def getImage(kind, index):
+	return ('http://image.example.com/t/p/w185/' + kind + '/' + str(index) +
+			'.jpg')
+
+## Gets a unique name for an actor id. The first actor is Kevin.
+#
+#  @param {int} actorId The actor id
+#  @return {string} The actor name
+def getActorName(actorId):
+	if actorId == BACON_ACTOR_ID:
+		return 'Kevin Bacon'
+
+	nameCount = len(FIRST_NAMES) * len(LAST_NAMES)
+	actorName = (FIRST_NAMES[actorId % len(FIRST_NAMES)] + ' ' +
+			LAST_NAMES[actorId // len(FIRST_NAMES) % len(LAST_NAMES)])
+
+	if actorId >= nameCount:
+		actorName += ' ' + str(actorId // nameCount + 1)
+
+	return actorName
+
+## Gets a unique name for a film id.
+#
+#  @param {int} filmId The film id
+#  @return {string} The film name
+def getFilmName(filmId):
+	wordCount = len(FILM_WORDS)
+
+	return ('The ' + FILM_WORDS[filmId % wordCount] + ' ' +
+			FILM_WORDS[filmId // wordCount % wordCount] + ' ' + str(filmId))
+
+if __name__ == '__main__':
+	main()
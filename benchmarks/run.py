@@ -0,0 +1,289 @@
+#!/usr/bin/env python
+
+import json
+import optparse
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from generate import addParserOptions, generate
+
+## Times updating, solving everything, and looking actors up on synthetic
+#  archives of each size and prints the times as json. Every phase runs in a
+#  new process against its own data directory, so nothing one phase loaded
+#  is still around for the next, and the data in the package is never
+#  touched. Cold look ups are before anything's solved, cached ones are after
+#  --swanson. Each has the time inside the process and the time for the whole
+#  process, which includes starting up.
+#
+#	python benchmarks/run.py --films 10000,100000,1000000 --output bacon.json
+#
+#  @author Chris Lock
+
+# @constant The phases a process can be started for
+PHASES = ('update', 'findAll', 'get')
+# @type {string} The directory the package is in
+directory = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+## Runs the suite, or a single phase if this is the process for one.
+#
+#  @return void
+def main():
+	parser = addParserOptions(optparse.OptionParser(usage = '%prog [options]'))
+	parser.add_option('--films', default = '10000',
+			help = 'Comma separated archive sizes in films. Defaults to 10000.')
+	parser.add_option('--lookups', type = 'int', default = 20,
+			help = 'How many actors to look up at each size. Defaults to 20.')
+	parser.add_option('--workers', type = 'int',
+			help = 'How many processes to update and solve with.')
+	parser.add_option('--directory',
+			help = 'Where to write the archives and data. Defaults to a '
+					'temporary directory that\'s removed after.')
+	parser.add_option('--output',
+			help = 'The file to write the json to. Defaults to stdout.')
+	parser.add_option('--phase', choices = PHASES,
+			help = optparse.SUPPRESS_HELP)
+	(options, arguments) = parser.parse_args()
+
+	if options.phase:
+		return runPhase(options.phase, options.directory, options.workers,
+				arguments)
+
+	try:
+		filmCounts = [int(filmCount) for filmCount in options.films.split(',')]
+
+	except ValueError:
+		parser.error('Pass the sizes as numbers separated by commas.')
+
+	workDirectory = options.directory or tempfile.mkdtemp(prefix = 'bacon')
+	results = {
+		'python': platform.python_version(),
+		'numpy': hasNumpy(),
+		'workers': options.workers,
+		'options': {
+			'actors': options.actors,
+			'castSizes': options.castSizes,
+			'castMin': options.castMin,
+			'castMax': options.castMax,
+			'popularity': options.popularity,
+			'bacon': options.bacon,
+			'seed': options.seed,
+			'lookups': options.lookups,
+			},
+		'runs': [],
+		}
+
+	try:
+		for filmCount in filmCounts:
+			results['runs'].append(benchmark(workDirectory, filmCount, options))
+
+	finally:
+		if not options.directory:
+			shutil.rmtree(workDirectory)
+
+	jsonData = json.dumps(results, indent = 2, sort_keys = True)
+
+	if not options.output:
+		print(jsonData)
+		return
+
+	with open(options.output, 'w') as outputFile:
+		outputFile.write(jsonData + '\n')
+
+## Times every phase for one archive size in its own data directory.
+#
+#  @param {string} workDirectory Where to make the data directory
+#  @param {int} filmCount How many films to generate
+#  @param {object} options The parsed options
+#  @return {dictionary} The run's sizes and times
+def benchmark(workDirectory, filmCount, options):
+	runDirectory = os.path.join(workDirectory, str(filmCount))
+	archivePath = os.path.join(runDirectory, 'synthetic.tar.gz')
+	databasePath = os.path.join(runDirectory, 'baconsearch.db')
+
+	if not os.path.isdir(runDirectory):
+		os.makedirs(runDirectory)
+
+	log('Generating ' + str(filmCount) + ' films')
+	start = time.time()
+	generate(archivePath, filmCount, options.actors, options.castSizes,
+			options.castMin, options.castMax, options.popularity,
+			options.bacon, options.seed)
+	run = {
+		'films': filmCount,
+		'archiveBytes': os.path.getsize(archivePath),
+		'generate': time.time() - start,
+		}
+
+	log('Updating')
+	run['update'] = startPhase('update', runDirectory, options.workers,
+			[archivePath])
+	run.update(getCounts(databasePath))
+	actorNames = getActorNames(databasePath, options.lookups, options.seed)
+
+	log('Looking up ' + str(len(actorNames)) + ' actors cold')
+	run['getCold'] = summarize([startPhase('get', runDirectory,
+			options.workers, [actorName]) for actorName in actorNames])
+
+	log('Solving everything')
+	run['findAll'] = startPhase('findAll', runDirectory, options.workers)
+	run['databaseBytes'] = os.path.getsize(databasePath)
+
+	log('Looking up ' + str(len(actorNames)) + ' actors cached')
+	run['getCached'] = summarize([startPhase('get', runDirectory,
+			options.workers, [actorName]) for actorName in actorNames])
+
+	return run
+
+## Runs a phase in a new process and times it. Its stdout isn't a
+#  terminal, so it's told to write utf-8 like one.
+#
+#  @param {string} phase The phase, one of PHASES
+#  @param {string} runDirectory The data directory
+#  @param {mixed} workers How many processes to use, None for the default
+#  @param {list} arguments What the phase needs
+#  @return {dictionary} The seconds inside the process and the seconds for
+#		the whole process
+def startPhase(phase, runDirectory, workers, arguments = []):
+	command = [sys.executable, os.path.realpath(__file__), '--phase', phase,
+			'--directory', runDirectory]
+
+	if workers is not None:
+		command += ['--workers', str(workers)]
+
+	start = time.time()
+	result = json.loads(subprocess.check_output(command + arguments,
+			env = dict(os.environ, PYTHONIOENCODING = 'utf-8')))
+	result['processSeconds'] = time.time() - start
+
+	return result
+
+## Runs a phase in this process against the data directory and prints how
+#  long it took as json. Anything the package prints is sent to devnull so
+#  only the json is on stdout.
+#
+#  @param {string} phase The phase, one of PHASES
+#  @param {string} runDirectory The data directory
+#  @param {mixed} workers How many processes to use, None for the default
+#  @param {list} arguments What the phase needs
+#  @return void
+def runPhase(phase, runDirectory, workers, arguments):
+	resultFile = os.fdopen(os.dup(1), 'w')
+	os.dup2(os.open(os.devnull, os.O_WRONLY), 1)
+	sys.path.insert(0, directory)
+
+	from bacondegrees.baconsearch import BaconSearch
+
+	BaconSearch().setDirectory(runDirectory)
+	start = time.time()
+
+	if phase == 'update':
+		from bacondegrees.baconupdate import BaconUpdate
+
+		baconUpdate = BaconUpdate()
+
+		if workers is not None:
+			baconUpdate.setWorkers(workers)
+
+		baconUpdate.update(arguments[0])
+
+	elif phase == 'findAll':
+		from bacondegrees.baconpyramid import BaconPyramid
+
+		baconPyramid = BaconPyramid()
+
+		if workers is not None:
+			baconPyramid.setWorkers(workers)
+
+		baconPyramid.findAll()
+
+	else:
+		from bacondegrees.bacondegreescore import BaconDegreesCore
+
+		BaconDegreesCore().get(arguments[0])
+
+	sys.stdout.flush()
+	resultFile.write(json.dumps({'seconds': time.time() - start}))
+	resultFile.close()
+
+## Counts what was loaded.
+#
+#  @param {string} databasePath The path to the database
+#  @return {dictionary} The film, actor, and cast counts
+def getCounts(databasePath):
+	connection = sqlite3.connect(databasePath)
+	counts = {}
+
+	for table in ('Films', 'Actors', 'Casts'):
+		counts[table.lower()] = connection.execute(
+				'SELECT COUNT(*) FROM ' + table).fetchone()[0]
+
+	connection.close()
+
+	return counts
+
+## Picks the actors to look up. The same seed always picks the same actors.
+#
+#  @param {string} databasePath The path to the database
+#  @param {int} count How many actors to pick
+#  @param {int} seed The random seed
+#  @return {list} The actor names
+def getActorNames(databasePath, count, seed):
+	connection = sqlite3.connect(databasePath)
+	actorNames = [row[0] for row in connection.execute(
+			'SELECT ActorName FROM Actors ORDER BY ActorId')]
+
+	connection.close()
+
+	return random.Random(seed).sample(actorNames, min(count,
+			len(actorNames)))
+
+## Summarizes the times for a list of phases.
+#
+#  @param {list} results The phase results
+#  @return {dictionary} The count and the mean, median, min, and max of both
+#		the seconds inside the process and for the whole process
+def summarize(results):
+	summary = {'count': len(results)}
+
+	for key in ('seconds', 'processSeconds'):
+		times = sorted(result[key] for result in results)
+
+		if not times:
+			continue
+
+		summary[key] = {
+			'mean': sum(times) / len(times),
+			'median': times[len(times) // 2],
+			'min': times[0],
+			'max': times[-1],
+			}
+
+	return summary
+
+## Checks if NumPy can be imported, which changes how everything's solved.
+#
+#  @return {bool} If it can
+def hasNumpy():
+	try:
+		import numpy
+
+	except ImportError:
+		return False
+
+	return True
+
+## Prints progress to stderr so it's not mixed in with the json.
+#
+#  @param {string} message The message
+#  @return void
+def log(message):
+	sys.stderr.write(message + '...\n')
+
+if __name__ == '__main__':
+	main()
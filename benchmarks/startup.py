@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+
+import optparse
+import os
+import sys
+
+## Checks that a look up from the cache doesn't import the modules only some
+#  commands need. A look up from the cache is mostly the time it takes to
+#  start, so anything new imported along the way shows up on every search.
+#  A small synthetic archive is cooked and solved in a temporary directory,
+#  then one actor is looked up in a new interpreter that lists everything it
+#  imported. Exits with 1 if any of the heavy modules were imported. Only
+#  what the look up process needs is imported at the top, since everything
+#  it imports is checked.
+#
+#	python benchmarks/startup.py
+#
+#  @author Chris Lock
+
+# @constant The module the command line tool runs from
+MODULE = 'bacondegrees.bacondegrees'
+# @constant The modules only the commands that need them should import
+HEAVY_MODULES = (
+	'numpy',
+	'tarfile',
+	'json',
+	'pickle',
+	'multiprocessing',
+	'urllib',
+	'urllib2',
+	'BaseHTTPServer',
+	'bacondegrees.baconpyramid',
+	'bacondegrees.baconupdate',
+	'bacondegrees.baconcenters',
+	'bacondegrees.baconserver',
+	'bacondegrees.bacongraph',
+	'bacondegrees.baconfrontier',
+	'bacondegrees.bacontiers',
+	)
+# @constant How many films the fixture has
+FILM_COUNT = 1000
+# @type {string} The directory the package is in
+directory = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+## Builds the fixture and checks what a look up from it imported, or does
+#  the look up if this is the process for it.
+#
+#  @return void
+def main():
+	parser = optparse.OptionParser(usage = '%prog')
+	parser.add_option('--directory', help = optparse.SUPPRESS_HELP)
+	parser.add_option('--lookup', help = optparse.SUPPRESS_HELP)
+	(options, arguments) = parser.parse_args()
+
+	if options.lookup:
+		return lookUp(options.directory, options.lookup.decode('utf-8'))
+
+	import shutil
+	import tempfile
+
+	workDirectory = tempfile.mkdtemp(prefix = 'bacon')
+
+	try:
+		actorName = makeFixture(workDirectory)
+		importedModules = getImportedModules(workDirectory, actorName)
+
+	finally:
+		shutil.rmtree(workDirectory)
+
+	heavyModules = [module for module in HEAVY_MODULES
+			if module in importedModules]
+
+	if heavyModules:
+		print('Looking up from the cache imports ' + ', '.join(heavyModules) +
+				'.')
+		sys.exit(1)
+
+	print('Looking up from the cache only imports what it needs.')
+
+## Cooks and solves a small synthetic archive so every actor is cached.
+#
+#  @param {string} workDirectory The data directory
+#  @return {string} The name of the actor furthest from Kevin
+def makeFixture(workDirectory):
+	import sqlite3
+	from generate import generate
+	from run import startPhase
+
+	archivePath = os.path.join(workDirectory, 'synthetic.tar.gz')
+
+	generate(archivePath, FILM_COUNT)
+	startPhase('update', workDirectory, None, [archivePath])
+	startPhase('findAll', workDirectory, None)
+
+	connection = sqlite3.connect(os.path.join(workDirectory,
+			'baconsearch.db'))
+	actorName = connection.execute('SELECT ActorName FROM Actors '
+			'WHERE BaconDegrees > 0 '
+			'ORDER BY BaconDegrees DESC, ActorId '
+			'LIMIT 1').fetchone()[0]
+
+	connection.close()
+
+	return actorName
+
+## Looks an actor up in a new interpreter and gets what it imported,
+#  printing how long the look up took. Its stdout isn't a terminal, so it's
+#  told to write utf-8 like one.
+#
+#  @param {string} workDirectory The data directory
+#  @param {string} actorName The actor to look up
+#  @return {set} The module names
+def getImportedModules(workDirectory, actorName):
+	import subprocess
+
+	output = subprocess.check_output([sys.executable,
+			os.path.realpath(__file__), '--directory', workDirectory,
+			'--lookup', actorName.encode('utf-8')], cwd = directory,
+			env = dict(os.environ, PYTHONIOENCODING = 'utf-8'))
+	lines = output.splitlines()
+
+	print('%8.1f ms  looking up %s' % (float(lines[0]) * 1000,
+			actorName.encode('utf-8')))
+
+	return set(lines[1:])
+
+## Looks an actor up the way the command line tool does and prints how long
+#  it took and every module imported. Anything the package prints is sent
+#  to devnull so only the modules are on stdout.
+#
+#  @param {string} workDirectory The data directory
+#  @param {string} actorName The actor to look up
+#  @return void
+def lookUp(workDirectory, actorName):
+	import time
+
+	resultFile = os.fdopen(os.dup(1), 'w')
+	os.dup2(os.open(os.devnull, os.O_WRONLY), 1)
+	sys.path.insert(0, directory)
+	start = time.time()
+
+	__import__(MODULE)
+
+	from bacondegrees.baconsearch import BaconSearch
+	from bacondegrees.bacondegreescore import BaconDegreesCore
+
+	BaconSearch().setDirectory(workDirectory)
+	BaconDegreesCore().get(actorName)
+	sys.stdout.flush()
+	resultFile.write(str(time.time() - start) + '\n')
+
+	for name in sys.modules:
+		if sys.modules[name]:
+			resultFile.write(name + '\n')
+
+	resultFile.close()
+
+if __name__ == '__main__':
+	main()
@@ -15,6 +15,9 @@ setup(
 	package_data = {
 		'': ['*.db']
 		},
+	extras_require = {
+		'numpy': ['numpy'],
+		},
 	entry_points = {
 		'console_scripts': ['bacondegrees = bacondegrees.bacondegrees:main']
 		},